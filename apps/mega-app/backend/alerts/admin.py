@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Alert
+from .models import Alert, AlertWatermark
 
 
 @admin.register(Alert)
@@ -9,3 +9,9 @@ class AlertAdmin(admin.ModelAdmin):
     search_fields = ['person__first_name', 'person__last_name', 'message']
     readonly_fields = ['id', 'created_at']
     ordering = ['-created_at']
+
+
+@admin.register(AlertWatermark)
+class AlertWatermarkAdmin(admin.ModelAdmin):
+    list_display = ['name', 'processed_date', 'processed_at', 'fractions_checked', 'alerts_created', 'alerts_deleted']
+    readonly_fields = ['updated_at']
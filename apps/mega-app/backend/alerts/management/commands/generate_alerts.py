@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from alerts.services import generate_alerts_incremental
+
+
+class Command(BaseCommand):
+    help = 'Update fraction alerts for operators and admins (only fractions whose band changed since the last run)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Reconcile every fraction in a band, not only the ones changed since the last run',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        stats = generate_alerts_incremental(full=options['full'])
+        mode = 'full' if stats['full'] else 'incremental'
+        self.stdout.write(
+            f"Done! Fractions checked: {stats['fractions_checked']}, "
+            f"Alerts created: {stats['alerts_created']}, "
+            f"deleted: {stats['alerts_deleted']} "
+            f"({mode}, {time.monotonic() - started:.1f}s)"
+        )
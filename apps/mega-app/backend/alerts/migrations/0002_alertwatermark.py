@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-17 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Nume')),
+                ('processed_date', models.DateField(verbose_name='Zi procesată')),
+                ('processed_at', models.DateTimeField(verbose_name='Modificări procesate până la')),
+                ('imminent_days', models.PositiveSmallIntegerField(verbose_name='Zile iminent')),
+                ('upcoming_days', models.PositiveSmallIntegerField(verbose_name='Zile în curând')),
+                ('fractions_checked', models.PositiveIntegerField(default=0, verbose_name='Fracții verificate')),
+                ('alerts_created', models.PositiveIntegerField(default=0, verbose_name='Alerte create')),
+                ('alerts_deleted', models.PositiveIntegerField(default=0, verbose_name='Alerte șterse')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Actualizat la')),
+            ],
+            options={
+                'verbose_name': 'Watermark alerte',
+                'verbose_name_plural': 'Watermark alerte',
+            },
+        ),
+    ]
@@ -69,3 +69,28 @@ class Alert(models.Model):
 
     def __str__(self):
         return f"{self.get_alert_type_display()} - {self.person.full_name} ({self.target_date})"
+
+
+class AlertWatermark(models.Model):
+    """
+    Starea generatorului incremental de alerte: ziua pentru care s-au calculat
+    benzile (depășit / iminent / în curând) și momentul până la care au fost
+    procesate modificările (updated_at) fracțiilor, sentințelor și persoanelor.
+    """
+    name = models.CharField(max_length=50, unique=True, verbose_name='Nume')
+    processed_date = models.DateField(verbose_name='Zi procesată')
+    processed_at = models.DateTimeField(verbose_name='Modificări procesate până la')
+    # Pragurile folosite; dacă se schimbă în setări, următoarea rulare e completă
+    imminent_days = models.PositiveSmallIntegerField(verbose_name='Zile iminent')
+    upcoming_days = models.PositiveSmallIntegerField(verbose_name='Zile în curând')
+    fractions_checked = models.PositiveIntegerField(default=0, verbose_name='Fracții verificate')
+    alerts_created = models.PositiveIntegerField(default=0, verbose_name='Alerte create')
+    alerts_deleted = models.PositiveIntegerField(default=0, verbose_name='Alerte șterse')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Actualizat la')
+
+    class Meta:
+        verbose_name = 'Watermark alerte'
+        verbose_name_plural = 'Watermark alerte'
+
+    def __str__(self):
+        return f"{self.name} ({self.processed_date})"
@@ -1,135 +1,305 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
-from .models import Alert
+from .models import Alert, AlertWatermark
+from notifications.events import publish_unread_change
+from persons.dashboard import get_dashboard_kpis
 from sentences.models import Fraction
 
 User = get_user_model()
 
 
-def generate_alerts_for_user(user):
+ALERT_BATCH_SIZE = 1000
+
+WATERMARK_NAME = 'fraction_alerts'
+# Modifications committed by transactions still open when the previous run
+# read its snapshot have an updated_at slightly older than processed_at
+WATERMARK_OVERLAP = timezone.timedelta(minutes=5)
+
+
+def _band_days():
+    return (
+        getattr(settings, 'FRACTION_IMMINENT_DAYS', 30),
+        getattr(settings, 'FRACTION_UPCOMING_DAYS', 90),
+    )
+
+
+def classify_fraction(fraction, today, imminent_days, upcoming_days):
     """
-    Generate alerts for a specific user based on fraction dates.
-    This clears existing unread alerts and generates new ones.
+    Return the Alert fields (without user) for a fraction, or None when the
+    fraction is outside every band, fulfilled or its sentence is not active.
+    Expects fraction.sentence.person to be loaded.
     """
-    today = timezone.now().date()
-    imminent_days = getattr(settings, 'FRACTION_IMMINENT_DAYS', 30)
-    upcoming_days = getattr(settings, 'FRACTION_UPCOMING_DAYS', 90)
+    if fraction.is_fulfilled or fraction.sentence.status != 'active':
+        return None
+
+    days_until = (fraction.calculated_date - today).days
+    person = fraction.sentence.person
 
-    # Clear existing unread alerts for this user
-    Alert.objects.filter(user=user, is_read=False).delete()
+    if days_until < 0:
+        # Overdue
+        alert_type = Alert.AlertType.OVERDUE
+        priority = Alert.Priority.HIGH
+        message = (
+            f"Termen depășit pentru {person.full_name}: "
+            f"fracția {fraction.fraction_type} a fost programată pentru {fraction.calculated_date.strftime('%d.%m.%Y')} "
+            f"(acum {abs(days_until)} zile)."
+        )
+    elif days_until <= imminent_days:
+        # Imminent
+        alert_type = Alert.AlertType.IMMINENT
+        priority = Alert.Priority.HIGH
+        message = (
+            f"Termen iminent pentru {person.full_name}: "
+            f"fracția {fraction.fraction_type} în {days_until} zile ({fraction.calculated_date.strftime('%d.%m.%Y')})."
+        )
+    elif days_until <= upcoming_days:
+        # Upcoming
+        alert_type = Alert.AlertType.UPCOMING
+        priority = Alert.Priority.MEDIUM
+        message = (
+            f"Termen în curând pentru {person.full_name}: "
+            f"fracția {fraction.fraction_type} în {days_until} zile ({fraction.calculated_date.strftime('%d.%m.%Y')})."
+        )
+    else:
+        # Too far in the future
+        return None
+
+    return {
+        'alert_type': alert_type,
+        'priority': priority,
+        'fraction_id': fraction.pk,
+        'person_id': person.pk,
+        'message': message,
+        'target_date': fraction.calculated_date,
+    }
 
-    # Get all active sentence fractions that are not fulfilled
-    fractions = Fraction.objects.select_related(
-        'sentence', 'sentence__person'
-    ).filter(
+
+def _active_fractions(today, upcoming_days):
+    # Fractions further than the upcoming band never produce an alert
+    return Fraction.objects.filter(
         sentence__status='active',
-        is_fulfilled=False
+        is_fulfilled=False,
+        calculated_date__lte=today + timezone.timedelta(days=upcoming_days),
     )
 
-    alerts_to_create = []
-
-    for fraction in fractions:
-        days_until = (fraction.calculated_date - today).days
-        person = fraction.sentence.person
-
-        if days_until < 0:
-            # Overdue
-            alert_type = Alert.AlertType.OVERDUE
-            priority = Alert.Priority.HIGH
-            message = (
-                f"Termen depășit pentru {person.full_name}: "
-                f"fracția {fraction.fraction_type} a fost programată pentru {fraction.calculated_date.strftime('%d.%m.%Y')} "
-                f"(acum {abs(days_until)} zile)."
-            )
-        elif days_until <= imminent_days:
-            # Imminent
-            alert_type = Alert.AlertType.IMMINENT
-            priority = Alert.Priority.HIGH
-            message = (
-                f"Termen iminent pentru {person.full_name}: "
-                f"fracția {fraction.fraction_type} în {days_until} zile ({fraction.calculated_date.strftime('%d.%m.%Y')})."
-            )
-        elif days_until <= upcoming_days:
-            # Upcoming
-            alert_type = Alert.AlertType.UPCOMING
-            priority = Alert.Priority.MEDIUM
-            message = (
-                f"Termen în curând pentru {person.full_name}: "
-                f"fracția {fraction.fraction_type} în {days_until} zile ({fraction.calculated_date.strftime('%d.%m.%Y')})."
-            )
-        else:
-            # Too far in the future, skip
-            continue
-
-        alerts_to_create.append(Alert(
-            user=user,
-            alert_type=alert_type,
-            priority=priority,
-            fraction=fraction,
-            person=person,
-            message=message,
-            target_date=fraction.calculated_date,
-        ))
-
-    # Bulk create alerts
-    Alert.objects.bulk_create(alerts_to_create)
-
-    return len(alerts_to_create)
+
+def build_fraction_alerts(today=None):
+    """
+    Classify active unfulfilled fractions into bands (overdue / imminent /
+    upcoming) and render their messages once. Returns a list of dicts with
+    the Alert fields, independent of the recipient.
+    """
+    today = today or timezone.now().date()
+    imminent_days, upcoming_days = _band_days()
+
+    fractions = _active_fractions(today, upcoming_days).select_related('sentence__person')
+    alerts = []
+    for fraction in fractions.iterator(chunk_size=ALERT_BATCH_SIZE):
+        alerts.append(classify_fraction(fraction, today, imminent_days, upcoming_days))
+    return alerts
+
+
+@transaction.atomic
+def replace_unread_alerts(users, alerts):
+    """
+    Replace the unread alerts of every user with the given (pre-rendered)
+    alerts: one DELETE for all users, then batched bulk_create.
+    """
+    user_ids = [user.pk for user in users]
+    Alert.objects.filter(user_id__in=user_ids, is_read=False).delete()
+    # bulk_create materializes its input, so batches are flushed here
+    batch = []
+    for user_id in user_ids:
+        for alert in alerts:
+            batch.append(Alert(user_id=user_id, **alert))
+            if len(batch) >= ALERT_BATCH_SIZE:
+                Alert.objects.bulk_create(batch)
+                batch = []
+    if batch:
+        Alert.objects.bulk_create(batch)
+    publish_unread_change(user_ids)
+    return len(user_ids) * len(alerts)
+
+
+def generate_alerts_for_user(user):
+    """
+    Generate alerts for a specific user based on fraction dates.
+    This clears existing unread alerts and generates new ones.
+    """
+    alerts = build_fraction_alerts()
+    replace_unread_alerts([user], alerts)
+    return len(alerts)
 
 
 def generate_alerts_for_all_users():
     """
     Generate alerts for all active operators and admins.
+    Fractions are classified once and the result is fanned out to every user.
     """
-    users = User.objects.filter(
+    users = list(_recipients().only('pk'))
+
+    return replace_unread_alerts(users, build_fraction_alerts())
+
+
+def _recipients():
+    return User.objects.filter(
         is_active=True,
         role__in=['operator', 'admin']
     )
 
-    total_alerts = 0
-    for user in users:
-        total_alerts += generate_alerts_for_user(user)
 
-    return total_alerts
+def _changed_fractions(watermark, today, imminent_days, upcoming_days):
+    """
+    Fractions whose band may differ from the last run: calculated_date crossed
+    a band threshold between watermark.processed_date and today, or the
+    fraction, its sentence or its person was modified since processed_at.
+    """
+    last_day = watermark.processed_date
+    since = watermark.processed_at - WATERMARK_OVERLAP
+    imminent = timezone.timedelta(days=imminent_days)
+    upcoming = timezone.timedelta(days=upcoming_days)
+    return Fraction.objects.filter(
+        # imminent -> overdue
+        Q(calculated_date__gte=last_day, calculated_date__lt=today)
+        # upcoming -> imminent
+        | Q(calculated_date__gt=last_day + imminent, calculated_date__lte=today + imminent)
+        # no alert -> upcoming
+        | Q(calculated_date__gt=last_day + upcoming, calculated_date__lte=today + upcoming)
+        | Q(updated_at__gt=since)
+        | Q(sentence__updated_at__gt=since)
+        | Q(sentence__person__updated_at__gt=since)
+    )
 
 
-def get_dashboard_alert_summary(user):
+def _sync_alerts(user_ids, fractions, expected, stats, created_by_user):
     """
-    Get a summary of alerts for the dashboard.
+    Bring the alerts of `user_ids` for `fractions` in line with `expected`
+    ({fraction_id: alert fields or None}). A (user, fraction) pair whose latest
+    alert already has the expected band and target date is left untouched;
+    otherwise its unread alerts are replaced.
     """
-    today = timezone.now().date()
-    imminent_days = getattr(settings, 'FRACTION_IMMINENT_DAYS', 30)
-    upcoming_days = getattr(settings, 'FRACTION_UPCOMING_DAYS', 90)
+    latest = {}
+    unread = {}
+    existing = Alert.objects.filter(
+        user_id__in=user_ids, fraction__in=fractions.values('pk'),
+    ).order_by('created_at').values_list('pk', 'user_id', 'fraction_id', 'alert_type', 'target_date', 'is_read')
+    for pk, user_id, fraction_id, alert_type, target_date, is_read in existing.iterator(chunk_size=ALERT_BATCH_SIZE):
+        latest[user_id, fraction_id] = (alert_type, target_date)
+        if not is_read:
+            unread.setdefault((user_id, fraction_id), []).append(pk)
 
-    # Count directly from fractions for real-time accuracy
-    fractions = Fraction.objects.filter(
-        sentence__status='active',
-        is_fulfilled=False
+    to_delete = []
+    to_create = []
+    for user_id in user_ids:
+        for fraction_id, alert in expected.items():
+            key = (user_id, fraction_id)
+            if alert is not None and latest.get(key) == (alert['alert_type'], alert['target_date']):
+                continue
+            to_delete.extend(unread.get(key, []))
+            if alert is not None:
+                to_create.append(Alert(user_id=user_id, **alert))
+
+    for i in range(0, len(to_delete), ALERT_BATCH_SIZE):
+        Alert.objects.filter(pk__in=to_delete[i:i + ALERT_BATCH_SIZE]).delete()
+    Alert.objects.bulk_create(to_create, batch_size=ALERT_BATCH_SIZE)
+    stats['alerts_deleted'] += len(to_delete)
+    stats['alerts_created'] += len(to_create)
+    created_by_user.update(alert.user_id for alert in to_create)
+
+
+@transaction.atomic
+def generate_alerts_incremental(full=False):
+    """
+    Update the alerts of all operators and admins from the fractions whose
+    band may have changed since the previous run (see _changed_fractions),
+    then move the AlertWatermark forward. Alerts whose band did not change
+    are kept as they are.
+
+    The first run, a change of FRACTION_*_DAYS or full=True reconcile every
+    fraction that is in a band or still has unread alerts. Users without any
+    alert (e.g. new accounts) always get the full set.
+
+    Returns the run statistics; `created_by_user` maps user id to the number
+    of alerts created for that user.
+    """
+    now = timezone.now()
+    today = now.date()
+    imminent_days, upcoming_days = _band_days()
+    stats = {'fractions_checked': 0, 'alerts_created': 0, 'alerts_deleted': 0}
+    created_by_user = Counter()
+
+    # Create the row first so that the first run holds the lock too; a
+    # concurrent run waits for its commit and then continues incrementally
+    watermark, created = AlertWatermark.objects.get_or_create(name=WATERMARK_NAME, defaults={
+        'processed_date': today,
+        'processed_at': now,
+        'imminent_days': imminent_days,
+        'upcoming_days': upcoming_days,
+    })
+    watermark = AlertWatermark.objects.select_for_update().get(pk=watermark.pk)
+    full = (
+        full or created
+        or (watermark.imminent_days, watermark.upcoming_days) != (imminent_days, upcoming_days)
     )
 
-    overdue_count = fractions.filter(calculated_date__lt=today).count()
+    users = _recipients()
+    user_ids = list(users.filter(alerts__isnull=False).distinct().values_list('pk', flat=True))
+    fresh_user_ids = list(users.exclude(pk__in=user_ids).values_list('pk', flat=True))
 
-    imminent_count = fractions.filter(
-        calculated_date__gte=today,
-        calculated_date__lte=today + timezone.timedelta(days=imminent_days)
-    ).count()
+    if full:
+        fractions = Fraction.objects.filter(
+            Q(pk__in=_active_fractions(today, upcoming_days).values('pk'))
+            | Q(pk__in=Alert.objects.filter(is_read=False).values('fraction_id'))
+        )
+    else:
+        fractions = _changed_fractions(watermark, today, imminent_days, upcoming_days)
 
-    upcoming_count = fractions.filter(
-        calculated_date__gt=today + timezone.timedelta(days=imminent_days),
-        calculated_date__lte=today + timezone.timedelta(days=upcoming_days)
-    ).count()
+    expected = {}
+    for fraction in fractions.select_related('sentence__person').iterator(chunk_size=ALERT_BATCH_SIZE):
+        expected[fraction.pk] = classify_fraction(fraction, today, imminent_days, upcoming_days)
+    stats['fractions_checked'] = len(expected)
+    if user_ids and expected:
+        _sync_alerts(user_ids, fractions, expected, stats, created_by_user)
 
-    fulfilled_count = Fraction.objects.filter(
-        sentence__status='active',
-        is_fulfilled=True
-    ).count()
+    if fresh_user_ids:
+        alerts = build_fraction_alerts(today)
+        Alert.objects.bulk_create(
+            [Alert(user_id=user_id, **alert) for user_id in fresh_user_ids for alert in alerts],
+            batch_size=ALERT_BATCH_SIZE,
+        )
+        stats['alerts_created'] += len(fresh_user_ids) * len(alerts)
+        created_by_user.update(dict.fromkeys(fresh_user_ids, len(alerts)))
 
+    AlertWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={
+        'processed_date': today,
+        'processed_at': now,
+        'imminent_days': imminent_days,
+        'upcoming_days': upcoming_days,
+        **stats,
+    })
+    if stats['alerts_created'] or stats['alerts_deleted']:
+        publish_unread_change()
+    stats['full'] = full
+    stats['created_by_user'] = created_by_user
+    return stats
+
+
+def get_dashboard_alert_summary(user):
+    """
+    Get a summary of alerts for the dashboard.
+    Counted directly from fractions (persons.dashboard, cached for the day).
+    """
+    kpis = get_dashboard_kpis()
     return {
-        'overdue': overdue_count,
-        'imminent': imminent_count,
-        'upcoming': upcoming_count,
-        'fulfilled': fulfilled_count,
-        'total': overdue_count + imminent_count + upcoming_count,
+        'overdue': kpis['overdue_fractions'],
+        'imminent': kpis['imminent_fractions'],
+        'upcoming': kpis['upcoming_fractions'],
+        'fulfilled': kpis['fulfilled_fractions'],
+        'total': kpis['overdue_fractions'] + kpis['imminent_fractions'] + kpis['upcoming_fractions'],
     }
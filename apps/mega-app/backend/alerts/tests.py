@@ -0,0 +1,128 @@
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from persons.models import ConvictedPerson
+from sentences.models import Sentence
+from .models import Alert, AlertWatermark
+from .services import build_fraction_alerts, generate_alerts_incremental
+
+User = get_user_model()
+
+
+class IncrementalAlertTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='operator', role=User.Role.OPERATOR)
+        person = ConvictedPerson.objects.create(first_name='Ion', last_name='Popescu')
+        self.sentence = Sentence.objects.create(
+            person=person, crime_type=Sentence.CrimeType.FURT, sentence_years=3, start_date=date(2020, 1, 1),
+        )
+        # O singură fracție, cu data la 200 de zile de azi; rulările au loc
+        # „în viitor”, deci updated_at-ul ei nu mai intră în rulările incrementale
+        self.fraction = self.sentence.fractions.get(fraction_type='1/3')
+        self.sentence.fractions.exclude(pk=self.fraction.pk).delete()
+        self.target = timezone.now().date() + timedelta(days=200)
+        self.sentence.fractions.update(calculated_date=self.target)
+        self.fraction.refresh_from_db()
+
+    def at(self, days_before_target, hour=6):
+        """Ceasul mutat cu `days_before_target` zile înainte de data fracției."""
+        moment = datetime.combine(self.target - timedelta(days=days_before_target), time(hour))
+        return mock.patch('django.utils.timezone.now', return_value=timezone.make_aware(moment))
+
+    def run_on(self, days_before_target, **kwargs):
+        with self.at(days_before_target):
+            return generate_alerts_incremental(**kwargs)
+
+    def unread_types(self, user=None):
+        return list(Alert.objects.filter(user=user or self.user, is_read=False).values_list('alert_type', flat=True))
+
+    def test_first_run_creates_watermark_and_is_full(self):
+        stats = self.run_on(60)
+        self.assertTrue(stats['full'])
+        self.assertEqual(AlertWatermark.objects.get().processed_date, self.target - timedelta(days=60))
+        self.assertEqual(self.unread_types(), [Alert.AlertType.UPCOMING])
+        self.assertFalse(self.run_on(59)['full'])
+
+    def test_band_crossings(self):
+        self.run_on(60)
+        self.assertEqual(self.unread_types(), [Alert.AlertType.UPCOMING])
+
+        stats = self.run_on(20)
+        self.assertFalse(stats['full'])
+        self.assertEqual(stats['fractions_checked'], 1)
+        self.assertEqual(self.unread_types(), [Alert.AlertType.IMMINENT])
+
+        # Fără trecere de prag și fără modificări nu se verifică nimic
+        self.assertEqual(self.run_on(19)['fractions_checked'], 0)
+
+        self.run_on(-1)
+        self.assertEqual(self.unread_types(), [Alert.AlertType.OVERDUE])
+        self.assertEqual(Alert.objects.count(), 1)
+
+    def test_read_alert_in_same_band_is_kept(self):
+        self.run_on(20)
+        Alert.objects.update(is_read=True)
+
+        # Fracția e modificată, dar banda și data rămân aceleași
+        self.fraction.notes = 'Verificat'
+        with self.at(20, hour=12):
+            self.fraction.save()
+        stats = self.run_on(19)
+        self.assertEqual(stats['fractions_checked'], 1)
+        self.assertEqual(stats['alerts_created'], 0)
+        self.assertEqual(list(Alert.objects.values_list('alert_type', 'is_read')), [(Alert.AlertType.IMMINENT, True)])
+
+        # La schimbarea benzii apare o alertă nouă, cea citită rămâne
+        self.run_on(-1)
+        self.assertEqual(
+            sorted(Alert.objects.values_list('alert_type', 'is_read')),
+            [(Alert.AlertType.IMMINENT, True), (Alert.AlertType.OVERDUE, False)],
+        )
+
+    def test_new_user_gets_full_set(self):
+        other = ConvictedPerson.objects.create(first_name='Vasile', last_name='Rusu')
+        Sentence.objects.create(
+            person=other, crime_type=Sentence.CrimeType.FURT, sentence_years=1, start_date=date(2020, 1, 1),
+        )
+        self.run_on(20)
+        existing = Alert.objects.filter(user=self.user).count()
+
+        newcomer = User.objects.create_user(username='nou', role=User.Role.ADMIN)
+        stats = self.run_on(19)
+        self.assertFalse(stats['full'])
+        expected = len(build_fraction_alerts(self.target - timedelta(days=19)))
+        self.assertEqual(Alert.objects.filter(user=newcomer).count(), expected)
+        self.assertEqual(Alert.objects.filter(user=self.user).count(), existing)
+
+    def test_fulfilled_fraction_drops_unread_alerts(self):
+        self.run_on(20)
+        self.fraction.is_fulfilled = True
+        with self.at(20, hour=12):
+            self.fraction.save()
+        self.run_on(19)
+        self.assertEqual(self.unread_types(), [])
+
+    def test_released_person_drops_unread_alerts(self):
+        self.run_on(20)
+        # Ca în acțiunea `release`: sentințele active devin finalizate
+        with self.at(20, hour=12):
+            Sentence.objects.filter(pk=self.sentence.pk).update(
+                status=Sentence.Status.FINISHED, updated_at=timezone.now(),
+            )
+        self.run_on(19)
+        self.assertEqual(self.unread_types(), [])
+
+    def test_generate_endpoint_reports_the_callers_alerts(self):
+        User.objects.create_user(username='admin', role=User.Role.ADMIN)
+        self.sentence.fractions.update(calculated_date=timezone.now().date() + timedelta(days=10))
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/v1/alerts/generate/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Alert.objects.count(), 2)
+        self.assertEqual((response.data['count'], response.data['unread_count']), (1, 1))
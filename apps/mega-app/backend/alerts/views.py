@@ -3,9 +3,11 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
+from notifications.events import publish_unread_change
+
 from .models import Alert
 from .serializers import AlertSerializer, AlertDashboardSerializer
-from .services import generate_alerts_for_user, get_dashboard_alert_summary
+from .services import generate_alerts_incremental, get_dashboard_alert_summary
 
 
 class AlertViewSet(viewsets.ReadOnlyModelViewSet):
@@ -35,21 +37,28 @@ class AlertViewSet(viewsets.ReadOnlyModelViewSet):
         alert = self.get_object()
         alert.is_read = True
         alert.save()
+        publish_unread_change([request.user.pk])
         return Response({'message': 'Alerta a fost marcată ca citită.'})
 
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         """Mark all alerts as read."""
         self.get_queryset().filter(is_read=False).update(is_read=True)
+        publish_unread_change([request.user.pk])
         return Response({'message': 'Toate alertele au fost marcate ca citite.'})
 
     @action(detail=False, methods=['post'])
     def generate(self, request):
-        """Generate alerts for the current user."""
-        count = generate_alerts_for_user(request.user)
+        """Bring alerts up to date (incremental: only fractions whose band changed).
+
+        `count` is the number of new alerts for the current user, not for all users.
+        """
+        count = generate_alerts_incremental()['created_by_user'][request.user.pk]
+        unread_count = self.get_queryset().filter(is_read=False).count()
         return Response({
-            'message': f'{count} alerte au fost generate.',
-            'count': count
+            'message': f'{count} alerte noi au fost generate. Aveți {unread_count} alerte necitite.',
+            'count': count,
+            'unread_count': unread_count,
         })
 
     @action(detail=False, methods=['get'])
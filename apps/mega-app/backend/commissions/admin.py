@@ -46,3 +46,8 @@ class CommissionEvaluationAdmin(admin.ModelAdmin):
     list_filter = ['session__year', 'session__month']
     search_fields = ['person__first_name', 'person__last_name', 'person__cnp']
     inlines = [CommissionArticleResultInline]
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Rezultatele pe articole nu au updated_at; exporturile se versioneaza pe sedinta
+        form.instance.session.touch()
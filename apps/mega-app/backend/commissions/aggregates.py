@@ -0,0 +1,53 @@
+"""
+Agregarea rezultatelor comisiei per articol.
+
+Toate contoarele (total, program, comportament, decizie) se calculează într-o
+singură interogare GROUP BY article cu Count(filter=Q(...)), folosită de
+rapoartele lunare / trimestriale, de stats și de exporturi.
+"""
+from django.db.models import Count, Q
+
+from .models import Article, ProgramResult, BehaviorResult, Decision
+
+RESULT_COUNTERS = {
+    'realizat': Q(program_result=ProgramResult.REALIZAT),
+    'nerealizat': Q(program_result=ProgramResult.NEREALIZAT),
+    'nerealizat_independent': Q(program_result=ProgramResult.NEREALIZAT_INDEPENDENT),
+    'pozitiv': Q(behavior_result=BehaviorResult.POZITIV),
+    'negativ': Q(behavior_result=BehaviorResult.NEGATIV),
+    'admis': Q(decision=Decision.ADMIS),
+    'respins': Q(decision=Decision.RESPINS),
+}
+
+COUNTER_KEYS = ['total', *RESULT_COUNTERS]
+
+
+def aggregate_by_article(queryset):
+    """
+    Un rând per articol (în ordinea Article.choices, inclusiv articolele
+    fără rezultate) cu contoarele din COUNTER_KEYS.
+
+    queryset - CommissionArticleResult filtrat (ex. pe an / lună).
+    """
+    counts = {
+        row['article']: row
+        for row in queryset.order_by().values('article').annotate(
+            total=Count('pk'),
+            **{key: Count('pk', filter=condition) for key, condition in RESULT_COUNTERS.items()},
+        )
+    }
+
+    rows = []
+    for art_value, art_label in Article.choices:
+        row = counts.get(art_value, {})
+        rows.append({
+            'article': art_value,
+            'article_display': art_label,
+            **{key: row.get(key, 0) for key in COUNTER_KEYS},
+        })
+    return rows
+
+
+def sum_counters(rows):
+    """Totalurile pe toate articolele."""
+    return {key: sum(row[key] for row in rows) for key in COUNTER_KEYS}
@@ -0,0 +1,33 @@
+from django.utils import timezone
+
+from .aggregates import aggregate_by_article
+from .models import CommissionSession, CommissionArticleResult, Article
+
+
+def commission_stats():
+    """Statistici KPI pentru dashboard (luna curentă)."""
+    now = timezone.now()
+    cur_year, cur_month = now.year, now.month
+
+    total_sessions = CommissionSession.objects.filter(year=cur_year, month=cur_month).count()
+
+    rows = {
+        row['article']: row
+        for row in aggregate_by_article(CommissionArticleResult.objects.filter(
+            evaluation__session__year=cur_year,
+            evaluation__session__month=cur_month,
+        ))
+    }
+    art91 = rows[Article.ART_91]
+    art92 = rows[Article.ART_92]
+
+    return {
+        'total_sessions': total_sessions,
+        'total_examinations': sum(row['total'] for row in rows.values()),
+        'art91_total': art91['total'],
+        'art91_admis': art91['admis'],
+        'art91_respins': art91['respins'],
+        'art92_total': art92['total'],
+        'art92_admis': art92['admis'],
+        'art92_respins': art92['respins'],
+    }
@@ -1,6 +1,8 @@
 import uuid
 from django.db import models
+from django.db.models import Count, Q
 from django.conf import settings
+from django.utils import timezone
 
 
 class Article(models.TextChoices):
@@ -26,6 +28,35 @@ class Decision(models.TextChoices):
     RESPINS = 'respins', 'De respins'
 
 
+class CommissionSessionQuerySet(models.QuerySet):
+    def with_counters(self):
+        """Adnotează contoarele din lista de ședințe (un singur query, fără prefetch).
+
+        evaluations_count, total_articles, art91_*/art92_*, realizat_count,
+        pozitiv_count, admis_count - aceleași nume ca în
+        CommissionSessionListSerializer.
+        """
+        result = 'evaluations__article_results'
+
+        def count(**conditions):
+            condition = Q(**{f'{result}__{field}': value for field, value in conditions.items()})
+            return Count(result, filter=condition)
+
+        return self.annotate(
+            evaluations_count=Count('evaluations', distinct=True),
+            total_articles=Count(result),
+            art91_count=count(article=Article.ART_91),
+            art91_admis=count(article=Article.ART_91, decision=Decision.ADMIS),
+            art91_respins=count(article=Article.ART_91, decision=Decision.RESPINS),
+            art92_count=count(article=Article.ART_92),
+            art92_admis=count(article=Article.ART_92, decision=Decision.ADMIS),
+            art92_respins=count(article=Article.ART_92, decision=Decision.RESPINS),
+            realizat_count=count(program_result=ProgramResult.REALIZAT),
+            pozitiv_count=count(behavior_result=BehaviorResult.POZITIV),
+            admis_count=count(decision=Decision.ADMIS),
+        )
+
+
 class CommissionSession(models.Model):
     """
     O sedinta a comisiei penitenciare. Fiecare sedinta evalueaza
@@ -56,6 +87,8 @@ class CommissionSession(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CommissionSessionQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Sedinta comisie'
         verbose_name_plural = 'Sedinte comisie'
@@ -75,16 +108,21 @@ class CommissionSession(models.Model):
         """Trimestrul (1-4) pentru aceasta luna."""
         return (self.month - 1) // 3 + 1
 
-    @property
-    def evaluations_count(self):
-        return self.evaluations.count()
-
     def save(self, *args, **kwargs):
         if self.session_date:
             self.year = self.session_date.year
             self.month = self.session_date.month
         super().save(*args, **kwargs)
 
+    def touch(self):
+        """
+        Actualizeaza updated_at fara a salva restul campurilor. Folosit cand
+        se modifica doar evaluarile / rezultatele pe articole: versiunea
+        exporturilor din cache (reports.export_cache) se ia de pe sedinta.
+        """
+        self.updated_at = timezone.now()
+        CommissionSession.objects.filter(pk=self.pk).update(updated_at=self.updated_at)
+
 
 class CommissionEvaluation(models.Model):
     """
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from django.db.models import Count, Q
+from django.db import transaction
 from persons.models import ConvictedPerson
 from .models import (
     CommissionSession, CommissionEvaluation, CommissionArticleResult,
@@ -53,18 +53,21 @@ class CommissionEvaluationSerializer(serializers.ModelSerializer):
 
 
 class CommissionSessionListSerializer(serializers.ModelSerializer):
-    """Serializare sedinta pentru lista."""
-    evaluations_count = serializers.SerializerMethodField()
-    total_articles = serializers.SerializerMethodField()
-    art91_count = serializers.SerializerMethodField()
-    art91_admis = serializers.SerializerMethodField()
-    art91_respins = serializers.SerializerMethodField()
-    art92_count = serializers.SerializerMethodField()
-    art92_admis = serializers.SerializerMethodField()
-    art92_respins = serializers.SerializerMethodField()
-    realizat_count = serializers.SerializerMethodField()
-    pozitiv_count = serializers.SerializerMethodField()
-    admis_count = serializers.SerializerMethodField()
+    """Serializare sedinta pentru lista.
+
+    Contoarele vin din CommissionSession.objects.with_counters().
+    """
+    evaluations_count = serializers.IntegerField(read_only=True)
+    total_articles = serializers.IntegerField(read_only=True)
+    art91_count = serializers.IntegerField(read_only=True)
+    art91_admis = serializers.IntegerField(read_only=True)
+    art91_respins = serializers.IntegerField(read_only=True)
+    art92_count = serializers.IntegerField(read_only=True)
+    art92_admis = serializers.IntegerField(read_only=True)
+    art92_respins = serializers.IntegerField(read_only=True)
+    realizat_count = serializers.IntegerField(read_only=True)
+    pozitiv_count = serializers.IntegerField(read_only=True)
+    admis_count = serializers.IntegerField(read_only=True)
     created_by_name = serializers.SerializerMethodField()
     quarter = serializers.IntegerField(read_only=True)
 
@@ -85,103 +88,6 @@ class CommissionSessionListSerializer(serializers.ModelSerializer):
             return obj.created_by.get_full_name() or obj.created_by.username
         return None
 
-    def get_evaluations_count(self, obj):
-        if hasattr(obj, '_prefetched_objects_cache') and 'evaluations' in obj._prefetched_objects_cache:
-            return len(obj.evaluations.all())
-        return obj.evaluations.count()
-
-    def get_total_articles(self, obj):
-        if hasattr(obj, '_prefetched_objects_cache') and 'evaluations' in obj._prefetched_objects_cache:
-            return sum(
-                len(e.article_results.all()) if hasattr(e, '_prefetched_objects_cache') and 'article_results' in e._prefetched_objects_cache
-                else e.article_results.count()
-                for e in obj.evaluations.all()
-            )
-        return CommissionArticleResult.objects.filter(evaluation__session=obj).count()
-
-    def _count_by_article(self, obj, article_value):
-        if hasattr(obj, '_prefetched_objects_cache') and 'evaluations' in obj._prefetched_objects_cache:
-            count = 0
-            for e in obj.evaluations.all():
-                if hasattr(e, '_prefetched_objects_cache') and 'article_results' in e._prefetched_objects_cache:
-                    count += sum(1 for ar in e.article_results.all() if ar.article == article_value)
-                else:
-                    count += e.article_results.filter(article=article_value).count()
-            return count
-        return CommissionArticleResult.objects.filter(
-            evaluation__session=obj, article=article_value
-        ).count()
-
-    def _count_by_article_decision(self, obj, article_value, decision_value):
-        if hasattr(obj, '_prefetched_objects_cache') and 'evaluations' in obj._prefetched_objects_cache:
-            count = 0
-            for e in obj.evaluations.all():
-                if hasattr(e, '_prefetched_objects_cache') and 'article_results' in e._prefetched_objects_cache:
-                    count += sum(1 for ar in e.article_results.all() if ar.article == article_value and ar.decision == decision_value)
-                else:
-                    count += e.article_results.filter(article=article_value, decision=decision_value).count()
-            return count
-        return CommissionArticleResult.objects.filter(
-            evaluation__session=obj, article=article_value, decision=decision_value
-        ).count()
-
-    def get_art91_count(self, obj):
-        return self._count_by_article(obj, Article.ART_91)
-
-    def get_art91_admis(self, obj):
-        return self._count_by_article_decision(obj, Article.ART_91, Decision.ADMIS)
-
-    def get_art91_respins(self, obj):
-        return self._count_by_article_decision(obj, Article.ART_91, Decision.RESPINS)
-
-    def get_art92_count(self, obj):
-        return self._count_by_article(obj, Article.ART_92)
-
-    def get_art92_admis(self, obj):
-        return self._count_by_article_decision(obj, Article.ART_92, Decision.ADMIS)
-
-    def get_art92_respins(self, obj):
-        return self._count_by_article_decision(obj, Article.ART_92, Decision.RESPINS)
-
-    def get_realizat_count(self, obj):
-        if hasattr(obj, '_prefetched_objects_cache') and 'evaluations' in obj._prefetched_objects_cache:
-            count = 0
-            for e in obj.evaluations.all():
-                if hasattr(e, '_prefetched_objects_cache') and 'article_results' in e._prefetched_objects_cache:
-                    count += sum(1 for ar in e.article_results.all() if ar.program_result == ProgramResult.REALIZAT)
-                else:
-                    count += e.article_results.filter(program_result=ProgramResult.REALIZAT).count()
-            return count
-        return CommissionArticleResult.objects.filter(
-            evaluation__session=obj, program_result=ProgramResult.REALIZAT
-        ).count()
-
-    def get_pozitiv_count(self, obj):
-        if hasattr(obj, '_prefetched_objects_cache') and 'evaluations' in obj._prefetched_objects_cache:
-            count = 0
-            for e in obj.evaluations.all():
-                if hasattr(e, '_prefetched_objects_cache') and 'article_results' in e._prefetched_objects_cache:
-                    count += sum(1 for ar in e.article_results.all() if ar.behavior_result == BehaviorResult.POZITIV)
-                else:
-                    count += e.article_results.filter(behavior_result=BehaviorResult.POZITIV).count()
-            return count
-        return CommissionArticleResult.objects.filter(
-            evaluation__session=obj, behavior_result=BehaviorResult.POZITIV
-        ).count()
-
-    def get_admis_count(self, obj):
-        if hasattr(obj, '_prefetched_objects_cache') and 'evaluations' in obj._prefetched_objects_cache:
-            count = 0
-            for e in obj.evaluations.all():
-                if hasattr(e, '_prefetched_objects_cache') and 'article_results' in e._prefetched_objects_cache:
-                    count += sum(1 for ar in e.article_results.all() if ar.decision == Decision.ADMIS)
-                else:
-                    count += e.article_results.filter(decision=Decision.ADMIS).count()
-            return count
-        return CommissionArticleResult.objects.filter(
-            evaluation__session=obj, decision=Decision.ADMIS
-        ).count()
-
 
 class CommissionSessionDetailSerializer(serializers.ModelSerializer):
     """Serializare sedinta completa cu evaluari si articole nested."""
@@ -224,13 +130,6 @@ class EvaluationInputSerializer(serializers.Serializer):
     notes = serializers.CharField(required=False, allow_blank=True, default='')
     article_results = ArticleResultInputSerializer(many=True)
 
-    def validate_person(self, value):
-        try:
-            ConvictedPerson.objects.get(pk=value)
-        except ConvictedPerson.DoesNotExist:
-            raise serializers.ValidationError('Persoana nu a fost gasita.')
-        return value
-
     def validate_article_results(self, value):
         if not value:
             raise serializers.ValidationError('Cel putin un articol este necesar.')
@@ -240,6 +139,89 @@ class EvaluationInputSerializer(serializers.Serializer):
         return value
 
 
+def validate_persons_exist(evaluations):
+    """Verifică persoanele tuturor evaluărilor cu o singură interogare.
+
+    Erorile sunt raportate pe poziția evaluării, ca la validarea per câmp.
+    """
+    persons = [e['person'] for e in evaluations]
+    found = set(ConvictedPerson.objects.filter(pk__in=persons).values_list('pk', flat=True))
+    errors = [{} if person in found else {'person': ['Persoana nu a fost gasita.']} for person in persons]
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+
+ARTICLE_RESULT_FIELDS = ['program_result', 'behavior_result', 'decision', 'notes']
+
+
+def _changed(obj, data, fields):
+    """Copiază în obj valorile diferite din data; True dacă s-a schimbat ceva."""
+    changed = False
+    for field in fields:
+        if field in data and getattr(obj, field) != data[field]:
+            setattr(obj, field, data[field])
+            changed = True
+    return changed
+
+
+def sync_evaluations(session, evaluations_data, touch=True):
+    """Aduce evaluările ședinței (și rezultatele pe articole) la lista dată.
+
+    Evaluările se compară după persoană, rezultatele după articol: rândurile
+    neschimbate rămân neatinse, iar pe fiecare nivel cele noi, modificate și
+    eliminate se scriu cu câte o interogare (bulk_create / bulk_update / delete).
+    Dacă s-a schimbat ceva, se actualizează și updated_at-ul ședinței (cu
+    touch=False când ședința tocmai a fost creată).
+    """
+    evaluations = session.evaluations.all()
+    if 'evaluations' not in getattr(session, '_prefetched_objects_cache', {}):
+        evaluations = evaluations.prefetch_related('article_results')
+    existing = {evaluation.person_id: evaluation for evaluation in evaluations}
+    evaluations_create, evaluations_update = [], []
+    results_create, results_update, stale_results = [], [], []
+
+    for eval_data in evaluations_data:
+        evaluation = existing.pop(eval_data['person'], None)
+        if evaluation is None:
+            evaluation = CommissionEvaluation(
+                session=session,
+                person_id=eval_data['person'],
+                notes=eval_data.get('notes', ''),
+            )
+            evaluations_create.append(evaluation)
+            current_results = {}
+        else:
+            if _changed(evaluation, eval_data, ['notes']):
+                evaluations_update.append(evaluation)
+            current_results = {result.article: result for result in evaluation.article_results.all()}
+
+        for ar_data in eval_data['article_results']:
+            result = current_results.pop(ar_data['article'], None)
+            if result is None:
+                results_create.append(CommissionArticleResult(evaluation=evaluation, **ar_data))
+            elif _changed(result, ar_data, ARTICLE_RESULT_FIELDS):
+                results_update.append(result)
+        stale_results.extend(result.pk for result in current_results.values())
+
+    if existing:
+        # Rezultatele pe articole se șterg în cascadă
+        CommissionEvaluation.objects.filter(pk__in=[e.pk for e in existing.values()]).delete()
+    if stale_results:
+        CommissionArticleResult.objects.filter(pk__in=stale_results).delete()
+    if evaluations_create:
+        CommissionEvaluation.objects.bulk_create(evaluations_create)
+    if evaluations_update:
+        CommissionEvaluation.objects.bulk_update(evaluations_update, ['notes'])
+    if results_create:
+        CommissionArticleResult.objects.bulk_create(results_create)
+    if results_update:
+        CommissionArticleResult.objects.bulk_update(results_update, ARTICLE_RESULT_FIELDS)
+    changed = existing or stale_results or evaluations_create or evaluations_update or results_create or results_update
+    if touch and changed:
+        session.touch()
+    getattr(session, '_prefetched_objects_cache', {}).pop('evaluations', None)
+
+
 # =============================================================================
 # Create / Update Serializers
 # =============================================================================
@@ -257,8 +239,10 @@ class CommissionSessionCreateSerializer(serializers.Serializer):
         persons = [e['person'] for e in value]
         if len(persons) != len(set(persons)):
             raise serializers.ValidationError('Persoana duplicata in lista.')
+        validate_persons_exist(value)
         return value
 
+    @transaction.atomic
     def create(self, validated_data):
         evaluations_data = validated_data.pop('evaluations')
         request = self.context['request']
@@ -270,24 +254,12 @@ class CommissionSessionCreateSerializer(serializers.Serializer):
             created_by=request.user,
         )
 
-        for eval_data in evaluations_data:
-            article_results_data = eval_data.pop('article_results')
-            evaluation = CommissionEvaluation.objects.create(
-                session=session,
-                person_id=eval_data['person'],
-                notes=eval_data.get('notes', ''),
-            )
-            for ar_data in article_results_data:
-                CommissionArticleResult.objects.create(
-                    evaluation=evaluation,
-                    **ar_data,
-                )
-
+        sync_evaluations(session, evaluations_data, touch=False)
         return session
 
 
 class CommissionSessionUpdateSerializer(serializers.Serializer):
-    """Actualizare sedinta (header + inlocuire optionala evaluari)."""
+    """Actualizare sedinta (header + sincronizare optionala evaluari)."""
     session_date = serializers.DateField(required=False)
     session_number = serializers.CharField(required=False, allow_blank=True)
     description = serializers.CharField(required=False, allow_blank=True)
@@ -298,8 +270,10 @@ class CommissionSessionUpdateSerializer(serializers.Serializer):
             persons = [e['person'] for e in value]
             if len(persons) != len(set(persons)):
                 raise serializers.ValidationError('Persoana duplicata in lista.')
+            validate_persons_exist(value)
         return value
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         evaluations_data = validated_data.pop('evaluations', None)
 
@@ -312,19 +286,6 @@ class CommissionSessionUpdateSerializer(serializers.Serializer):
         instance.save()
 
         if evaluations_data is not None:
-            # Inlocuim toate evaluarile (delete cascade + create)
-            instance.evaluations.all().delete()
-            for eval_data in evaluations_data:
-                article_results_data = eval_data.pop('article_results')
-                evaluation = CommissionEvaluation.objects.create(
-                    session=instance,
-                    person_id=eval_data['person'],
-                    notes=eval_data.get('notes', ''),
-                )
-                for ar_data in article_results_data:
-                    CommissionArticleResult.objects.create(
-                        evaluation=evaluation,
-                        **ar_data,
-                    )
+            sync_evaluations(instance, evaluations_data)
 
         return instance
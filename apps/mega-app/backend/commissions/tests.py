@@ -0,0 +1,187 @@
+import itertools
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from persons.models import ConvictedPerson
+from .aggregates import COUNTER_KEYS, aggregate_by_article, sum_counters
+from .models import (
+    CommissionSession, CommissionEvaluation, CommissionArticleResult,
+    Article, ProgramResult, BehaviorResult, Decision,
+)
+
+
+class ArticleAggregationTests(TestCase):
+    def setUp(self):
+        session = CommissionSession.objects.create(session_date=date(2025, 3, 10))
+        other_month = CommissionSession.objects.create(session_date=date(2025, 4, 10))
+        combinations = itertools.product(
+            [Article.ART_91, Article.ART_92, Article.ART_107],
+            ProgramResult.values,
+            BehaviorResult.values,
+            Decision.values,
+        )
+        for idx, (article, program, behavior, decision) in enumerate(combinations):
+            person = ConvictedPerson.objects.create(first_name=f'P{idx}', last_name='Test')
+            for target in (session, other_month) if idx % 4 == 0 else (session,):
+                evaluation = CommissionEvaluation.objects.create(session=target, person=person)
+                CommissionArticleResult.objects.create(
+                    evaluation=evaluation,
+                    article=article,
+                    program_result=program,
+                    behavior_result=behavior,
+                    decision=decision,
+                )
+        self.queryset = CommissionArticleResult.objects.filter(
+            evaluation__session__year=2025,
+            evaluation__session__month=3,
+        )
+
+    def expected_rows(self):
+        """Numărătorile calculate separat, câte o interogare pe contor."""
+        rows = []
+        for art_value, art_label in Article.choices:
+            art_qs = self.queryset.filter(article=art_value)
+            rows.append({
+                'article': art_value,
+                'article_display': art_label,
+                'total': art_qs.count(),
+                'realizat': art_qs.filter(program_result=ProgramResult.REALIZAT).count(),
+                'nerealizat': art_qs.filter(program_result=ProgramResult.NEREALIZAT).count(),
+                'nerealizat_independent': art_qs.filter(program_result=ProgramResult.NEREALIZAT_INDEPENDENT).count(),
+                'pozitiv': art_qs.filter(behavior_result=BehaviorResult.POZITIV).count(),
+                'negativ': art_qs.filter(behavior_result=BehaviorResult.NEGATIV).count(),
+                'admis': art_qs.filter(decision=Decision.ADMIS).count(),
+                'respins': art_qs.filter(decision=Decision.RESPINS).count(),
+            })
+        return rows
+
+    def test_matches_per_counter_queries(self):
+        rows = aggregate_by_article(self.queryset)
+
+        self.assertEqual(rows, self.expected_rows())
+        # Articolele fără rezultate apar cu zero
+        self.assertEqual(rows[-1]['article'], Article.GRATIERE)
+        self.assertEqual(rows[-1]['total'], 0)
+        self.assertEqual(sum_counters(rows)['total'], 36)
+
+    def test_all_counters_in_one_query(self):
+        with self.assertNumQueries(1):
+            rows = aggregate_by_article(self.queryset)
+        self.assertEqual(list(rows[0])[2:], COUNTER_KEYS)
+
+
+class SessionListCountersTests(TestCase):
+    def test_list_counters_are_annotated(self):
+        results = [
+            (Article.ART_91, ProgramResult.REALIZAT, BehaviorResult.POZITIV, Decision.ADMIS),
+            (Article.ART_91, ProgramResult.NEREALIZAT, BehaviorResult.NEGATIV, Decision.RESPINS),
+            (Article.ART_92, ProgramResult.REALIZAT, BehaviorResult.NEGATIV, Decision.RESPINS),
+        ]
+        for day in (3, 17):
+            session = CommissionSession.objects.create(session_date=date(2025, 3, day), session_number=f'S{day}')
+            for idx, (article, program, behavior, decision) in enumerate(results):
+                person = ConvictedPerson.objects.create(first_name=f'P{day}-{idx}', last_name='Ionescu')
+                evaluation = CommissionEvaluation.objects.create(session=session, person=person)
+                CommissionArticleResult.objects.create(
+                    evaluation=evaluation,
+                    article=article,
+                    program_result=program,
+                    behavior_result=behavior,
+                    decision=decision,
+                )
+            # Evaluare fără articole
+            person = ConvictedPerson.objects.create(first_name=f'Q{day}', last_name='Pop')
+            CommissionEvaluation.objects.create(session=session, person=person)
+
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username='operator'))
+        with self.assertNumQueries(2):  # count pentru paginare + lista
+            response = client.get('/api/v1/commissions/', {'search': 'ionescu'}, secure=True)
+
+        sessions = response.json()['results']
+        self.assertEqual(len(sessions), 2)
+        for session in sessions:
+            self.assertEqual(
+                [session[key] for key in (
+                    'evaluations_count', 'total_articles',
+                    'art91_count', 'art91_admis', 'art91_respins',
+                    'art92_count', 'art92_admis', 'art92_respins',
+                    'realizat_count', 'pozitiv_count', 'admis_count',
+                )],
+                [4, 3, 2, 1, 1, 1, 0, 1, 2, 1, 1],
+            )
+
+
+class SessionNestedWriteTests(TestCase):
+    def setUp(self):
+        self.persons = [ConvictedPerson.objects.create(first_name=f'P{idx}', last_name='Test') for idx in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(username='admin', is_staff=True, is_superuser=True)
+        )
+
+    def _evaluation(self, person, decision=Decision.ADMIS, articles=(Article.ART_91, Article.ART_92)):
+        return {
+            'person': str(person.pk),
+            'article_results': [
+                {
+                    'article': article,
+                    'program_result': ProgramResult.REALIZAT,
+                    'behavior_result': BehaviorResult.POZITIV,
+                    'decision': decision,
+                }
+                for article in articles
+            ],
+        }
+
+    def test_update_diffs_existing_rows(self):
+        response = self.client.post('/api/v1/commissions/', {
+            'session_date': '2025-03-10',
+            'evaluations': [self._evaluation(person) for person in self.persons],
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 201)
+        session_id = response.json()['id']
+        before = dict(CommissionArticleResult.objects.values_list('pk', 'decision'))
+        self.assertEqual(len(before), 6)
+
+        new_person = ConvictedPerson.objects.create(first_name='Nou', last_name='Test')
+        response = self.client.put(f'/api/v1/commissions/{session_id}/', {
+            'evaluations': [
+                self._evaluation(self.persons[0], decision=Decision.RESPINS),
+                self._evaluation(self.persons[1], articles=(Article.ART_91,)),
+                self._evaluation(new_person),
+            ],
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 200)
+
+        results = {
+            (person_id, article): (pk, decision)
+            for pk, person_id, article, decision in CommissionArticleResult.objects.values_list(
+                'pk', 'evaluation__person_id', 'article', 'decision'
+            )
+        }
+        self.assertEqual(len(results), 5)
+        # Rândurile modificate își păstrează id-ul
+        pk, decision = results[(self.persons[0].pk, Article.ART_91)]
+        self.assertIn(pk, before)
+        self.assertEqual(decision, Decision.RESPINS)
+        self.assertIn(results[(self.persons[1].pk, Article.ART_91)][0], before)
+        self.assertNotIn((self.persons[1].pk, Article.ART_92), results)
+        self.assertNotIn((self.persons[2].pk, Article.ART_91), results)
+        self.assertIn((new_person.pk, Article.ART_92), results)
+
+    def test_create_query_count_does_not_grow_with_evaluations(self):
+        persons = self.persons + [
+            ConvictedPerson.objects.create(first_name=f'R{idx}', last_name='Test') for idx in range(37)
+        ]
+        payload = {
+            'session_date': '2025-03-10',
+            'evaluations': [self._evaluation(person) for person in persons],
+        }
+        with self.assertNumQueries(12):
+            response = self.client.post('/api/v1/commissions/', payload, format='json', secure=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(CommissionArticleResult.objects.count(), 80)
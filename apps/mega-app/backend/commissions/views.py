@@ -7,12 +7,15 @@ from django.utils import timezone
 
 from persons.models import ConvictedPerson
 from persons.serializers import ConvictedPersonListSerializer
+from persons.search import search_persons
+from persons.utils import normalize_name
 from accounts.permissions import IsAdminOrReadOnly
 from audit.utils import log_action
+from reports.export_cache import cached_export
 
 from .models import (
     CommissionSession, CommissionEvaluation, CommissionArticleResult,
-    Article, ProgramResult, BehaviorResult, Decision,
+    Article,
 )
 from .serializers import (
     CommissionSessionListSerializer,
@@ -20,6 +23,8 @@ from .serializers import (
     CommissionSessionCreateSerializer,
     CommissionSessionUpdateSerializer,
 )
+from .aggregates import aggregate_by_article, sum_counters
+from .dashboard import commission_stats
 from .exports import export_commissions_xlsx, export_commissions_pdf
 
 
@@ -37,16 +42,21 @@ class CommissionSessionViewSet(viewsets.ModelViewSet):
     ordering = ['-session_date', '-created_at']
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        if self.action == 'list':
+            # Contoarele se calculează în SQL, fără a încărca evaluările
+            qs = CommissionSession.objects.select_related('created_by').with_counters()
+        else:
+            qs = super().get_queryset()
         search = self.request.query_params.get('search', '').strip()
         if search:
-            qs = qs.filter(
+            # Subquery pe pk: join-urile căutării nu se amestecă cu cele ale contoarelor
+            matches = CommissionSession.objects.filter(
                 Q(session_number__icontains=search) |
                 Q(description__icontains=search) |
-                Q(evaluations__person__first_name__icontains=search) |
-                Q(evaluations__person__last_name__icontains=search) |
+                Q(evaluations__person__normalized_name__contains=normalize_name(search)) |
                 Q(evaluations__person__cnp__icontains=search)
-            ).distinct()
+            )
+            qs = qs.filter(pk__in=matches.values('pk'))
         return qs
 
     def get_serializer_class(self):
@@ -114,31 +124,7 @@ class CommissionSessionViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Statistici KPI pentru dashboard."""
-        now = timezone.now()
-        cur_year, cur_month = now.year, now.month
-
-        total_sessions = CommissionSession.objects.filter(year=cur_year, month=cur_month).count()
-
-        cur_articles = CommissionArticleResult.objects.filter(
-            evaluation__session__year=cur_year,
-            evaluation__session__month=cur_month,
-        )
-        total_examinations = cur_articles.count()
-
-        # Per article stats
-        art91 = cur_articles.filter(article=Article.ART_91)
-        art92 = cur_articles.filter(article=Article.ART_92)
-
-        return Response({
-            'total_sessions': total_sessions,
-            'total_examinations': total_examinations,
-            'art91_total': art91.count(),
-            'art91_admis': art91.filter(decision=Decision.ADMIS).count(),
-            'art91_respins': art91.filter(decision=Decision.RESPINS).count(),
-            'art92_total': art92.count(),
-            'art92_admis': art92.filter(decision=Decision.ADMIS).count(),
-            'art92_respins': art92.filter(decision=Decision.RESPINS).count(),
-        })
+        return Response(commission_stats())
 
     @action(detail=False, methods=['get'])
     def monthly_report(self, request):
@@ -151,36 +137,13 @@ class CommissionSessionViewSet(viewsets.ModelViewSet):
             evaluation__session__month=month,
         )
 
-        rows = []
-        for art_choice in Article.choices:
-            art_value, art_label = art_choice
-            art_qs = articles_qs.filter(article=art_value)
-            total = art_qs.count()
-            rows.append({
-                'article': art_value,
-                'article_display': art_label,
-                'total': total,
-                'realizat': art_qs.filter(program_result=ProgramResult.REALIZAT).count(),
-                'nerealizat': art_qs.filter(program_result=ProgramResult.NEREALIZAT).count(),
-                'nerealizat_independent': art_qs.filter(program_result=ProgramResult.NEREALIZAT_INDEPENDENT).count(),
-                'pozitiv': art_qs.filter(behavior_result=BehaviorResult.POZITIV).count(),
-                'negativ': art_qs.filter(behavior_result=BehaviorResult.NEGATIV).count(),
-                'admis': art_qs.filter(decision=Decision.ADMIS).count(),
-                'respins': art_qs.filter(decision=Decision.RESPINS).count(),
-            })
-
-        # Totals
-        totals = {key: sum(r[key] for r in rows) for key in [
-            'total', 'realizat', 'nerealizat', 'nerealizat_independent',
-            'pozitiv', 'negativ', 'admis', 'respins',
-        ]}
+        rows = aggregate_by_article(articles_qs)
+        totals = sum_counters(rows)
 
         # Lista sedintelor din luna
         sessions = CommissionSession.objects.filter(
             year=year, month=month
-        ).select_related('created_by').prefetch_related(
-            'evaluations__person', 'evaluations__article_results'
-        ).order_by('session_date')
+        ).select_related('created_by').with_counters().order_by('session_date')
         sessions_list = CommissionSessionListSerializer(sessions, many=True).data
 
         return Response({
@@ -206,27 +169,8 @@ class CommissionSessionViewSet(viewsets.ModelViewSet):
             evaluation__session__month__lte=end_month,
         )
 
-        rows = []
-        for art_choice in Article.choices:
-            art_value, art_label = art_choice
-            art_qs = articles_qs.filter(article=art_value)
-            rows.append({
-                'article': art_value,
-                'article_display': art_label,
-                'total': art_qs.count(),
-                'realizat': art_qs.filter(program_result=ProgramResult.REALIZAT).count(),
-                'nerealizat': art_qs.filter(program_result=ProgramResult.NEREALIZAT).count(),
-                'nerealizat_independent': art_qs.filter(program_result=ProgramResult.NEREALIZAT_INDEPENDENT).count(),
-                'pozitiv': art_qs.filter(behavior_result=BehaviorResult.POZITIV).count(),
-                'negativ': art_qs.filter(behavior_result=BehaviorResult.NEGATIV).count(),
-                'admis': art_qs.filter(decision=Decision.ADMIS).count(),
-                'respins': art_qs.filter(decision=Decision.RESPINS).count(),
-            })
-
-        totals = {key: sum(r[key] for r in rows) for key in [
-            'total', 'realizat', 'nerealizat', 'nerealizat_independent',
-            'pozitiv', 'negativ', 'admis', 'respins',
-        ]}
+        rows = aggregate_by_article(articles_qs)
+        totals = sum_counters(rows)
 
         return Response({
             'year': year,
@@ -235,57 +179,41 @@ class CommissionSessionViewSet(viewsets.ModelViewSet):
             'totals': totals,
         })
 
-    @action(detail=False, methods=['get'])
-    def export_xlsx(self, request):
-        """Export raport comisie in XLSX."""
+    def _cached_export(self, request, fmt, export_fn):
+        """Export din cache (reports.export_cache), regenerat doar când datele se schimbă."""
         year = int(request.query_params.get('year', timezone.now().year))
         month = request.query_params.get('month')
         quarter = request.query_params.get('quarter')
 
-        base_qs = CommissionArticleResult.objects.filter(
-            evaluation__session__year=year
-        )
+        sessions = CommissionSession.objects.filter(year=year)
 
         if quarter:
             q = int(quarter)
             start_m = (q - 1) * 3 + 1
             end_m = start_m + 2
-            queryset = base_qs.filter(
-                evaluation__session__month__gte=start_m,
-                evaluation__session__month__lte=end_m,
-            )
-            return export_commissions_xlsx(queryset, year=year, quarter=q)
+            sessions = sessions.filter(month__gte=start_m, month__lte=end_m)
+            params = {'year': year, 'quarter': q}
         elif month:
-            queryset = base_qs.filter(evaluation__session__month=int(month))
-            return export_commissions_xlsx(queryset, year=year, month=int(month))
+            sessions = sessions.filter(month=int(month))
+            params = {'year': year, 'month': int(month)}
         else:
-            return export_commissions_xlsx(base_qs, year=year)
+            params = {'year': year}
+
+        queryset = CommissionArticleResult.objects.filter(evaluation__session__in=sessions)
+        return cached_export(
+            request, f'commissions.{fmt}', params, [sessions, queryset],
+            lambda: export_fn(queryset, **params),
+        )
+
+    @action(detail=False, methods=['get'])
+    def export_xlsx(self, request):
+        """Export raport comisie in XLSX."""
+        return self._cached_export(request, 'xlsx', export_commissions_xlsx)
 
     @action(detail=False, methods=['get'])
     def export_pdf(self, request):
         """Export raport comisie in PDF."""
-        year = int(request.query_params.get('year', timezone.now().year))
-        month = request.query_params.get('month')
-        quarter = request.query_params.get('quarter')
-
-        base_qs = CommissionArticleResult.objects.filter(
-            evaluation__session__year=year
-        )
-
-        if quarter:
-            q = int(quarter)
-            start_m = (q - 1) * 3 + 1
-            end_m = start_m + 2
-            queryset = base_qs.filter(
-                evaluation__session__month__gte=start_m,
-                evaluation__session__month__lte=end_m,
-            )
-            return export_commissions_pdf(queryset, year=year, quarter=q)
-        elif month:
-            queryset = base_qs.filter(evaluation__session__month=int(month))
-            return export_commissions_pdf(queryset, year=year, month=int(month))
-        else:
-            return export_commissions_pdf(base_qs, year=year)
+        return self._cached_export(request, 'pdf', export_commissions_pdf)
 
     @action(detail=False, methods=['get'])
     def persons_search(self, request):
@@ -294,10 +222,8 @@ class CommissionSessionViewSet(viewsets.ModelViewSet):
         if len(search) < 2:
             return Response([])
 
-        qs = ConvictedPerson.objects.filter(
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(cnp__icontains=search)
+        qs = search_persons(ConvictedPerson.objects.all(), search).order_by(
+            '-search_rank', 'last_name', 'first_name'
         )[:20]
 
         results = [
@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third party
     'rest_framework',
     'rest_framework_simplejwt',
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     'commissions',
     'indicatii',
     'reports',
+    'dashboard',
 ]
 
 MIDDLEWARE = [
@@ -91,6 +93,19 @@ if 'test' in sys.argv:
         'NAME': BASE_DIR / 'test.sqlite3',
     }
 
+CACHES = {
+    # Per proces (throttling DRF)
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Comun pentru workerii gunicorn și containerul cron (tabel creat cu
+    # `manage.py createcachetable`): invalidarea e vizibilă în toate procesele
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator', 'OPTIONS': {'min_length': 10}},
@@ -168,6 +183,9 @@ PETITION_DUE_SOON_DAYS = 3
 FRACTION_IMMINENT_DAYS = 30
 FRACTION_UPCOMING_DAYS = 90
 
+# Exporturi asincrone (reports.ExportJob): fișierele se șterg după acest interval
+EXPORT_JOB_RETENTION_HOURS = int(os.getenv('EXPORT_JOB_RETENTION_HOURS', '24'))
+
 # Monitor Sedinte integration
 MONITOR_SEDINTE_URL = os.getenv('MONITOR_SEDINTE_URL', 'http://host.docker.internal:8005')
 MONITOR_SEDINTE_PASSWORD = os.getenv('MONITOR_SEDINTE_PASSWORD', '')
@@ -0,0 +1,55 @@
+"""
+Callback-uri on_commit comasate: unul singur per cheie și tranzacție.
+
+Folosit pentru lucrul care trebuie făcut o dată după commit, oricât de des
+l-ar cere scrierile din tranzacție (regenerarea fracțiilor unei sentințe,
+invalidarea indicatorilor dashboard-ului, pg_notify pentru fluxurile SSE).
+"""
+import threading
+import weakref
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+_local = threading.local()
+
+
+class _OnCommitEntry:
+    def __init__(self, callback):
+        self.callback = callback
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        self.callback()
+
+
+def _pending():
+    # Conexiunile sunt per thread, deci registrul per thread e per conexiune.
+    # Django ține intrarea în lista on_commit a conexiunii până la commit și o
+    # aruncă la rollback (sau la rollback-ul savepoint-ului în care a fost
+    # înregistrată); cu referințe slabe, intrarea dispare din registru odată
+    # cu tranzacția ei.
+    pending = getattr(_local, 'pending', None)
+    if pending is None:
+        pending = _local.pending = weakref.WeakValueDictionary()
+    return pending
+
+
+def on_commit_once(key, factory, using=None):
+    """Callback-ul tranzacției curente pentru `key`.
+
+    Primul apel din tranzacție îl creează cu factory() și îl înregistrează cu
+    transaction.on_commit; apelurile următoare cu aceeași cheie primesc același
+    obiect, în care își pot adăuga datele. În afara unei tranzacții returnează
+    None, iar apelantul face lucrul direct.
+    """
+    using = using or DEFAULT_DB_ALIAS
+    if not transaction.get_connection(using).in_atomic_block:
+        return None
+    pending = _pending()
+    entry = pending.get((using, key))
+    if entry is None or entry.done:
+        entry = _OnCommitEntry(factory())
+        pending[using, key] = entry
+        transaction.on_commit(entry, using=using)
+    return entry.callback
@@ -22,6 +22,7 @@ urlpatterns = [
     path('api/v1/indicatii/', include('indicatii.urls')),
     # Shared
     path('api/v1/reports/', include('reports.urls')),
+    path('api/v1/dashboard/', include('dashboard.urls')),
     path('api/v1/audit/', include('audit.urls')),
     path('api/v1/notifications/', include('notifications.urls')),
 ]
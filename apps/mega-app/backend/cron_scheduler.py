@@ -1,6 +1,8 @@
 """
 Simple cron scheduler for running periodic management commands.
 Runs inside a Docker container as a separate service.
+Daily: generate_alerts, then send_monitor_digest.
+Also keeps the export worker (run_export_worker) running.
 """
 import os
 import time
@@ -29,11 +31,33 @@ def run_digest():
     else:
         logger.error('Digest failed: %s', result.stderr.strip())
 
+def run_alerts():
+    logger.info('Running generate_alerts...')
+    result = subprocess.run(
+        ['python', 'manage.py', 'generate_alerts'],
+        capture_output=True, text=True
+    )
+    if result.returncode == 0:
+        logger.info('Alerts completed: %s', result.stdout.strip())
+    else:
+        logger.error('Alerts failed: %s', result.stderr.strip())
+
+def ensure_export_worker(worker):
+    """Pornește (sau repornește) worker-ul de exporturi asincrone."""
+    if worker is not None and worker.poll() is None:
+        return worker
+    if worker is not None:
+        logger.error('Export worker exited with code %s, restarting', worker.returncode)
+    logger.info('Starting export worker...')
+    return subprocess.Popen(['python', 'manage.py', 'run_export_worker'])
+
 def main():
     logger.info('Cron scheduler started. Schedule: %02d:%02d (%s)', SCHEDULE_HOUR, SCHEDULE_MINUTE, TZ)
     last_run_date = None
+    export_worker = None
 
     while True:
+        export_worker = ensure_export_worker(export_worker)
         tz = ZoneInfo(TZ)
         now = datetime.now(tz)
         today = now.date()
@@ -41,6 +65,7 @@ def main():
         if (now.hour == SCHEDULE_HOUR and
             now.minute == SCHEDULE_MINUTE and
             last_run_date != today):
+            run_alerts()
             run_digest()
             last_run_date = today
 
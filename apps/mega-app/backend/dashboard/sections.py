@@ -0,0 +1,25 @@
+"""
+Secțiunile dashboard-ului Hub: indicatorii fiecărui modul, aceiași ca la
+endpoint-urile <modul>/stats, cu durata lor în cache (secunde).
+
+Secțiunile persons și alerts citesc indicatorii zilei din persons.dashboard
+(invalidați la modificări), deci TTL-ul lor e scurt; celelalte nu au
+invalidare și se recalculează la expirare.
+"""
+from collections import namedtuple
+
+from alerts.services import get_dashboard_alert_summary
+from commissions.dashboard import commission_stats
+from persons.dashboard import person_stats
+from petitions.dashboard import petition_stats
+from transfers.dashboard import transfer_stats
+
+Section = namedtuple('Section', ['compute', 'ttl'])
+
+SECTIONS = {
+    'persons': Section(person_stats, 30),
+    'alerts': Section(lambda: get_dashboard_alert_summary(None), 30),
+    'petitions': Section(petition_stats, 60),
+    'transfers': Section(transfer_stats, 300),
+    'commissions': Section(commission_stats, 300),
+}
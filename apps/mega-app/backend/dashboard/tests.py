@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from petitions.dashboard import petition_stats
+from .sections import SECTIONS
+
+
+class DashboardSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='operator'))
+
+    def test_summary_composes_sections_and_caches_them(self):
+        response = self.client.get('/api/v1/dashboard/summary/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(list(data['sections']), list(SECTIONS))
+        self.assertEqual(data['sections']['petitions'], petition_stats())
+        for name in SECTIONS:
+            self.assertFalse(data['meta'][name]['cached'])
+            self.assertNotIn('error', data['meta'][name])
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/dashboard/summary/', {'sections': 'transfers,persons'}, secure=True)
+        data = response.json()
+        self.assertEqual(list(data['sections']), ['transfers', 'persons'])
+        self.assertTrue(data['meta']['transfers']['cached'])
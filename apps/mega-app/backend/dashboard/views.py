@@ -0,0 +1,86 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import connection, connections
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .sections import SECTIONS
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'dashboard-section:{name}'
+
+
+def _compute(name):
+    """Calculează o secțiune; întoarce (date, eroare, durata în ms)."""
+    started = time.perf_counter()
+    try:
+        data, error = SECTIONS[name].compute(), None
+    except Exception as e:
+        logger.exception('Dashboard section %s failed', name)
+        data, error = None, str(e)
+    return data, error, (time.perf_counter() - started) * 1000
+
+
+def _compute_in_thread(name):
+    try:
+        return _compute(name)
+    finally:
+        # Conexiunile Django sunt per thread; cea a thread-ului din pool se închide aici
+        connections.close_all()
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard_summary(request):
+    """
+    Indicatorii tuturor modulelor într-un singur răspuns
+    (?sections=persons,petitions pentru un subset).
+
+    Secțiunile din cache (LocMem, TTL per secțiune în sections.py) se citesc
+    direct; celelalte se calculează în paralel, fiecare în thread-ul și pe
+    conexiunea ei. `meta` conține pentru fiecare secțiune durata, dacă a
+    venit din cache și eventuala eroare.
+    """
+    started = time.perf_counter()
+    requested = request.query_params.get('sections')
+    names = [name for name in requested.split(',') if name in SECTIONS] if requested else list(SECTIONS)
+
+    sections = {}
+    meta = {}
+    missing = []
+    for name in names:
+        cached = cache.get(CACHE_KEY.format(name=name))
+        if cached is None:
+            missing.append(name)
+        else:
+            sections[name] = cached
+            meta[name] = {'cached': True, 'duration_ms': 0, 'ttl': SECTIONS[name].ttl}
+
+    if missing:
+        if connection.in_atomic_block or len(missing) == 1:
+            # Într-o tranzacție deschisă thread-urile nu ar vedea aceleași date
+            results = [_compute(name) for name in missing]
+        else:
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                results = list(pool.map(_compute_in_thread, missing))
+
+        for name, (data, error, duration) in zip(missing, results):
+            sections[name] = data
+            meta[name] = {'cached': False, 'duration_ms': round(duration, 1), 'ttl': SECTIONS[name].ttl}
+            if error is None:
+                cache.set(CACHE_KEY.format(name=name), data, SECTIONS[name].ttl)
+            else:
+                meta[name]['error'] = error
+
+    return Response({
+        'sections': {name: sections[name] for name in names},
+        'meta': {
+            **{name: meta[name] for name in names},
+            'total_ms': round((time.perf_counter() - started) * 1000, 1),
+        },
+    })
@@ -0,0 +1,237 @@
+"""
+Numărul de alerte și notificări necitite, trimis prin Server-Sent Events.
+
+Scrierile (alerte generate / citite, notificări create / citite) apelează
+publish_unread_change(); după commit se trimite un pg_notify pe canalul
+UNREAD_CHANNEL cu id-urile utilizatorilor afectați ('*' = toți). Procesul
+ASGI (config.asgi, serviciul `events`) ține o singură conexiune LISTEN și
+trezește doar fluxurile acelor utilizatori; fiecare flux recalculează
+numerele și trimite un eveniment numai dacă s-au schimbat. Pe alte baze de
+date (sqlite în dezvoltare) fluxurile recalculează la FALLBACK_POLL_SECONDS.
+
+    POST /api/v1/notifications/stream_token/  -> {"token": ..., "expires_in": ...}
+    GET  /api/v1/notifications/stream/?token=<token>
+
+    event: counts
+    id: 3.1
+    data: {"alerts": 3, "notifications": 1, "delta": {"alerts": 1, "notifications": 0}}
+
+EventSource nu poate trimite antetul Authorization, deci fluxul primește un
+token semnat (valabil STREAM_TOKEN_MAX_AGE), obținut o dată prin API-ul
+autentificat cu JWT; reconectările îl refolosesc fără o cerere DRF. Id-ul
+evenimentului conține numerele trimise; la reconectare browserul îl întoarce
+în Last-Event-ID (sau clientul în ?last_event_id=), iar primul eveniment
+conține diferența față de acele valori. Fără id, `delta` este null.
+"""
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core import signing
+from django.db import connections
+
+from alerts.models import Alert
+from config.transactions import on_commit_once
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+UNREAD_CHANNEL = 'unread_counts'
+ALL_USERS = '*'
+# pg_notify acceptă payload-uri de cel mult 8000 bytes
+NOTIFY_MAX_IDS = 500
+
+STREAM_TOKEN_SALT = 'notifications.stream'
+STREAM_TOKEN_MAX_AGE = 12 * 60 * 60
+KEEPALIVE_SECONDS = 15
+RETRY_MS = 5000
+FALLBACK_POLL_SECONDS = 5
+LISTEN_RETRY_SECONDS = 5
+
+COUNT_KEYS = ('alerts', 'notifications')
+
+
+def make_stream_token(user):
+    return signing.dumps(user.pk, salt=STREAM_TOKEN_SALT)
+
+
+def stream_token_user_id(token):
+    """Id-ul utilizatorului din token, sau None dacă tokenul e invalid / expirat."""
+    try:
+        return signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=STREAM_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+
+
+def unread_counts(user_id):
+    return {
+        'alerts': Alert.objects.filter(user_id=user_id, is_read=False).count(),
+        'notifications': Notification.objects.filter(user_id=user_id, is_read=False).count(),
+    }
+
+
+def format_event_id(counts):
+    return '.'.join(str(counts[key]) for key in COUNT_KEYS)
+
+
+def parse_event_id(value):
+    """Numerele dintr-un Last-Event-ID trimis anterior, sau None."""
+    parts = (value or '').split('.')
+    if len(parts) != len(COUNT_KEYS) or not all(part.isdigit() for part in parts):
+        return None
+    return dict(zip(COUNT_KEYS, map(int, parts)))
+
+
+# --- publicare (procesele WSGI și cron) ---
+
+class _UnreadPublish:
+    """Callback on_commit; id-urile se adună pe toată tranzacția."""
+
+    def __init__(self, using):
+        self.using = using
+        self.user_ids = set()
+
+    def add(self, user_ids):
+        if user_ids is None or ALL_USERS in self.user_ids:
+            self.user_ids = {ALL_USERS}
+        else:
+            self.user_ids.update(str(pk) for pk in user_ids)
+
+    def __call__(self):
+        ids = sorted(self.user_ids)
+        if not ids:
+            return
+        with connections[self.using].cursor() as cursor:
+            for i in range(0, len(ids), NOTIFY_MAX_IDS):
+                cursor.execute('SELECT pg_notify(%s, %s)', [UNREAD_CHANNEL, ','.join(ids[i:i + NOTIFY_MAX_IDS])])
+
+
+def publish_unread_change(user_ids=None, using='default'):
+    """Anunță fluxurile SSE că numerele necitite ale `user_ids` (None = toți) s-au schimbat."""
+    if connections[using].vendor != 'postgresql':
+        return
+    publish = on_commit_once(UNREAD_CHANNEL, lambda: _UnreadPublish(using), using=using)
+    if publish is None:
+        publish = _UnreadPublish(using)
+        publish.add(user_ids)
+        publish()
+    else:
+        publish.add(user_ids)
+
+
+# --- ascultare (procesul ASGI) ---
+
+def _listen_connection():
+    wrapper = connections.create_connection('default')
+    connection = wrapper.get_new_connection(wrapper.get_connection_params())
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute(f'LISTEN {UNREAD_CHANNEL}')
+    return connection
+
+
+class _UnreadBroker:
+    """Abonații fluxurilor SSE din procesul curent și ascultătorul comun."""
+
+    def __init__(self):
+        self.subscribers = {}
+        self._task = None
+
+    def subscribe(self, user_id):
+        changed = asyncio.Event()
+        self.subscribers.setdefault(user_id, set()).add(changed)
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+        return changed
+
+    def unsubscribe(self, user_id, changed):
+        events = self.subscribers.get(user_id)
+        if events is not None:
+            events.discard(changed)
+            if not events:
+                del self.subscribers[user_id]
+
+    def wake(self, payload):
+        if payload == ALL_USERS:
+            groups = list(self.subscribers.values())
+        else:
+            groups = [self.subscribers.get(int(pk), ()) for pk in payload.split(',') if pk.isdigit()]
+        for events in groups:
+            for changed in events:
+                changed.set()
+
+    async def _run(self):
+        if connections['default'].vendor != 'postgresql':
+            while self.subscribers:
+                await asyncio.sleep(FALLBACK_POLL_SECONDS)
+                self.wake(ALL_USERS)
+            return
+        while self.subscribers:
+            try:
+                await self._listen()
+            except Exception:
+                logger.exception('LISTEN %s failed, retrying', UNREAD_CHANNEL)
+                await asyncio.sleep(LISTEN_RETRY_SECONDS)
+                # Notificările din timpul întreruperii s-au pierdut
+                self.wake(ALL_USERS)
+
+    async def _listen(self):
+        loop = asyncio.get_running_loop()
+        connection = await loop.run_in_executor(None, _listen_connection)
+        readable = asyncio.Event()
+        loop.add_reader(connection.fileno(), readable.set)
+        try:
+            while self.subscribers:
+                try:
+                    await asyncio.wait_for(readable.wait(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                readable.clear()
+                connection.poll()
+                while connection.notifies:
+                    self.wake(connection.notifies.pop(0).payload)
+        finally:
+            loop.remove_reader(connection.fileno())
+            connection.close()
+
+
+broker = _UnreadBroker()
+
+
+def _event(counts, previous):
+    delta = None
+    if previous is not None:
+        delta = {key: counts[key] - previous[key] for key in COUNT_KEYS}
+    data = json.dumps({**counts, 'delta': delta})
+    return f'event: counts\nid: {format_event_id(counts)}\ndata: {data}\n\n'
+
+
+async def unread_events(user_id, last_counts=None):
+    """Generator SSE: un eveniment la fiecare schimbare, comentariu keepalive după KEEPALIVE_SECONDS de liniște."""
+    loop = asyncio.get_running_loop()
+    changed = broker.subscribe(user_id)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        previous = last_counts
+        sent = False
+        while True:
+            changed.clear()
+            counts = await sync_to_async(unread_counts)(user_id)
+            if not sent or counts != previous:
+                yield _event(counts, previous)
+                previous = counts
+                sent = True
+                last_write = loop.time()
+            # Trezirile fără schimbare nu scriu nimic, deci keepalive-ul se
+            # calculează de la ultima scriere
+            while not changed.is_set():
+                remaining = last_write + KEEPALIVE_SECONDS - loop.time()
+                try:
+                    await asyncio.wait_for(changed.wait(), max(remaining, 0))
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    last_write = loop.time()
+    finally:
+        broker.unsubscribe(user_id, changed)
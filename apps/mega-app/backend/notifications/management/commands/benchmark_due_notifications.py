@@ -0,0 +1,115 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from notifications.models import Notification, current_date
+from notifications.services import generate_due_notifications
+from petitions.models import Petition
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _legacy():
+    """Varianta anterioară: exists() + create() pentru fiecare pereche petiție × utilizator."""
+    today = current_date()
+    response_days = getattr(settings, 'PETITION_RESPONSE_DAYS', 12)
+    due_soon_days = getattr(settings, 'PETITION_DUE_SOON_DAYS', 3)
+    users = User.objects.filter(is_active=True, role__in=[User.Role.OPERATOR, User.Role.ADMIN])
+    overdue_boundary = today - timedelta(days=response_days)
+    groups = [
+        (Notification.NotificationType.OVERDUE, Petition.objects.filter(
+            registration_date__lte=overdue_boundary,
+        )),
+        (Notification.NotificationType.DUE_SOON, Petition.objects.filter(
+            registration_date__gt=overdue_boundary,
+            registration_date__lte=today + timedelta(days=due_soon_days - response_days),
+        )),
+    ]
+    created = 0
+    for notification_type, petitions in groups:
+        for petition in petitions.exclude(status=Petition.Status.SOLUTIONATA):
+            for user in users:
+                if Notification.objects.filter(
+                    user=user, petition=petition, type=notification_type, day=today
+                ).exists():
+                    continue
+                Notification.objects.create(
+                    user=user,
+                    type=notification_type,
+                    petition=petition,
+                    message=f'Petiția {petition.registration_number}',
+                    due_date=petition.response_due_date,
+                )
+                created += 1
+    return created
+
+
+class Command(BaseCommand):
+    help = 'Benchmark due-notification generation: per-pair exists/create vs one bulk_create (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--petitions', type=int, default=2000, help='Open petitions (overdue or due soon)')
+        parser.add_argument('--users', type=int, default=30, help='Operator/admin users')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options['petitions'], options['users'])
+                for label, func in [
+                    ('legacy (first run)', _legacy),
+                    ('legacy (repeat)', _legacy),
+                ]:
+                    self._report(label, func)
+                Notification.objects.all().delete()
+                for label, func in [
+                    ('bulk_create (first run)', generate_due_notifications),
+                    ('bulk_create (repeat)', generate_due_notifications),
+                ]:
+                    self._report(label, func)
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write('Done! All benchmark data rolled back.')
+
+    def _seed(self, petition_count, user_count):
+        today = current_date()
+        response_days = getattr(settings, 'PETITION_RESPONSE_DAYS', 12)
+        User.objects.bulk_create(
+            User(username=f'benchmark-{i}', role=User.Role.OPERATOR)
+            for i in range(user_count)
+        )
+        # Jumătate depășite, jumătate cu termen apropiat
+        Petition.objects.bulk_create(
+            Petition(
+                registration_prefix='BM',
+                registration_seq=i + 1,
+                registration_year=today.year,
+                registration_date=today - timedelta(days=response_days + (i % 10 if i % 2 else -1 - i % 3)),
+                petitioner_type=Petition.PetitionerType.ALTUL,
+                petitioner_name=f'Petiționar {i}',
+                object_type=Petition.ObjectType.ALTELE,
+            )
+            for i in range(petition_count)
+        )
+
+    def _report(self, label, func):
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_queries):
+            started = time.perf_counter()
+            created = func()
+            elapsed = time.perf_counter() - started
+        self.stdout.write(f'{label:<24} {created:>7} created in {elapsed:7.2f}s, {queries} queries')
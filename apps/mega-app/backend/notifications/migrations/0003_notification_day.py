@@ -0,0 +1,48 @@
+# Generated by Django 5.0.1 on 2026-10-17 13:02
+
+import datetime
+
+import notifications.models
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def backfill_day(apps, schema_editor):
+    """Ziua notificărilor existente = data creării; duplicatele de termen din aceeași zi se șterg."""
+    Notification = apps.get_model('notifications', 'Notification')
+    Notification.objects.update(day=TruncDate('created_at', tzinfo=datetime.timezone.utc))
+
+    seen = set()
+    duplicates = []
+    rows = Notification.objects.filter(type__in=['due_soon', 'overdue']).order_by('created_at').values_list(
+        'pk', 'user_id', 'petition_id', 'type', 'day'
+    )
+    for pk, *key in rows.iterator():
+        key = tuple(key)
+        if key in seen:
+            duplicates.append(pk)
+        seen.add(key)
+    Notification.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_rename_notificatio_user_id_8c9c5e_idx_notificatio_user_id_427e4b_idx_and_more'),
+        ('petitions', '0003_petition_detention_sector_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='day',
+            field=models.DateField(default=notifications.models.current_date, editable=False, verbose_name='Ziua'),
+        ),
+        migrations.RunPython(backfill_day, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('type__in', ['due_soon', 'overdue'])), fields=('user', 'petition', 'type', 'day'), name='unique_due_notification_per_day'),
+        ),
+    ]
@@ -1,6 +1,11 @@
 import uuid
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+
+def current_date():
+    return timezone.now().date()
 
 
 class Notification(models.Model):
@@ -38,6 +43,9 @@ class Notification(models.Model):
         default=False,
         verbose_name='Citită'
     )
+    # Ziua pentru care s-a generat notificarea; cel mult o notificare de termen
+    # (due_soon / overdue) per utilizator, petiție și zi
+    day = models.DateField(default=current_date, editable=False, verbose_name='Ziua')
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -49,6 +57,13 @@ class Notification(models.Model):
             models.Index(fields=['type']),
             models.Index(fields=['created_at']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'petition', 'type', 'day'],
+                condition=models.Q(type__in=['due_soon', 'overdue']),
+                name='unique_due_notification_per_day',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.get_type_display()} - {self.petition.registration_number}"
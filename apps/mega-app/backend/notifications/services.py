@@ -1,90 +1,84 @@
 from datetime import timedelta
-from django.utils import timezone
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import Notification
+from .events import publish_unread_change
+from .models import Notification, current_date
 from petitions.models import Petition
 
 User = get_user_model()
 
 
+NOTIFICATION_BATCH_SIZE = 1000
+
+
 def generate_due_notifications():
     """
     Generate notifications for petitions that are due soon or overdue.
     This should be called periodically (e.g., on dashboard access or via cron).
-    Avoids creating duplicates.
+
+    Candidates come from a single query; all rows are written with one
+    bulk_create(ignore_conflicts=True). Duplicates (same user, petition,
+    type and day) are rejected by the unique_due_notification_per_day
+    constraint, so concurrent runs are safe.
+
+    Returns the number of notifications inserted by this run: the ids are
+    generated here, so rows skipped as duplicates (including those written
+    by a concurrent run) are not counted.
     """
-    today = timezone.now().date()
+    today = current_date()
     response_days = getattr(settings, 'PETITION_RESPONSE_DAYS', 12)
     due_soon_days = getattr(settings, 'PETITION_DUE_SOON_DAYS', 3)
+    overdue_boundary = today - timedelta(days=response_days)
+    due_soon_boundary = today + timedelta(days=due_soon_days)
 
     # Get operators and admins who should receive notifications
-    users = User.objects.filter(
+    user_ids = list(User.objects.filter(
         is_active=True,
         role__in=[User.Role.OPERATOR, User.Role.ADMIN]
-    )
-
-    notifications_created = 0
-
-    # Find overdue petitions
-    overdue_boundary = today - timedelta(days=response_days)
-    overdue_petitions = Petition.objects.filter(
-        registration_date__lte=overdue_boundary
-    ).exclude(
-        status=Petition.Status.SOLUTIONATA
-    )
-
-    for petition in overdue_petitions:
-        for user in users:
-            # Check if we already have an overdue notification for this petition/user today
-            existing = Notification.objects.filter(
-                user=user,
-                petition=petition,
-                type=Notification.NotificationType.OVERDUE,
-                created_at__date=today
-            ).exists()
-
-            if not existing:
-                Notification.objects.create(
-                    user=user,
-                    type=Notification.NotificationType.OVERDUE,
-                    petition=petition,
-                    message=f"Petiția {petition.registration_number} a depășit termenul de răspuns!",
-                    due_date=petition.response_due_date
-                )
-                notifications_created += 1
+    ).values_list('pk', flat=True))
+    if not user_ids:
+        return 0
 
-    # Find petitions due soon (within 3 days but not overdue)
-    due_soon_boundary = today + timedelta(days=due_soon_days)
-    due_soon_petitions = Petition.objects.filter(
-        registration_date__gt=overdue_boundary,
+    # Overdue petitions and petitions due soon (within 3 days but not overdue)
+    petitions = Petition.objects.filter(
         registration_date__lte=due_soon_boundary - timedelta(days=response_days)
     ).exclude(
         status=Petition.Status.SOLUTIONATA
+    ).only('registration_prefix', 'registration_year', 'registration_date')
+
+    notifications = []
+    for petition in petitions:
+        due_date = petition.response_due_date
+        if petition.registration_date <= overdue_boundary:
+            notification_type = Notification.NotificationType.OVERDUE
+            message = f"Petiția {petition.registration_number} a depășit termenul de răspuns!"
+        else:
+            notification_type = Notification.NotificationType.DUE_SOON
+            days_left = (due_date - today).days
+            message = f"Petiția {petition.registration_number} expiră în {days_left} zile."
+        notifications.extend(
+            Notification(
+                user_id=user_id,
+                type=notification_type,
+                petition_id=petition.pk,
+                message=message,
+                due_date=due_date,
+                day=today,
+            )
+            for user_id in user_ids
+        )
+    if not notifications:
+        return 0
+
+    Notification.objects.bulk_create(notifications, batch_size=NOTIFICATION_BATCH_SIZE, ignore_conflicts=True)
+    ids = [notification.pk for notification in notifications]
+    created = sum(
+        Notification.objects.filter(pk__in=ids[i:i + NOTIFICATION_BATCH_SIZE]).count()
+        for i in range(0, len(ids), NOTIFICATION_BATCH_SIZE)
     )
-
-    for petition in due_soon_petitions:
-        for user in users:
-            # Check if we already have a due_soon notification for this petition/user today
-            existing = Notification.objects.filter(
-                user=user,
-                petition=petition,
-                type=Notification.NotificationType.DUE_SOON,
-                created_at__date=today
-            ).exists()
-
-            if not existing:
-                days_left = (petition.response_due_date - today).days
-                Notification.objects.create(
-                    user=user,
-                    type=Notification.NotificationType.DUE_SOON,
-                    petition=petition,
-                    message=f"Petiția {petition.registration_number} expiră în {days_left} zile.",
-                    due_date=petition.response_due_date
-                )
-                notifications_created += 1
-
-    return notifications_created
+    if created:
+        publish_unread_change(user_ids)
+    return created
 
 
 def notify_assignment(petition, assigned_user):
@@ -96,6 +90,7 @@ def notify_assignment(petition, assigned_user):
         message=f"Vi s-a atribuit petiția {petition.registration_number}.",
         due_date=petition.response_due_date
     )
+    publish_unread_change([assigned_user.pk])
 
 
 def notify_status_change(petition, old_status, new_status):
@@ -107,3 +102,4 @@ def notify_status_change(petition, old_status, new_status):
             petition=petition,
             message=f"Statusul petiției {petition.registration_number} s-a schimbat din '{old_status}' în '{new_status}'."
         )
+        publish_unread_change([petition.assigned_to_id])
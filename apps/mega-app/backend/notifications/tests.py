@@ -0,0 +1,154 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from petitions.models import Petition
+from . import events
+from .models import Notification, current_date
+from .services import generate_due_notifications
+
+STREAM_URL = '/api/v1/notifications/stream/'
+
+
+def _parse(chunk):
+    fields = {}
+    for line in chunk.decode().strip().splitlines():
+        name, _, value = line.partition(': ')
+        fields[name] = value
+    return fields
+
+
+@mock.patch.object(events, 'FALLBACK_POLL_SECONDS', 0.01)
+class UnreadStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='operator')
+        cls.petition = Petition.objects.create(
+            petitioner_type=Petition.PetitionerType.CONDAMNAT,
+            petitioner_name='Petiționar',
+            object_type=Petition.ObjectType.ALTELE,
+        )
+        cls.token = events.make_stream_token(cls.user)
+
+    def _notify(self):
+        return Notification.objects.create(
+            user=self.user, type=Notification.NotificationType.ASSIGNED, petition=self.petition, message='Test',
+        )
+
+    def test_stream_token_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/v1/notifications/stream_token/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(events.stream_token_user_id(response.json()['token']), self.user.pk)
+        self.assertIsNone(events.stream_token_user_id('invalid'))
+
+    def test_stream_is_not_served_by_wsgi_workers(self):
+        response = self.client.get(STREAM_URL, {'token': self.token}, secure=True)
+        self.assertEqual(response.status_code, 503)
+
+    async def test_invalid_token_is_rejected(self):
+        response = await self.async_client.get(STREAM_URL, {'token': 'invalid'}, secure=True)
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_pushes_count_changes(self):
+        await sync_to_async(self._notify)()
+        response = await self.async_client.get(STREAM_URL, {'token': self.token}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+
+        self.assertEqual(_parse(await anext(stream)), {'retry': str(events.RETRY_MS)})
+        first = _parse(await anext(stream))
+        self.assertEqual(first['event'], 'counts')
+        self.assertEqual(first['id'], '0.1')
+        self.assertEqual(json.loads(first['data']), {'alerts': 0, 'notifications': 1, 'delta': None})
+
+        await sync_to_async(self._notify)()
+        second = _parse(await anext(stream))
+        self.assertEqual(second['id'], '0.2')
+        self.assertEqual(json.loads(second['data'])['delta'], {'alerts': 0, 'notifications': 1})
+
+    async def test_reconnect_sends_delta_from_last_event_id(self):
+        await sync_to_async(self._notify)()
+        response = await self.async_client.get(
+            STREAM_URL, {'token': self.token}, headers={'Last-Event-ID': '0.3'}, secure=True,
+        )
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        data = json.loads(_parse(await anext(stream))['data'])
+        self.assertEqual(data['delta'], {'alerts': 0, 'notifications': -2})
+
+
+@override_settings(PETITION_RESPONSE_DAYS=12, PETITION_DUE_SOON_DAYS=3)
+class DueNotificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = [
+            User.objects.create_user(username='operator', role=User.Role.OPERATOR),
+            User.objects.create_user(username='admin', role=User.Role.ADMIN),
+        ]
+        User.objects.create_user(username='viewer', role=User.Role.VIEWER)
+
+    def _petition(self, days_ago, **extra):
+        return Petition.objects.create(
+            registration_date=current_date() - timedelta(days=days_ago),
+            petitioner_type=Petition.PetitionerType.CONDAMNAT,
+            petitioner_name='Petiționar',
+            object_type=Petition.ObjectType.ALTELE,
+            **extra,
+        )
+
+    def _types(self, petition):
+        return set(Notification.objects.filter(petition=petition).values_list('type', flat=True))
+
+    def test_boundaries(self):
+        overdue = self._petition(12)
+        due_first_day = self._petition(11)
+        due_last_day = self._petition(9)
+        not_due = self._petition(8)
+        solved = self._petition(20, status=Petition.Status.SOLUTIONATA)
+
+        self.assertEqual(generate_due_notifications(), 3 * len(self.users))
+        self.assertEqual(self._types(overdue), {Notification.NotificationType.OVERDUE})
+        self.assertEqual(self._types(due_first_day), {Notification.NotificationType.DUE_SOON})
+        self.assertEqual(self._types(due_last_day), {Notification.NotificationType.DUE_SOON})
+        self.assertEqual(self._types(not_due), set())
+        self.assertEqual(self._types(solved), set())
+
+    def test_rerun_same_day_creates_nothing(self):
+        self._petition(12)
+        self._petition(10)
+        self.assertEqual(generate_due_notifications(), 4)
+        self.assertEqual(generate_due_notifications(), 0)
+        self.assertEqual(Notification.objects.count(), 4)
+
+    def test_count_ignores_rows_from_other_runs(self):
+        petition = self._petition(12)
+        # Rânduri scrise de o rulare concurentă în aceeași zi
+        Notification.objects.create(
+            user=self.users[0], type=Notification.NotificationType.OVERDUE, petition=petition, message='Test',
+        )
+        self.assertEqual(generate_due_notifications(), 1)
+
+    def test_constraint_only_applies_to_due_types(self):
+        petition = self._petition(12)
+        for _ in range(2):
+            Notification.objects.create(
+                user=self.users[0], type=Notification.NotificationType.ASSIGNED, petition=petition, message='Test',
+            )
+        self.assertEqual(generate_due_notifications(), 2)
+        self.assertEqual(
+            Notification.objects.filter(type=Notification.NotificationType.ASSIGNED).count(), 2,
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Notification.objects.create(
+                user=self.users[0], type=Notification.NotificationType.OVERDUE, petition=petition, message='Test',
+            )
@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet
+from .views import NotificationViewSet, unread_stream
 
 router = DefaultRouter()
 router.register('', NotificationViewSet, basename='notification')
 
 urlpatterns = [
+    # Înaintea rutelor viewset-ului, altfel 'stream' ar fi tratat ca id
+    path('stream/', unread_stream, name='notification-stream'),
     path('', include(router.urls)),
 ]
@@ -1,11 +1,20 @@
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Notification
 from .serializers import NotificationSerializer
+from .events import (
+    STREAM_TOKEN_MAX_AGE, make_stream_token, parse_event_id, publish_unread_change, stream_token_user_id,
+    unread_events,
+)
 from .services import generate_due_notifications
 
+User = get_user_model()
+
 
 class NotificationViewSet(viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
@@ -16,6 +25,14 @@ class NotificationViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user).select_related('petition')
 
+    def perform_update(self, serializer):
+        serializer.save()
+        publish_unread_change([self.request.user.pk])
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        publish_unread_change([self.request.user.pk])
+
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get count of unread notifications."""
@@ -26,6 +43,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
     def mark_all_read(self, request):
         """Mark all notifications as read."""
         updated = self.get_queryset().filter(is_read=False).update(is_read=True)
+        publish_unread_change([request.user.pk])
         return Response({'marked_read': updated})
 
     @action(detail=True, methods=['post'])
@@ -34,6 +52,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
         notification = self.get_object()
         notification.is_read = True
         notification.save()
+        publish_unread_change([request.user.pk])
         return Response({'status': 'marked_read'})
 
     @action(detail=False, methods=['post'])
@@ -41,3 +60,31 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """Generate due notifications (can be called on dashboard load)."""
         count = generate_due_notifications()
         return Response({'notifications_created': count})
+
+    @action(detail=False, methods=['post'])
+    def stream_token(self, request):
+        """Token for the unread-count event stream (EventSource cannot send Authorization)."""
+        return Response({'token': make_stream_token(request.user), 'expires_in': STREAM_TOKEN_MAX_AGE})
+
+
+async def unread_stream(request):
+    """Server-Sent Events with the unread alert / notification counts (see notifications.events)."""
+    if not isinstance(request, ASGIRequest):
+        # Sub WSGI fluxul ar ține ocupat un worker sincron cât timp e deschis
+        return JsonResponse(
+            {'error': 'Fluxul de evenimente este disponibil doar prin serviciul ASGI.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    user_id = stream_token_user_id(request.GET.get('token', ''))
+    if user_id is None or not await User.objects.filter(pk=user_id, is_active=True).aexists():
+        return JsonResponse({'error': 'Token invalid sau expirat.'}, status=status.HTTP_401_UNAUTHORIZED)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    response = StreamingHttpResponse(
+        unread_events(user_id, parse_event_id(last_event_id)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Fără buffering în proxy (nginx)
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -5,3 +5,7 @@ class PersonsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'persons'
     verbose_name = 'Persoane condamnate'
+
+    def ready(self):
+        # Invalidarea indicatorilor dashboard-ului (persons.dashboard)
+        from . import signals  # noqa: F401
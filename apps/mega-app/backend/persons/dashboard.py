@@ -0,0 +1,94 @@
+"""
+Indicatorii dashboard-ului (persoane + benzile fracțiilor) într-o singură
+interogare, păstrați în cache până la sfârșitul zilei.
+
+Benzile depind de data curentă, deci cheia conține ziua; în cursul zilei
+valorile se schimbă doar când se modifică persoane, sentințe sau fracții,
+iar atunci cheia zilei se șterge (persons/signals.py și, pentru scrierile
+bulk, apelurile explicite la invalidate_dashboard_kpis).
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from config.transactions import on_commit_once
+from .models import ConvictedPerson
+
+CACHE_ALIAS = 'shared'
+CACHE_KEY = 'dashboard-kpis:{day}'
+
+
+def compute_dashboard_kpis(today):
+    imminent = today + timedelta(days=getattr(settings, 'FRACTION_IMMINENT_DAYS', 30))
+    upcoming = today + timedelta(days=getattr(settings, 'FRACTION_UPCOMING_DAYS', 90))
+
+    # persoană -> sentințe -> fracții: fiecare fracție apare o singură dată în
+    # join, persoanele se numără cu distinct
+    active = Q(sentences__status='active')
+    pending = active & Q(sentences__fractions__is_fulfilled=False)
+    date = 'sentences__fractions__calculated_date'
+    return ConvictedPerson.objects.aggregate(
+        total_persons=Count('pk', distinct=True),
+        persons_with_active_sentences=Count('pk', distinct=True, filter=active),
+        released_persons=Count('pk', distinct=True, filter=Q(release_date__isnull=False)),
+        overdue_fractions=Count('sentences__fractions', filter=pending & Q(**{f'{date}__lt': today})),
+        imminent_fractions=Count(
+            'sentences__fractions', filter=pending & Q(**{f'{date}__gte': today, f'{date}__lte': imminent})
+        ),
+        upcoming_fractions=Count(
+            'sentences__fractions', filter=pending & Q(**{f'{date}__gt': imminent, f'{date}__lte': upcoming})
+        ),
+        fulfilled_fractions=Count(
+            'sentences__fractions', filter=active & Q(sentences__fractions__is_fulfilled=True)
+        ),
+    )
+
+
+def _seconds_until_midnight(now):
+    midnight = datetime.combine(now.date() + timedelta(days=1), time.min, tzinfo=now.tzinfo)
+    return max(1, int((midnight - now).total_seconds()))
+
+
+def get_dashboard_kpis():
+    """Indicatorii zilei curente (din cache sau calculați și salvați)."""
+    now = timezone.now()
+    key = CACHE_KEY.format(day=now.date().isoformat())
+    cache = caches[CACHE_ALIAS]
+    kpis = cache.get(key)
+    if kpis is None:
+        kpis = compute_dashboard_kpis(now.date())
+        cache.set(key, kpis, _seconds_until_midnight(now))
+    return kpis
+
+
+PERSON_STATS_KEYS = [
+    'total_persons', 'persons_with_active_sentences', 'released_persons',
+    'overdue_fractions', 'imminent_fractions', 'upcoming_fractions',
+]
+
+
+def person_stats():
+    """Răspunsul ConvictedPersonViewSet.stats."""
+    kpis = get_dashboard_kpis()
+    return {key: kpis[key] for key in PERSON_STATS_KEYS}
+
+
+class _DashboardInvalidation:
+    """Callback on_commit (unul singur per tranzacție, vezi on_commit_once)."""
+
+    def __call__(self):
+        key = CACHE_KEY.format(day=timezone.now().date().isoformat())
+        caches[CACHE_ALIAS].delete(key)
+
+
+def invalidate_dashboard_kpis():
+    """Șterge indicatorii zilei după commit-ul tranzacției curente.
+
+    Ștergerea la commit evită ca o altă cerere să recalculeze și să pună în
+    cache datele de dinaintea modificării cât timp tranzacția e încă deschisă.
+    """
+    if on_commit_once('dashboard_kpis', _DashboardInvalidation) is None:
+        _DashboardInvalidation()()
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1
+
+from django.db import migrations, models
+
+
+def backfill_active_sentence_end_date(apps, schema_editor):
+    ConvictedPerson = apps.get_model('persons', 'ConvictedPerson')
+    Sentence = apps.get_model('sentences', 'Sentence')
+    active = Sentence.objects.filter(
+        person=models.OuterRef('pk'),
+        status='active',
+    ).order_by('-start_date')
+    ConvictedPerson.objects.update(
+        active_sentence_end_date=models.Subquery(active.values('effective_end_date')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0005_convictedperson_release_type'),
+        ('sentences', '0007_sentence_effective_duration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='convictedperson',
+            name='active_sentence_end_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='Data sfârșit sentință activă'),
+        ),
+        migrations.AddIndex(
+            model_name='convictedperson',
+            index=models.Index(fields=['active_sentence_end_date', 'last_name', 'first_name', 'id'], name='persons_con_active__6fd6e5_idx'),
+        ),
+        migrations.RunPython(backfill_active_sentence_end_date, migrations.RunPython.noop),
+    ]
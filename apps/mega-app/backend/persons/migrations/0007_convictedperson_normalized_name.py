@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1
+
+from django.db import migrations, models
+
+
+def fill_normalized_name(apps, schema_editor):
+    from persons.utils import person_name_key
+
+    ConvictedPerson = apps.get_model('persons', 'ConvictedPerson')
+    batch = []
+    for person in ConvictedPerson.objects.only('id', 'last_name', 'first_name').iterator(chunk_size=1000):
+        person.normalized_name = person_name_key(person.last_name, person.first_name)
+        batch.append(person)
+        if len(batch) >= 1000:
+            ConvictedPerson.objects.bulk_update(batch, ['normalized_name'])
+            batch = []
+    if batch:
+        ConvictedPerson.objects.bulk_update(batch, ['normalized_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0006_active_sentence_end_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='convictedperson',
+            name='normalized_name',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=201, verbose_name='Nume normalizat'),
+        ),
+        migrations.RunPython(fill_normalized_name, migrations.RunPython.noop),
+    ]
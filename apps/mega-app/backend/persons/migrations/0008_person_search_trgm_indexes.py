@@ -0,0 +1,40 @@
+# Generated by Django 5.0.1
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Indexurile GIN trigram există doar pe PostgreSQL (pe SQLite persons.search
+# folosește potrivirea simplă), de aceea nu sunt declarate în Meta.indexes.
+TRGM_INDEXES = [
+    ('persons_normalized_name_trgm', 'normalized_name'),
+    ('persons_cnp_trgm', 'cnp'),
+]
+
+
+def create_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in TRGM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON persons_convictedperson '
+            f'USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in TRGM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0007_convictedperson_normalized_name'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+    ]
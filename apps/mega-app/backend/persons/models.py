@@ -4,6 +4,8 @@ from django.db import models
 from django.conf import settings
 from django.core.validators import RegexValidator
 
+from .utils import person_name_key
+
 
 cnp_validator = RegexValidator(
     regex=r'^\d{13}$',
@@ -11,6 +13,66 @@ cnp_validator = RegexValidator(
 )
 
 
+class ConvictedPersonQuerySet(models.QuerySet):
+    def refresh_active_sentence_end_date(self):
+        """Recalculează active_sentence_end_date (un singur UPDATE pentru tot queryset-ul)."""
+        from sentences.models import Sentence
+
+        active = Sentence.objects.filter(
+            person=models.OuterRef('pk'),
+            status='active',
+        ).order_by('-start_date')
+        return self.update(
+            active_sentence_end_date=models.Subquery(active.values('effective_end_date')[:1])
+        )
+
+    def with_summary(self):
+        """Adnotează câmpurile de sumar din lista de persoane (un singur query).
+
+        active_sentences_total, nearest_fraction_date/type, has_fulfilled_fractions
+        și defect_task_id sunt calculate prin subquery-uri corelate, fără
+        query-uri suplimentare per persoană.
+        """
+        from django.db.models.functions import Coalesce
+        from django.utils import timezone
+        from sentences.models import Sentence, Fraction
+        from tasks.models import Task
+
+        today = timezone.now().date()
+        active_fractions = Fraction.objects.filter(
+            sentence__person=models.OuterRef('pk'),
+            sentence__status='active',
+        )
+        nearest = active_fractions.filter(
+            is_fulfilled=False,
+            calculated_date__gte=today,
+        ).order_by('calculated_date')
+        unfinished_count = Sentence.objects.filter(
+            person=models.OuterRef('pk'),
+        ).exclude(status='finished').order_by().values('person').annotate(
+            total=models.Count('pk'),
+        ).values('total')
+        defect_tasks = Task.objects.filter(
+            person=models.OuterRef('pk'),
+            status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS],
+        )
+
+        return self.annotate(
+            active_sentences_total=Coalesce(models.Subquery(unfinished_count), 0),
+            nearest_fraction_date=models.Subquery(nearest.values('calculated_date')[:1]),
+            nearest_fraction_type=models.Subquery(nearest.values('fraction_type')[:1]),
+            has_fulfilled_fractions=models.Case(
+                models.When(
+                    models.Exists(active_fractions) & ~models.Exists(active_fractions.filter(is_fulfilled=False)),
+                    then=models.Value(True),
+                ),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+            defect_task_id=models.Subquery(defect_tasks.values('id')[:1]),
+        )
+
+
 class ConvictedPerson(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     first_name = models.CharField(
@@ -65,6 +127,22 @@ class ConvictedPerson(models.Model):
         default=False,
         verbose_name='Înștiințare MAI'
     )
+    # 'nume prenume' fără diacritice, litere mici (legătura cu Task-urile)
+    normalized_name = models.CharField(
+        max_length=201,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name='Nume normalizat'
+    )
+    # Data efectivă de sfârșit a sentinței active (denormalizată pentru
+    # sortare/paginare în SQL); actualizată la salvarea sentințelor.
+    active_sentence_end_date = models.DateField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Data sfârșit sentință activă'
+    )
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -75,6 +153,8 @@ class ConvictedPerson(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Creat la')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Actualizat la')
 
+    objects = ConvictedPersonQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Persoană condamnată'
         verbose_name_plural = 'Persoane condamnate'
@@ -84,6 +164,7 @@ class ConvictedPerson(models.Model):
             models.Index(fields=['last_name', 'first_name']),
             models.Index(fields=['admission_date']),
             models.Index(fields=['release_date']),
+            models.Index(fields=['active_sentence_end_date', 'last_name', 'first_name', 'id']),
         ]
 
     def __str__(self):
@@ -91,6 +172,27 @@ class ConvictedPerson(models.Model):
             return f"{self.last_name} {self.first_name} ({self.cnp})"
         return f"{self.last_name} {self.first_name}"
 
+    def save(self, *args, **kwargs):
+        previous_name = self.__dict__.get('normalized_name')
+        self.normalized_name = person_name_key(self.last_name, self.first_name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'last_name', 'first_name'}.intersection(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'normalized_name'}
+        super().save(*args, **kwargs)
+        if self.normalized_name and self.normalized_name != previous_name:
+            self.link_unlinked_tasks()
+
+    def link_unlinked_tasks(self):
+        """Leagă task-urile fără persoană al căror titlu este numele acestei persoane.
+
+        Ca în Task.match_person, doar dacă numele nu aparține și altei persoane.
+        """
+        from tasks.models import Task
+
+        if ConvictedPerson.objects.filter(normalized_name=self.normalized_name).exclude(pk=self.pk).exists():
+            return 0
+        return Task.objects.filter(person__isnull=True, title_key=self.normalized_name).update(person=self)
+
     @property
     def full_name(self):
         return f"{self.last_name} {self.first_name}"
@@ -114,28 +216,3 @@ class ConvictedPerson(models.Model):
         ).order_by('calculated_date').first()
 
         return fraction
-
-    @property
-    def active_sentence_end_date(self):
-        """Returns the effective end date of the active sentence."""
-        active = self.sentences.filter(status='active').first()
-        if active:
-            return active.effective_end_date
-        return None
-
-    @property
-    def has_fulfilled_fractions(self):
-        """Returns True if person has sentences but all fractions are fulfilled."""
-        from sentences.models import Fraction
-        total_fractions = Fraction.objects.filter(
-            sentence__person=self,
-            sentence__status='active',
-        ).count()
-        if total_fractions == 0:
-            return False
-        unfulfilled = Fraction.objects.filter(
-            sentence__person=self,
-            sentence__status='active',
-            is_fulfilled=False,
-        ).count()
-        return unfulfilled == 0
@@ -0,0 +1,79 @@
+"""
+Căutare persoane după nume și CNP.
+
+Numele se caută în `normalized_name` (fără diacritice, litere mici), deci
+'stefan' găsește și 'Ștefan' și 'Ştefan'. Pe PostgreSQL filtrarea folosește
+indexurile GIN pg_trgm (vezi migrația persons 0008) și rezultatele sunt
+ordonate după similaritate; pe alte baze de date (SQLite în teste) se face
+o potrivire simplă pe cuvinte.
+"""
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from rest_framework.filters import SearchFilter
+
+from .utils import normalize_name
+
+
+def search_persons(queryset, term):
+    """Filtrează `queryset` după termen și adnotează `search_rank` (mai mare = mai relevant).
+
+    Cele două căi pentru nume nu dau aceleași rezultate. Pe PostgreSQL un nume
+    scris greșit ('popesku ion') sau cu cuvintele inversate ('ion popescu') este
+    găsit prin similaritatea trigramelor și ordonat după ea. Fallback-ul cere ca
+    fiecare cuvânt să apară în nume: găsește numele inversat, dar cu rang 0
+    (rangul 1 îl au doar numele care încep cu termenul), și nu găsește numele
+    scrise greșit.
+    """
+    term = (term or '').strip()
+    if not term:
+        return queryset
+
+    compact = term.replace(' ', '')
+    if compact.isdigit():
+        return queryset.filter(cnp__contains=compact).annotate(
+            search_rank=Case(
+                When(cnp__startswith=compact, then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+
+    key = normalize_name(term)
+    if connections[queryset.db].vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        return queryset.filter(
+            Q(normalized_name__contains=key) | Q(normalized_name__trigram_word_similar=key)
+        ).annotate(
+            search_rank=TrigramWordSimilarity(key, 'normalized_name'),
+        )
+
+    # Fallback fără pg_trgm: toate cuvintele trebuie să apară în nume
+    words = Q()
+    for word in key.split():
+        words &= Q(normalized_name__contains=word)
+    return queryset.filter(words).annotate(
+        search_rank=Case(
+            When(normalized_name__startswith=key, then=Value(1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    )
+
+
+class PersonSearchFilter(SearchFilter):
+    """SearchFilter pentru persoane bazat pe search_persons().
+
+    Fără parametru explicit de ordonare, rezultatele sunt ordonate întâi după
+    relevanță, apoi după ordonarea existentă a queryset-ului.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = ' '.join(self.get_search_terms(request))
+        if not term:
+            return queryset
+
+        queryset = search_persons(queryset, term)
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('-search_rank', *queryset.query.order_by)
+        return queryset
@@ -4,13 +4,14 @@ from sentences.serializers import SentenceListSerializer
 
 
 class ConvictedPersonListSerializer(serializers.ModelSerializer):
+    """Necesită un queryset adnotat cu ConvictedPerson.objects.with_summary()."""
     full_name = serializers.CharField(read_only=True)
-    active_sentences_count = serializers.IntegerField(read_only=True)
-    nearest_fraction_date = serializers.SerializerMethodField()
-    nearest_fraction_type = serializers.SerializerMethodField()
-    active_sentence_end_date = serializers.SerializerMethodField()
-    has_fulfilled_fractions = serializers.SerializerMethodField()
-    has_defect_task = serializers.SerializerMethodField()
+    active_sentences_count = serializers.IntegerField(source='active_sentences_total', read_only=True)
+    nearest_fraction_date = serializers.DateField(read_only=True)
+    nearest_fraction_type = serializers.CharField(read_only=True)
+    active_sentence_end_date = serializers.DateField(read_only=True)
+    has_fulfilled_fractions = serializers.BooleanField(read_only=True)
+    has_defect_task = serializers.UUIDField(source='defect_task_id', read_only=True)
     created_by_name = serializers.SerializerMethodField()
 
     class Meta:
@@ -25,28 +26,6 @@ class ConvictedPersonListSerializer(serializers.ModelSerializer):
             'created_by', 'created_by_name', 'created_at', 'updated_at'
         ]
 
-    def get_nearest_fraction_date(self, obj):
-        fraction = obj.nearest_fraction
-        return fraction.calculated_date if fraction else None
-
-    def get_nearest_fraction_type(self, obj):
-        fraction = obj.nearest_fraction
-        return fraction.fraction_type if fraction else None
-
-    def get_active_sentence_end_date(self, obj):
-        return obj.active_sentence_end_date
-
-    def get_has_fulfilled_fractions(self, obj):
-        return obj.has_fulfilled_fractions
-
-    def get_has_defect_task(self, obj):
-        from tasks.models import Task
-        task = Task.objects.filter(
-            title=obj.full_name,
-            status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]
-        ).first()
-        return str(task.id) if task else None
-
     def get_created_by_name(self, obj):
         if obj.created_by:
             return obj.created_by.get_full_name() or obj.created_by.username
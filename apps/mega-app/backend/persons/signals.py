@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from sentences.models import Fraction, Sentence
+from .dashboard import invalidate_dashboard_kpis
+from .models import ConvictedPerson
+
+
+@receiver([post_save, post_delete], sender=ConvictedPerson)
+@receiver([post_save, post_delete], sender=Sentence)
+@receiver([post_save, post_delete], sender=Fraction)
+def dashboard_data_changed(sender, **kwargs):
+    invalidate_dashboard_kpis()
@@ -0,0 +1,110 @@
+import base64
+import json
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .models import ConvictedPerson
+from .search import search_persons
+from .views import EndDateCursorPagination
+
+LIST_URL = '/api/v1/persons/'
+
+
+def _cursor(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+@mock.patch.object(EndDateCursorPagination, 'page_size', 2)
+class EndDateCursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='viewer')
+        end_dates = [date(2026, 5, 1), date(2026, 5, 1), date(2026, 5, 1), date(2025, 1, 1), None, None, None]
+        for index, end_date in enumerate(end_dates):
+            # Nume identice pe aceeași dată: ordinea se decide după id
+            person = ConvictedPerson.objects.create(last_name='Popescu', first_name='Ion' if index % 2 else 'Ana')
+            ConvictedPerson.objects.filter(pk=person.pk).update(active_sentence_end_date=end_date)
+        cls.expected = [
+            str(pk) for pk in
+            ConvictedPerson.objects.order_by(*EndDateCursorPagination.ordering).values_list('pk', flat=True)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, **params):
+        response = self.client.get(url, params, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_forward_and_backward_walk_cover_every_row_once(self):
+        pages = []
+        data = self.get(LIST_URL, pagination='cursor')
+        self.assertIsNone(data['previous'])
+        pages.append([row['id'] for row in data['results']])
+        while data['next']:
+            data = self.get(data['next'])
+            pages.append([row['id'] for row in data['results']])
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+        # Înapoi de la ultima pagină, prin legăturile `previous`
+        backward = [pages[-1]]
+        while data['previous']:
+            data = self.get(data['previous'])
+            backward.append([row['id'] for row in data['results']])
+            self.assertIsNotNone(data['next'])
+        self.assertEqual(backward[::-1], pages)
+
+    def test_tampered_cursor_is_rejected(self):
+        valid = {'d': None, 'l': 'Popescu', 'f': 'Ion', 'i': self.expected[0]}
+        for cursor in [
+            'not base64!',
+            _cursor([1, 2]),
+            _cursor({'d': None}),
+            _cursor({**valid, 'd': '2026-13-01'}),
+            _cursor({**valid, 'd': 20260101}),
+            _cursor({**valid, 'i': 'not-a-uuid'}),
+            _cursor({**valid, 'l': None}),
+        ]:
+            response = self.client.get(LIST_URL, {'cursor': cursor}, secure=True)
+            self.assertEqual(response.status_code, 400, cursor)
+
+
+class SearchFallbackTests(TestCase):
+    """Calea fără pg_trgm din search_persons (testele rulează pe SQLite)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.stefan = ConvictedPerson.objects.create(last_name='Popescu', first_name='Ștefan', cnp='1900101123456')
+        cls.ion = ConvictedPerson.objects.create(last_name='Ionescu', first_name='Ion', cnp='2850505654321')
+
+    def search(self, term):
+        return {person.pk: person.search_rank for person in search_persons(ConvictedPerson.objects.all(), term)}
+
+    def test_every_word_must_appear_without_diacritics(self):
+        self.assertEqual(self.search('POPESCU stefan'), {self.stefan.pk: 1.0})
+        self.assertEqual(self.search('Ştefan'), {self.stefan.pk: 0.0})
+        self.assertEqual(self.search('ion'), {self.ion.pk: 1.0})
+
+    def test_reversed_name_matches_with_zero_rank(self):
+        self.assertEqual(self.search('stefan popescu'), {self.stefan.pk: 0.0})
+
+    def test_misspelled_name_does_not_match(self):
+        self.assertEqual(self.search('popesku stefan'), {})
+
+    def test_digits_search_cnp(self):
+        self.assertEqual(self.search('1900 101'), {self.stefan.pk: 1.0})
+        self.assertEqual(self.search('654321'), {self.ion.pk: 0.0})
+
+    def test_list_endpoint_uses_person_search(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username='viewer'))
+        response = client.get(LIST_URL, {'search': 'ion'}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()['results']], [str(self.ion.pk)])
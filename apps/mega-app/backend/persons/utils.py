@@ -0,0 +1,17 @@
+import unicodedata
+
+
+def normalize_name(value):
+    """Formă normalizată pentru potrivirea numelor.
+
+    Fără diacritice (ș/ş, ț/ţ, ă, â, î), litere mici și spații multiple comasate:
+    'Popescu  Ștefan' -> 'popescu stefan'.
+    """
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+def person_name_key(last_name, first_name):
+    """Cheia normalizată 'nume prenume' (formatul titlurilor de task)."""
+    return normalize_name(f'{last_name} {first_name}')
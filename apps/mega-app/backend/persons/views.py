@@ -1,24 +1,27 @@
+import base64
+import json
 from uuid import UUID
 from datetime import date
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.permissions import IsAuthenticated
-from django.http import HttpResponse
-from django.db.models import Count, Q
+from rest_framework.filters import OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import F, Q
 from django.utils import timezone
-from openpyxl import Workbook
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-import io
+from reportlab.lib.units import cm
 
+from .dashboard import invalidate_dashboard_kpis, person_stats
 from .models import ConvictedPerson
+from .search import PersonSearchFilter
+from reports import progress
+from reports.pdf_engine import PdfReport
+from reports.xlsx_export import XlsxExport
 
 
 def make_json_serializable(obj):
@@ -46,6 +49,111 @@ class LargePagePagination(PageNumberPagination):
     page_size = 200
 
 
+class EndDateCursorPagination(BasePagination):
+    """Paginare keyset după (active_sentence_end_date NULLS LAST, nume, prenume, id).
+
+    Cursorul codifică cheia unui rând de la marginea paginii și direcția
+    ('b' = paginile dinainte), deci paginile adânci nu plătesc OFFSET și rămân
+    stabile când se adaugă/șterg persoane. Un cursor invalid dă 400.
+    """
+    page_size = 200
+    cursor_query_param = 'cursor'
+    ordering = (
+        F('active_sentence_end_date').asc(nulls_last=True),
+        'last_name', 'first_name', 'id',
+    )
+    reverse_ordering = (
+        F('active_sentence_end_date').desc(nulls_first=True),
+        '-last_name', '-first_name', '-id',
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        position = None
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            try:
+                position = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+                backwards = bool(position.get('b'))
+                queryset = queryset.filter(self._before(position) if backwards else self._after(position))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                raise ParseError('Cursor invalid.')
+        else:
+            backwards = False
+
+        queryset = queryset.order_by(*(self.reverse_ordering if backwards else self.ordering))
+        page = list(queryset[:self.page_size + 1])
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if backwards:
+            page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = page
+        return self.page
+
+    def _after(self, position):
+        """Condiția WHERE pentru rândurile de după cheia `position`."""
+        name_after = (
+            Q(last_name__gt=position['l']) |
+            Q(last_name=position['l'], first_name__gt=position['f']) |
+            Q(last_name=position['l'], first_name=position['f'], id__gt=UUID(position['i']))
+        )
+        if position['d'] is None:
+            return Q(active_sentence_end_date__isnull=True) & name_after
+        end_date = date.fromisoformat(position['d'])
+        return (
+            Q(active_sentence_end_date__gt=end_date) |
+            Q(active_sentence_end_date=end_date) & name_after |
+            Q(active_sentence_end_date__isnull=True)
+        )
+
+    def _before(self, position):
+        """Condiția WHERE pentru rândurile de dinaintea cheii `position`."""
+        name_before = (
+            Q(last_name__lt=position['l']) |
+            Q(last_name=position['l'], first_name__lt=position['f']) |
+            Q(last_name=position['l'], first_name=position['f'], id__lt=UUID(position['i']))
+        )
+        if position['d'] is None:
+            return Q(active_sentence_end_date__isnull=False) | Q(active_sentence_end_date__isnull=True) & name_before
+        end_date = date.fromisoformat(position['d'])
+        return (
+            Q(active_sentence_end_date__lt=end_date) |
+            Q(active_sentence_end_date=end_date) & name_before
+        )
+
+    def _link(self, row, backwards):
+        position = {
+            'd': row.active_sentence_end_date.isoformat() if row.active_sentence_end_date else None,
+            'l': row.last_name,
+            'f': row.first_name,
+            'i': str(row.id),
+        }
+        if backwards:
+            position['b'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], backwards=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], backwards=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
 class ConvictedPersonViewSet(viewsets.ModelViewSet):
     queryset = ConvictedPerson.objects.select_related('created_by').prefetch_related(
         'sentences__fractions'
@@ -56,25 +164,31 @@ class ConvictedPersonViewSet(viewsets.ModelViewSet):
         'admission_date': ['gte', 'lte', 'exact'],
         'mai_notification': ['exact'],
     }
-    search_fields = ['first_name', 'last_name', 'cnp']
-    ordering_fields = ['last_name', 'first_name', 'admission_date', 'created_at']
-    ordering = ['last_name', 'first_name']
+    # Căutare fără diacritice pe nume + CNP (vezi persons.search)
+    filter_backends = [DjangoFilterBackend, OrderingFilter, PersonSearchFilter]
+    ordering_fields = ['last_name', 'first_name', 'admission_date', 'created_at', 'active_sentence_end_date']
+    # Sentința cu data de sfârșit cea mai apropiată prima (fără sentință activă la final)
+    ordering = [F('active_sentence_end_date').asc(nulls_last=True), 'last_name', 'first_name']
+
+    @property
+    def paginator(self):
+        """Lista acceptă și paginare keyset: ?pagination=cursor sau ?cursor=..."""
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if self.action == 'list' and ('cursor' in params or params.get('pagination') == 'cursor'):
+                self._paginator = EndDateCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_queryset(self):
+        if self.action in ('list', 'export_xlsx', 'export_pdf'):
+            # Câmpurile de sumar vin adnotate, fără query-uri per persoană
+            return ConvictedPerson.objects.with_summary().select_related('created_by')
         return ConvictedPerson.objects.select_related('created_by').prefetch_related(
             'sentences__fractions', 'sentences__reductions', 'sentences__preventive_arrests', 'sentences__zpm_entries'
         )
 
-    def list(self, request, *args, **kwargs):
-        """Override list to sort by active_sentence_end_date (soonest first)."""
-        response = super().list(request, *args, **kwargs)
-        far_future = '9999-12-31'
-        response.data['results'] = sorted(
-            response.data['results'],
-            key=lambda p: str(p.get('active_sentence_end_date') or far_future),
-        )
-        return response
-
     def get_serializer_class(self):
         if self.action == 'list':
             return ConvictedPersonListSerializer
@@ -143,7 +257,9 @@ class ConvictedPersonViewSet(viewsets.ModelViewSet):
 
         updated_sentences = person.sentences.filter(
             status=Sentence.Status.ACTIVE
-        ).update(status=Sentence.Status.FINISHED)
+        ).update(status=Sentence.Status.FINISHED, updated_at=timezone.now())
+        invalidate_dashboard_kpis()
+        ConvictedPerson.objects.filter(pk=person.pk).refresh_active_sentence_end_date()
 
         person.release_date = release_date
         person.release_type = release_type
@@ -164,143 +280,57 @@ class ConvictedPersonViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Dashboard statistics."""
-        from sentences.models import Fraction
-        from django.conf import settings
-
-        today = timezone.now().date()
-        imminent_days = getattr(settings, 'FRACTION_IMMINENT_DAYS', 30)
-        upcoming_days = getattr(settings, 'FRACTION_UPCOMING_DAYS', 90)
-
-        total_persons = ConvictedPerson.objects.count()
-        active_sentences = ConvictedPerson.objects.filter(
-            sentences__status='active'
-        ).distinct().count()
-        released_persons = ConvictedPerson.objects.filter(
-            release_date__isnull=False
-        ).count()
-
-        # Overdue fractions (before today)
-        overdue_count = Fraction.objects.filter(
-            sentence__status='active',
-            is_fulfilled=False,
-            calculated_date__lt=today
-        ).count()
-
-        # Imminent fractions (today to 30 days)
-        imminent_count = Fraction.objects.filter(
-            sentence__status='active',
-            is_fulfilled=False,
-            calculated_date__gte=today,
-            calculated_date__lte=today + timezone.timedelta(days=imminent_days)
-        ).count()
-
-        # Upcoming fractions (30-90 days)
-        upcoming_count = Fraction.objects.filter(
-            sentence__status='active',
-            is_fulfilled=False,
-            calculated_date__gt=today + timezone.timedelta(days=imminent_days),
-            calculated_date__lte=today + timezone.timedelta(days=upcoming_days)
-        ).count()
-
-        return Response({
-            'total_persons': total_persons,
-            'persons_with_active_sentences': active_sentences,
-            'released_persons': released_persons,
-            'overdue_fractions': overdue_count,
-            'imminent_fractions': imminent_count,
-            'upcoming_fractions': upcoming_count,
-        })
+        """Dashboard statistics (persons.dashboard, cached for the day)."""
+        return Response(person_stats())
 
     @action(detail=False, methods=['get'])
     def export_xlsx(self, request):
-        """Export persons list to XLSX."""
+        """Export persons list to XLSX (streamed, write-only)."""
         queryset = self.filter_queryset(self.get_queryset())
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Persoane Condamnate"
-
-        # Header
-        headers = ['Nume', 'Prenume', 'CNP', 'Data nașterii', 'Data internării', 'Sentințe active', 'Înștiințare MAI']
-        ws.append(headers)
-
-        # Data
-        for person in queryset:
-            ws.append([
-                person.last_name,
-                person.first_name,
-                person.cnp or '',
-                person.date_of_birth.strftime('%d.%m.%Y') if person.date_of_birth else '',
-                person.admission_date.strftime('%d.%m.%Y') if person.admission_date else '',
-                person.active_sentences_count,
-                'Da' if person.mai_notification else 'Nu',
-            ])
-
-        # Set column widths
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 15
-        ws.column_dimensions['G'].width = 18
-
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        export = XlsxExport(
+            "Persoane Condamnate",
+            headers=['Nume', 'Prenume', 'CNP', 'Data nașterii', 'Data internării', 'Sentințe active', 'Înștiințare MAI'],
+            column_widths=[20, 20, 15, 15, 15, 15, 18],
         )
-        response['Content-Disposition'] = 'attachment; filename=persoane_condamnate.xlsx'
-        return response
+
+        def rows():
+            for person in queryset.iterator(chunk_size=2000):
+                yield [
+                    person.last_name,
+                    person.first_name,
+                    person.cnp or '',
+                    person.date_of_birth.strftime('%d.%m.%Y') if person.date_of_birth else '',
+                    person.admission_date.strftime('%d.%m.%Y') if person.admission_date else '',
+                    person.active_sentences_total,
+                    'Da' if person.mai_notification else 'Nu',
+                ]
+
+        return export.response(progress.counted(rows(), queryset.count), 'persoane_condamnate.xlsx')
 
     @action(detail=False, methods=['get'])
     def export_pdf(self, request):
         """Export persons list to PDF."""
         queryset = self.filter_queryset(self.get_queryset())
+        report = PdfReport(
+            'Lista Persoanelor Condamnate',
+            headers=['Nume', 'Prenume', 'CNP', 'Data nașterii', 'Data internării', 'Sentințe', 'Înștiințare MAI'],
+            col_widths=[5.5 * cm, 5.5 * cm, 3.5 * cm, 3 * cm, 3 * cm, 2.5 * cm, 2.7 * cm],
+            number_columns=[2, 3, 4, 5, 6],
+            font_size=8,
+            header_font_size=9,
+        )
 
-        pdfmetrics.registerFont(TTFont('DejaVu', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'))
-        pdfmetrics.registerFont(TTFont('DejaVuBd', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'))
-
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=landscape(A4))
-        elements = []
-
-        title_style = ParagraphStyle('Title', fontName='DejaVuBd', fontSize=16, spaceAfter=12)
-        elements.append(Paragraph("Lista Persoanelor Condamnate", title_style))
-
-        data = [['Nume', 'Prenume', 'CNP', 'Data nașterii', 'Data internării', 'Sentințe', 'Înștiințare MAI']]
-        for person in queryset:
-            data.append([
-                person.last_name,
-                person.first_name,
-                person.cnp or '',
-                person.date_of_birth.strftime('%d.%m.%Y') if person.date_of_birth else '',
-                person.admission_date.strftime('%d.%m.%Y') if person.admission_date else '',
-                str(person.active_sentences_count),
-                'Da' if person.mai_notification else 'Nu',
-            ])
-
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'DejaVuBd'),
-            ('FONTNAME', (0, 1), (-1, -1), 'DejaVu'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        elements.append(table)
-
-        doc.build(elements)
-        buffer.seek(0)
-
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename=persoane_condamnate.pdf'
-        return response
+        def rows():
+            for person in queryset.iterator(chunk_size=2000):
+                yield [
+                    person.last_name,
+                    person.first_name,
+                    person.cnp or '',
+                    person.date_of_birth.strftime('%d.%m.%Y') if person.date_of_birth else '',
+                    person.admission_date.strftime('%d.%m.%Y') if person.admission_date else '',
+                    person.active_sentences_total,
+                    'Da' if person.mai_notification else 'Nu',
+                ]
+
+        return report.response(progress.counted(rows(), queryset.count), 'persoane_condamnate.pdf')
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Petition, PetitionAttachment
+from .models import Petition, PetitionAttachment, PetitionCounter
 
 
 class PetitionAttachmentInline(admin.TabularInline):
@@ -50,3 +50,9 @@ class PetitionAttachmentAdmin(admin.ModelAdmin):
     list_filter = ['content_type', 'uploaded_at']
     search_fields = ['original_filename', 'petition__petitioner_name']
     readonly_fields = ['uploaded_at']
+
+
+@admin.register(PetitionCounter)
+class PetitionCounterAdmin(admin.ModelAdmin):
+    list_display = ['prefix', 'year', 'last_seq']
+    list_filter = ['year']
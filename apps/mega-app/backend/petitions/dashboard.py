@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Petition
+from .serializers import PetitionStatsSerializer
+
+
+def petition_stats(queryset=None):
+    """Get petition statistics for dashboard (PetitionViewSet.stats, dashboard/summary)."""
+    if queryset is None:
+        queryset = Petition.objects.all()
+
+    # Total count
+    total = queryset.count()
+
+    # Count by status
+    by_status = dict(queryset.values('status').annotate(count=Count('id')).values_list('status', 'count'))
+
+    # Calculate due soon and overdue
+    today = timezone.now().date()
+    response_days = getattr(settings, 'PETITION_RESPONSE_DAYS', 12)
+    due_soon_days = getattr(settings, 'PETITION_DUE_SOON_DAYS', 3)
+
+    # Due soon: within 3 days but not overdue
+    due_soon_boundary = today + timezone.timedelta(days=due_soon_days)
+    due_soon = queryset.exclude(
+        status=Petition.Status.SOLUTIONATA
+    ).filter(
+        registration_date__gt=today - timezone.timedelta(days=response_days),
+        registration_date__lte=due_soon_boundary - timezone.timedelta(days=response_days)
+    ).count()
+
+    # Overdue: past due date
+    overdue_boundary = today - timezone.timedelta(days=response_days)
+    overdue = queryset.exclude(
+        status=Petition.Status.SOLUTIONATA
+    ).filter(
+        registration_date__lte=overdue_boundary
+    ).count()
+
+    # Count by object type
+    by_object_type = dict(
+        queryset.values('object_type').annotate(count=Count('id')).values_list('object_type', 'count')
+    )
+
+    # Count by petitioner type
+    by_petitioner_type = dict(
+        queryset.values('petitioner_type').annotate(count=Count('id')).values_list('petitioner_type', 'count')
+    )
+    by_detention_sector = dict(
+        queryset.values('detention_sector').annotate(count=Count('id')).values_list('detention_sector', 'count')
+    )
+
+    data = {
+        'total': total,
+        'by_status': by_status,
+        'due_soon': due_soon,
+        'overdue': overdue,
+        'by_object_type': by_object_type,
+        'by_petitioner_type': by_petitioner_type,
+        'by_detention_sector': by_detention_sector,
+    }
+
+    return dict(PetitionStatsSerializer(data).data)
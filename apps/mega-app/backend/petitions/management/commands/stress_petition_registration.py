@@ -0,0 +1,85 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from petitions.models import Petition, PetitionCounter
+
+
+def _new_petition(prefix, index):
+    return Petition(
+        registration_prefix=prefix,
+        registration_date=timezone.now().date(),
+        petitioner_type=Petition.PetitionerType.ALTUL,
+        petitioner_name=f'Stress {index}',
+        object_type=Petition.ObjectType.ALTELE,
+    )
+
+
+def _worker(prefix, indexes, batch, errors):
+    try:
+        if batch > 1:
+            for i in range(0, len(indexes), batch):
+                Petition.objects.bulk_register([_new_petition(prefix, index) for index in indexes[i:i + batch]])
+        else:
+            for index in indexes:
+                _new_petition(prefix, index).save()
+    except Exception as e:
+        errors.append(e)
+    finally:
+        # Fiecare thread are conexiunea lui
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Register petitions from parallel threads and check that numbers are unique and gap-free'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--petitions', type=int, default=1000)
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--batch', type=int, default=1, help='Petitions per bulk_register call (1 = save())')
+        parser.add_argument('--prefix', default='ST', help='Registration prefix used for the test petitions')
+        parser.add_argument('--keep', action='store_true', help='Do not delete the test petitions afterwards')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        count = options['petitions']
+        threads = max(1, options['threads'])
+        year = timezone.now().date().year
+        petitions = Petition.objects.filter(registration_prefix=prefix, registration_year=year)
+        if petitions.exists():
+            raise CommandError(f'Prefix {prefix} already has petitions in {year}; use another --prefix')
+
+        indexes = list(range(count))
+        errors = []
+        workers = [
+            threading.Thread(target=_worker, args=(prefix, indexes[i::threads], options['batch'], errors))
+            for i in range(threads)
+        ]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        seqs = list(petitions.values_list('registration_seq', flat=True))
+        unique = len(seqs) == len(set(seqs))
+        gap_free = sorted(seqs) == list(range(1, len(seqs) + 1))
+        for error in errors[:5]:
+            self.stderr.write(f'ERROR: {error!r}')
+
+        if not options['keep']:
+            petitions.delete()
+            PetitionCounter.objects.filter(prefix=prefix, year=year).delete()
+
+        rate = len(seqs) / elapsed if elapsed else 0
+        self.stdout.write(
+            f"Done! Registered: {len(seqs)}/{count}, Threads: {threads}, Errors: {len(errors)}, "
+            f"Unique: {'yes' if unique else 'NO'}, Gap-free: {'yes' if gap_free else 'NO'} "
+            f"({elapsed:.2f}s, {rate:.0f} petitions/s)"
+        )
+        if errors or not unique or not gap_free or len(seqs) != count:
+            raise CommandError('Stress test failed')
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def fill_counters(apps, schema_editor):
+    Petition = apps.get_model('petitions', 'Petition')
+    PetitionCounter = apps.get_model('petitions', 'PetitionCounter')
+    rows = Petition.objects.order_by().values(
+        'registration_prefix', 'registration_year'
+    ).annotate(last_seq=Max('registration_seq'))
+    PetitionCounter.objects.bulk_create([
+        PetitionCounter(prefix=row['registration_prefix'], year=row['registration_year'], last_seq=row['last_seq'])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('petitions', '0003_petition_detention_sector_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PetitionCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=5, verbose_name='Prefix')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='An')),
+                ('last_seq', models.PositiveIntegerField(default=0, verbose_name='Ultima secvență')),
+            ],
+            options={
+                'verbose_name': 'Contor înregistrare petiții',
+                'verbose_name_plural': 'Contoare înregistrare petiții',
+                'unique_together': {('prefix', 'year')},
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
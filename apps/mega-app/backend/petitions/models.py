@@ -1,7 +1,8 @@
 import uuid
 import os
 from datetime import timedelta
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Max
 from django.conf import settings
 from django.core.validators import FileExtensionValidator
 from django.utils import timezone
@@ -14,6 +15,74 @@ def attachment_upload_path(instance, filename):
     return os.path.join('attachments', str(instance.petition.id), new_filename)
 
 
+class PetitionCounterQuerySet(models.QuerySet):
+    def allocate(self, prefix, year, count=1):
+        """
+        Rezervă `count` numere consecutive pentru (prefix, an) și întoarce
+        range-ul lor.
+
+        UPDATE-ul blochează rândul contorului până la sfârșitul tranzacției
+        (echivalent UPDATE ... RETURNING, urmat de citirea valorii), deci
+        înregistrările concurente așteaptă în loc să primească același număr.
+        Trebuie apelat în tranzacția care salvează petițiile: la rollback se
+        anulează și rezervarea, deci numerele nu au goluri.
+        """
+        counters = self.filter(prefix=prefix, year=year)
+        with transaction.atomic(savepoint=False):
+            if not counters.update(last_seq=F('last_seq') + count):
+                self._create(prefix, year)
+                counters.update(last_seq=F('last_seq') + count)
+            last_seq = counters.values_list('last_seq', flat=True).get()
+        return range(last_seq - count + 1, last_seq + 1)
+
+    def _create(self, prefix, year):
+        """Primul număr al anului; pornește de la petițiile deja existente (dacă sunt)."""
+        existing = Petition.objects.filter(
+            registration_prefix=prefix, registration_year=year,
+        ).aggregate(last=Max('registration_seq'))['last']
+        try:
+            with transaction.atomic():
+                self.create(prefix=prefix, year=year, last_seq=existing or 0)
+        except IntegrityError:
+            # Creat între timp de altă tranzacție
+            pass
+
+
+class PetitionCounter(models.Model):
+    """Ultimul număr de înregistrare alocat pentru fiecare (prefix, an)."""
+    prefix = models.CharField(max_length=5, verbose_name='Prefix')
+    year = models.PositiveSmallIntegerField(verbose_name='An')
+    last_seq = models.PositiveIntegerField(default=0, verbose_name='Ultima secvență')
+
+    objects = PetitionCounterQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Contor înregistrare petiții'
+        verbose_name_plural = 'Contoare înregistrare petiții'
+        unique_together = [['prefix', 'year']]
+
+    def __str__(self):
+        return f"{self.prefix}/{self.year}: {self.last_seq}"
+
+
+class PetitionQuerySet(models.QuerySet):
+    def bulk_register(self, petitions):
+        """
+        Înregistrează petițiile noi în bloc: numerele se rezervă o singură dată
+        pentru fiecare (prefix, an), apoi un singur bulk_create.
+        """
+        groups = {}
+        for petition in petitions:
+            petition.registration_year = petition.registration_date.year
+            groups.setdefault((petition.registration_prefix, petition.registration_year), []).append(petition)
+        with transaction.atomic():
+            # Ordine fixă a contoarelor blocate, ca două loturi să nu se blocheze reciproc
+            for (prefix, year), group in sorted(groups.items()):
+                for petition, seq in zip(group, PetitionCounter.objects.allocate(prefix, year, len(group))):
+                    petition.registration_seq = seq
+            return self.bulk_create(petitions)
+
+
 class Petition(models.Model):
     class PetitionerType(models.TextChoices):
         CONDAMNAT = 'condamnat', 'Condamnat'
@@ -142,6 +211,8 @@ class Petition(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PetitionQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Petiție'
         verbose_name_plural = 'Petiții'
@@ -194,16 +265,15 @@ class Petition(models.Model):
         return (self.response_due_date - timezone.now().date()).days
 
     def save(self, *args, **kwargs):
-        if not self.registration_seq:
-            # Auto-generate sequence number
-            year = self.registration_date.year if self.registration_date else timezone.now().year
-            self.registration_year = year
-            last_petition = Petition.objects.filter(
-                registration_prefix=self.registration_prefix,
-                registration_year=year
-            ).order_by('-registration_seq').first()
-            self.registration_seq = (last_petition.registration_seq + 1) if last_petition else 1
-        super().save(*args, **kwargs)
+        if self.registration_seq:
+            super().save(*args, **kwargs)
+            return
+        # Auto-generate sequence number (în aceeași tranzacție cu inserarea)
+        year = self.registration_date.year if self.registration_date else timezone.now().year
+        self.registration_year = year
+        with transaction.atomic():
+            self.registration_seq = PetitionCounter.objects.allocate(self.registration_prefix, year)[0]
+            super().save(*args, **kwargs)
 
 
 class PetitionAttachment(models.Model):
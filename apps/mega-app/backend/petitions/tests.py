@@ -1,10 +1,20 @@
+import io
+import tempfile
 from datetime import date, timedelta
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.utils import timezone
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
 
-from .models import Petition
+from reports.export_jobs import claim_next_job, run_job
+from reports.models import ExportJob
+
+from .exports import export_petitions_pdf, export_petitions_xlsx
+from .models import Petition, PetitionCounter
 
 
 class PetitionModelTests(TestCase):
@@ -53,3 +63,133 @@ class PetitionModelTests(TestCase):
         )
         self.assertFalse(petition.is_due_soon)
         self.assertFalse(petition.is_overdue)
+
+
+class PetitionCounterTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='operator', role='admin')
+
+    def new_petition(self, prefix='P', registration_date=date(2026, 3, 1)):
+        return Petition(
+            registration_prefix=prefix,
+            registration_date=registration_date,
+            petitioner_type=Petition.PetitionerType.RUDA,
+            petitioner_name='Maria Pop',
+            object_type=Petition.ObjectType.TRANSFER,
+        )
+
+    def test_numbers_are_allocated_per_prefix_and_year(self):
+        seqs = []
+        for prefix, registration_date in [
+            ('P', date(2026, 3, 1)), ('P', date(2026, 3, 2)), ('A', date(2026, 3, 2)), ('P', date(2025, 12, 31)),
+        ]:
+            petition = self.new_petition(prefix, registration_date)
+            petition.save()
+            seqs.append((petition.registration_prefix, petition.registration_year, petition.registration_seq))
+        self.assertEqual(seqs, [('P', 2026, 1), ('P', 2026, 2), ('A', 2026, 1), ('P', 2025, 1)])
+        self.assertEqual(PetitionCounter.objects.get(prefix='P', year=2026).last_seq, 2)
+
+    def test_counter_starts_after_existing_petitions(self):
+        petition = self.new_petition()
+        petition.registration_seq, petition.registration_year = 41, 2026
+        petition.save()
+
+        petition = self.new_petition()
+        petition.save()
+        self.assertEqual(petition.registration_seq, 42)
+
+    def test_rolled_back_registration_leaves_no_gap(self):
+        with self.assertRaises(ValueError), transaction.atomic():
+            self.new_petition().save()
+            raise ValueError
+        petition = self.new_petition()
+        petition.save()
+        self.assertEqual(petition.registration_seq, 1)
+
+    def test_bulk_register_allocates_once_per_prefix_and_year(self):
+        self.new_petition().save()
+        petitions = [self.new_petition('A'), self.new_petition(), self.new_petition('A'), self.new_petition()]
+        Petition.objects.bulk_register(petitions)
+        self.assertEqual(
+            [(p.registration_prefix, p.registration_seq) for p in petitions], [('A', 1), ('P', 2), ('A', 2), ('P', 3)]
+        )
+
+    def test_bulk_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        item = {
+            'registration_prefix': 'P',
+            'registration_date': '2026-03-01',
+            'petitioner_type': Petition.PetitionerType.RUDA,
+            'petitioner_name': 'Maria Pop',
+            'detention_sector': 1,
+            'object_type': Petition.ObjectType.TRANSFER,
+        }
+        response = client.post('/api/v1/petitions/bulk/', [item, item, item], format='json', secure=True)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual([row['registration_seq'] for row in response.json()], [1, 2, 3])
+        self.assertEqual(Petition.objects.filter(created_by=self.user).count(), 3)
+
+        response = client.post('/api/v1/petitions/bulk/', [{**item, 'petitioner_type': 'x'}], format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Petition.objects.count(), 3)
+
+
+class PetitionRegistrationStressTests(TransactionTestCase):
+    def test_parallel_registrations_get_unique_gap_free_numbers(self):
+        if connection.vendor == 'sqlite':
+            # Baza de test SQLite din memorie (shared cache) nu așteaptă lock-ul, răspunde 'table is locked'
+            self.skipTest('needs a database with concurrent writers')
+        output = io.StringIO()
+        call_command('stress_petition_registration', petitions=1000, threads=16, stdout=output)
+        self.assertIn('Unique: yes, Gap-free: yes', output.getvalue())
+
+
+class PetitionExportTests(TestCase):
+    def setUp(self):
+        self.user = user = get_user_model().objects.create_user(username='operator', password='StrongPass123!')
+        for name in ('Ana Ionescu', 'Vasile Pop'):
+            Petition.objects.create(
+                registration_prefix='P',
+                registration_date=timezone.now().date(),
+                petitioner_type=Petition.PetitionerType.CONDAMNAT,
+                petitioner_name=name,
+                detention_sector=Petition.DetentionSector.SECTOR_1,
+                object_type=Petition.ObjectType.ART_91,
+                created_by=user,
+            )
+
+    def test_xlsx_export_is_streamed_and_readable(self):
+        response = export_petitions_xlsx(Petition.objects.order_by('pk'))
+
+        self.assertTrue(response.streaming)
+        ws = load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        rows = list(ws.iter_rows(values_only=True))
+        self.assertEqual(rows[0][0], 'Nr. Înreg.')
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row[3] for row in rows[1:]}, {'Ana Ionescu', 'Vasile Pop'})
+
+    def test_pdf_export_is_streamed(self):
+        response = export_petitions_pdf(Petition.objects.order_by('pk'))
+
+        self.assertTrue(response.streaming)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF-'))
+
+    def test_export_job_runs_viewset_export_with_saved_filters(self):
+        job = ExportJob.objects.create(
+            module=ExportJob.Module.PETITIONS,
+            format=ExportJob.Format.XLSX,
+            params={'search': 'Vasile'},
+            created_by=self.user,
+        )
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            self.assertEqual(claim_next_job(), job)
+            job = run_job(job)
+
+            self.assertEqual(job.status, ExportJob.Status.DONE, job.error)
+            self.assertEqual((job.rows_done, job.rows_total, job.progress), (1, 1, 100))
+            self.assertIsNotNone(job.expires_at)
+            with job.file.open('rb') as f:
+                rows = list(load_workbook(f).active.iter_rows(values_only=True))
+        self.assertEqual([row[3] for row in rows[1:]], ['Vasile Pop'])
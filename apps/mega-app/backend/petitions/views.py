@@ -4,7 +4,7 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.db.models import Count, Q
+from django.db.models import Q, prefetch_related_objects
 from django.utils import timezone
 from django.http import HttpResponse
 from django.conf import settings
@@ -17,13 +17,16 @@ from .serializers import (
     PetitionCreateSerializer,
     PetitionUpdateSerializer,
     PetitionAttachmentSerializer,
-    PetitionStatsSerializer,
 )
+from .dashboard import petition_stats
 from .exports import export_petitions_xlsx, export_petitions_pdf
 from accounts.permissions import IsAdminOrReadOnly
 from audit.utils import log_action
 
 
+MAX_BULK_PETITIONS = 500
+
+
 class LargePagePagination(PageNumberPagination):
     page_size = 200
 
@@ -111,64 +114,32 @@ class PetitionViewSet(viewsets.ModelViewSet):
             before_data=old_data
         )
 
-    @action(detail=False, methods=['get'])
-    def stats(self, request):
-        """Get petition statistics for dashboard."""
-        queryset = self.get_queryset()
-
-        # Total count
-        total = queryset.count()
-
-        # Count by status
-        by_status = dict(queryset.values('status').annotate(count=Count('id')).values_list('status', 'count'))
-
-        # Calculate due soon and overdue
-        today = timezone.now().date()
-        response_days = getattr(settings, 'PETITION_RESPONSE_DAYS', 12)
-        due_soon_days = getattr(settings, 'PETITION_DUE_SOON_DAYS', 3)
-
-        # Due soon: within 3 days but not overdue
-        due_soon_boundary = today + timezone.timedelta(days=due_soon_days)
-        due_soon = queryset.exclude(
-            status=Petition.Status.SOLUTIONATA
-        ).filter(
-            registration_date__gt=today - timezone.timedelta(days=response_days),
-            registration_date__lte=due_soon_boundary - timezone.timedelta(days=response_days)
-        ).count()
-
-        # Overdue: past due date
-        overdue_boundary = today - timezone.timedelta(days=response_days)
-        overdue = queryset.exclude(
-            status=Petition.Status.SOLUTIONATA
-        ).filter(
-            registration_date__lte=overdue_boundary
-        ).count()
-
-        # Count by object type
-        by_object_type = dict(
-            queryset.values('object_type').annotate(count=Count('id')).values_list('object_type', 'count')
-        )
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """Register a list of petitions at once (bulk intake); numbers are allocated per prefix/year in one step."""
+        if not isinstance(request.data, list) or not request.data:
+            return Response({'error': 'Se așteaptă o listă de petiții.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > MAX_BULK_PETITIONS:
+            return Response(
+                {'error': f'Se pot înregistra cel mult {MAX_BULK_PETITIONS} petiții odată.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = PetitionCreateSerializer(data=request.data, many=True, context={'request': request})
+        serializer.is_valid(raise_exception=True)
 
-        # Count by petitioner type
-        by_petitioner_type = dict(
-            queryset.values('petitioner_type').annotate(count=Count('id')).values_list('petitioner_type', 'count')
-        )
-        by_detention_sector = dict(
-            queryset.values('detention_sector').annotate(count=Count('id')).values_list('detention_sector', 'count')
-        )
+        petitions = [Petition(created_by=request.user, **data) for data in serializer.validated_data]
+        Petition.objects.bulk_register(petitions)
+        prefetch_related_objects(petitions, 'attachments')
 
-        data = {
-            'total': total,
-            'by_status': by_status,
-            'due_soon': due_soon,
-            'overdue': overdue,
-            'by_object_type': by_object_type,
-            'by_petitioner_type': by_petitioner_type,
-            'by_detention_sector': by_detention_sector,
-        }
+        data = PetitionListSerializer(petitions, many=True).data
+        for item in data:
+            log_action(request, 'create', 'Petition', str(item['id']), after_data=item)
+        return Response(data, status=status.HTTP_201_CREATED)
 
-        serializer = PetitionStatsSerializer(data)
-        return Response(serializer.data)
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Get petition statistics for dashboard."""
+        return Response(petition_stats(self.get_queryset()))
 
     @action(detail=False, methods=['get'])
     def export_xlsx(self, request):
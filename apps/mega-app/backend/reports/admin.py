@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'created_by', 'module', 'format', 'status', 'rows_done', 'expires_at']
+    list_filter = ['module', 'format', 'status']
+    search_fields = ['created_by__username', 'filename']
+    date_hierarchy = 'created_at'
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class ReportsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'reports'
+    verbose_name = 'Rapoarte'
+
+    def ready(self):
+        from .pdf_engine import register_fonts
+
+        # Fonturile se parsează o singură dată per proces, nu la fiecare export
+        register_fonts()
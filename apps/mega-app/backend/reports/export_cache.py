@@ -0,0 +1,117 @@
+"""
+Cache pe disc pentru rapoartele exportate (transferuri, comisie).
+
+Cheia = amprenta tipului de export + parametrii normalizați (an / lună /
+trimestru) + versiunea datelor. Versiunea se calculează din numărul de
+rânduri și max(updated_at) ale queryset-urilor din care se face raportul:
+orice adăugare, modificare sau ștergere schimbă cheia, deci nu este nevoie
+de invalidare explicită. Trebuie date și tabelele copil (rândurile
+transferurilor, totalurile lunare), cu updated_at propriu; bulk_update nu
+completează auto_now, deci se setează explicit. Rezultatele comisiei nu au
+updated_at: orice modificare a lor actualizează ședința (CommissionSession.touch),
+deci intră în versiune prin queryset-ul ședințelor. Fișierele vechi ale
+aceleiași amprente se șterg când se scrie o versiune nouă.
+
+    MEDIA_ROOT/export-cache/<amprentă>/<versiune>/<nume fișier>
+
+Răspunsul are ETag; un If-None-Match cu aceeași valoare primește 304.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+
+EXPORT_CACHE_DIR = 'export-cache'
+
+
+def data_version(*querysets):
+    """Ștampila datelor: număr de rânduri și max(updated_at) pentru fiecare queryset."""
+    parts = []
+    for queryset in querysets:
+        aggregates = {'count': Count('pk')}
+        field_names = {field.name for field in queryset.model._meta.get_fields()}
+        if 'updated_at' in field_names:
+            aggregates['updated'] = Max('updated_at')
+        values = queryset.order_by().aggregate(**aggregates)
+        updated = values.get('updated')
+        parts.append(f"{values['count']}:{updated.isoformat() if updated else ''}")
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def fingerprint(export_type, params):
+    payload = json.dumps([export_type, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _cached_file(version_dir):
+    try:
+        names = os.listdir(version_dir)
+    except FileNotFoundError:
+        return None
+    return os.path.join(version_dir, names[0]) if names else None
+
+
+def _store(response, key_dir, version_dir):
+    """Scrie răspunsul exportului în cache și întoarce calea fișierului."""
+    disposition = response.get('Content-Disposition', '')
+    filename = disposition.partition('filename=')[2].strip('"') or 'export'
+
+    os.makedirs(key_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=key_dir, prefix='.tmp-')
+    try:
+        with open(os.path.join(tmp_dir, filename), 'wb') as f:
+            content = response.streaming_content if response.streaming else [response.content]
+            for chunk in content:
+                f.write(chunk)
+        try:
+            os.rename(tmp_dir, version_dir)
+        except OSError:
+            # Alt proces a scris deja aceeași versiune
+            pass
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    version = os.path.basename(version_dir)
+    for name in os.listdir(key_dir):
+        if name != version and not name.startswith('.tmp-'):
+            shutil.rmtree(os.path.join(key_dir, name), ignore_errors=True)
+    return _cached_file(version_dir)
+
+
+def cached_export(request, export_type, params, version_querysets, render):
+    """
+    Întoarce exportul din cache sau îl generează cu render() și îl salvează.
+
+    export_type - ex. 'transfers.xlsx'; params - parametrii normalizați;
+    version_querysets - datele din care se face raportul.
+    """
+    key = fingerprint(export_type, params)
+    version = data_version(*version_querysets)
+    etag = f'"{key}-{version}"'
+
+    if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    key_dir = os.path.join(settings.MEDIA_ROOT, EXPORT_CACHE_DIR, key)
+    version_dir = os.path.join(key_dir, version)
+    path = _cached_file(version_dir)
+    if path is None:
+        response = render()
+        if response.status_code != 200:
+            return response
+        path = _store(response, key_dir, version_dir)
+
+    response = FileResponse(open(path, 'rb'), as_attachment=True, filename=os.path.basename(path))
+    response['ETag'] = etag
+    # Datele sunt ale utilizatorului autentificat; browserul revalidează cu ETag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,141 @@
+"""
+Exporturi rulate în fundal (fără broker extern).
+
+API-ul creează un ExportJob; run_export_worker (pornit de cron_scheduler.py)
+preia job-urile în ordine, apelează acțiunea export_xlsx / export_pdf a
+viewset-ului modulului cu filtrele salvate și cu utilizatorul care a cerut
+exportul, apoi salvează fișierul în MEDIA_ROOT/exports/. Astfel un export
+asincron aplică exact aceleași filtre și permisiuni ca endpoint-ul direct.
+"""
+import logging
+import os
+import re
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import progress
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+EXPORT_VIEWSETS = {
+    ExportJob.Module.PERSONS: 'persons.views.ConvictedPersonViewSet',
+    ExportJob.Module.PETITIONS: 'petitions.views.PetitionViewSet',
+    ExportJob.Module.TRANSFERS: 'transfers.views.TransferViewSet',
+    ExportJob.Module.COMMISSIONS: 'commissions.views.CommissionSessionViewSet',
+}
+
+_FILENAME_RE = re.compile(r'filename="?([^";]+)"?')
+
+
+def _params_querydict(params):
+    query = QueryDict(mutable=True)
+    for key, value in params.items():
+        if isinstance(value, list):
+            query.setlist(key, [str(item) for item in value])
+        else:
+            query[key] = str(value)
+    return query
+
+
+def _export_request(job):
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = f'/api/v1/{job.module}/export_{job.format}/'
+    request.META['SERVER_NAME'] = 'export-worker'
+    request.META['SERVER_PORT'] = '80'
+    request.GET = _params_querydict(job.params)
+    # Recunoscut de rest_framework.request.Request: autentificare fără token
+    request._force_auth_user = job.created_by
+    return request
+
+
+def claim_next_job():
+    """Marchează ca RUNNING cel mai vechi job PENDING și îl întoarce (sau None)."""
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ExportJob.Status.PENDING)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ExportJob.Status.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+    return job
+
+
+def _report(job):
+    def callback(done, total):
+        ExportJob.objects.filter(pk=job.pk).update(rows_done=done, rows_total=total)
+    return callback
+
+
+def run_job(job):
+    """Generează fișierul pentru un job deja preluat (status RUNNING)."""
+    viewset = import_string(EXPORT_VIEWSETS[job.module])
+    view = viewset.as_view({'get': f'export_{job.format}'})
+
+    try:
+        with progress.reporting(_report(job)):
+            response = view(_export_request(job))
+            if response.status_code != 200:
+                if hasattr(response, 'render'):
+                    response.render()
+                raise ValueError(f'HTTP {response.status_code}: {response.content.decode()[:500]}')
+
+            match = _FILENAME_RE.search(response.get('Content-Disposition', ''))
+            filename = match.group(1) if match else f'{job.module}.{job.format}'
+            content = response.streaming_content if response.streaming else [response.content]
+            with tempfile.TemporaryFile() as output:
+                # Fișierul se generează efectiv abia la iterarea conținutului
+                for chunk in content:
+                    output.write(chunk)
+                job.file.save(f'{job.pk}/{filename}', File(output, name=filename), save=False)
+    except Exception as e:
+        logger.exception('Export job %s failed', job.pk)
+        job.refresh_from_db(fields=['rows_done', 'rows_total'])
+        job.status = ExportJob.Status.FAILED
+        job.error = str(e)
+    else:
+        job.refresh_from_db(fields=['rows_done', 'rows_total'])
+        job.status = ExportJob.Status.DONE
+        job.filename = filename
+
+    job.finished_at = timezone.now()
+    job.expires_at = job.finished_at + timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS)
+    job.save()
+    return job
+
+
+def purge_expired_jobs():
+    """Șterge job-urile expirate împreună cu fișierele lor."""
+    count = 0
+    for job in ExportJob.objects.filter(expires_at__lte=timezone.now()).iterator():
+        if job.file:
+            directory = os.path.dirname(job.file.path)
+            job.file.delete(save=False)
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+        job.delete()
+        count += 1
+    return count
+
+
+def requeue_interrupted_jobs():
+    """Job-urile rămase RUNNING după o oprire a worker-ului sunt reluate."""
+    return ExportJob.objects.filter(status=ExportJob.Status.RUNNING).update(
+        status=ExportJob.Status.PENDING, started_at=None, rows_done=0, rows_total=None
+    )
+
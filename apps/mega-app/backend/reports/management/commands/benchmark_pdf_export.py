@@ -0,0 +1,99 @@
+import io
+import multiprocessing
+import resource
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+from reports.pdf_engine import PDF_FONT_DIR, PdfReport
+
+HEADERS = ['Nr.', 'Nr. Înreg.', 'Data', 'Petiționar', 'Deținut', 'Obiect', 'Status', 'Termen']
+COL_WIDTHS = [1.2 * cm, 2.5 * cm, 2.2 * cm, 5 * cm, 5 * cm, 4 * cm, 3 * cm, 2.2 * cm]
+
+
+def _rows(count):
+    start = date(2024, 1, 1)
+    for i in range(count):
+        day = start + timedelta(days=i % 700)
+        yield [
+            i + 1,
+            f'P-{i}/24',
+            day.strftime('%d.%m.%Y'),
+            f'Petiționar {i}',
+            f'Deținut {i % 5000}',
+            'Cerere transfer',
+            'În lucru',
+            (day + timedelta(days=30)).strftime('%d.%m.%Y'),
+        ]
+
+
+def _legacy(count):
+    """Varianta anterioară: fonturi înregistrate la fiecare export, un singur Table."""
+    pdfmetrics.registerFont(TTFont('DejaVu', f'{PDF_FONT_DIR}/DejaVuSans.ttf'))
+    pdfmetrics.registerFont(TTFont('DejaVuBd', f'{PDF_FONT_DIR}/DejaVuSans-Bold.ttf'))
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4))
+    data = [HEADERS] + [[str(value) for value in row] for row in _rows(count)]
+    table = Table(data, colWidths=COL_WIDTHS, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'DejaVuBd'),
+        ('FONTNAME', (0, 1), (-1, -1), 'DejaVu'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ]))
+    doc.build([table])
+    return len(buffer.getvalue())
+
+
+def _engine(count):
+    output = io.BytesIO()
+    PdfReport('Benchmark', HEADERS, COL_WIDTHS, number_columns=[0, 2, 7]).write(_rows(count), output)
+    return len(output.getvalue())
+
+
+def _measure(args):
+    name, count = args
+    started = time.perf_counter()
+    size = {'legacy': _legacy, 'engine': _engine}[name](count)
+    elapsed = time.perf_counter() - started
+    # ru_maxrss este în KB pe Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, size, peak_rss
+
+
+class Command(BaseCommand):
+    help = 'Benchmark PDF export: single Table vs reports.pdf_engine (time, peak RSS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            default='1000,10000,50000',
+            help='Comma separated row counts',
+        )
+        parser.add_argument(
+            '--legacy-max-rows',
+            type=int,
+            default=10000,
+            help='Skip the single-Table variant above this many rows (its layout grows quadratically)',
+        )
+
+    def handle(self, *args, **options):
+        for count in [int(value) for value in options['rows'].split(',')]:
+            variants = ['engine']
+            if count <= options['legacy_max_rows']:
+                variants.insert(0, 'legacy')
+            for name in variants:
+                # Fiecare variantă într-un proces nou, ca vârful de memorie să fie separat
+                with multiprocessing.get_context('spawn').Pool(1, maxtasksperchild=1) as pool:
+                    elapsed, size, peak_rss = pool.map(_measure, [(name, count)])[0]
+                self.stdout.write(
+                    f'{count:>6} rows {name:<7} {elapsed:7.2f}s, '
+                    f'{size / 1024:.0f} KB, peak RSS {peak_rss / 1024:.0f} MB'
+                )
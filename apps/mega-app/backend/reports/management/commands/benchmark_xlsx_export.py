@@ -0,0 +1,97 @@
+import io
+import multiprocessing
+import resource
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+from reports.xlsx_export import XlsxExport
+
+HEADERS = ['Nr. Înreg.', 'Data', 'Petiționar', 'Deținut', 'Obiect', 'Status', 'Termen', 'Atribuit']
+WIDTHS = [12, 12, 25, 25, 20, 15, 12, 20]
+
+
+def _rows(count):
+    start = date(2024, 1, 1)
+    for i in range(count):
+        day = start + timedelta(days=i % 700)
+        yield [
+            f'P-{i}/24',
+            day.strftime('%d.%m.%Y'),
+            f'Petiționar {i}',
+            f'Deținut {i % 5000}',
+            'Cerere transfer',
+            'În lucru',
+            (day + timedelta(days=30)).strftime('%d.%m.%Y'),
+            'Operator',
+        ]
+
+
+def _legacy(count):
+    """Varianta anterioară: Workbook complet în memorie, stil per celulă, BytesIO."""
+    started = time.perf_counter()
+    wb = Workbook()
+    ws = wb.active
+    header_font = Font(bold=True, size=11)
+    header_fill = PatternFill(start_color='E0E0E0', end_color='E0E0E0', fill_type='solid')
+    alignment = Alignment(vertical='center', wrap_text=True)
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    for col, header in enumerate(HEADERS, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.border = border
+    for row, values in enumerate(_rows(count), 2):
+        for col, value in enumerate(values, 1):
+            cell = ws.cell(row=row, column=col, value=value)
+            cell.alignment = alignment
+            cell.border = border
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    body = buffer.getvalue()
+    first_byte = time.perf_counter() - started
+    size = len(body)
+    return first_byte, time.perf_counter() - started, size
+
+
+def _streaming(count):
+    started = time.perf_counter()
+    export = XlsxExport('Benchmark', HEADERS, column_widths=WIDTHS)
+    first_byte = None
+    size = 0
+    for chunk in export.stream(_rows(count)):
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        size += len(chunk)
+    return first_byte, time.perf_counter() - started, size
+
+
+def _measure(args):
+    name, count = args
+    first_byte, total, size = {'legacy': _legacy, 'streaming': _streaming}[name](count)
+    # ru_maxrss este în KB pe Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return name, first_byte, total, size, peak_rss
+
+
+class Command(BaseCommand):
+    help = 'Benchmark XLSX export: in-memory workbook vs streamed write-only (peak RSS, TTFB)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000)
+
+    def handle(self, *args, **options):
+        count = options['rows']
+        self.stdout.write(f'{count} rows')
+        # Fiecare variantă într-un proces nou, ca vârful de memorie să fie separat
+        for name in ('legacy', 'streaming'):
+            with multiprocessing.get_context('spawn').Pool(1, maxtasksperchild=1) as pool:
+                name, first_byte, total, size, peak_rss = pool.map(_measure, [(name, count)])[0]
+            self.stdout.write(
+                f'{name:<10} first byte {first_byte:.2f}s, total {total:.2f}s, '
+                f'{size / 1024:.0f} KB, peak RSS {peak_rss / 1024:.0f} MB'
+            )
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from reports.export_jobs import (
+    claim_next_job,
+    purge_expired_jobs,
+    requeue_interrupted_jobs,
+    run_job,
+)
+
+PURGE_INTERVAL_SECONDS = 600
+
+
+class Command(BaseCommand):
+    help = 'Process queued XLSX/PDF export jobs (reports.ExportJob) and remove expired results'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2,
+            help='Seconds to wait when the queue is empty',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the queued jobs and exit',
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_interrupted_jobs()
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} interrupted job(s)')
+
+        last_purge = None
+        while True:
+            if last_purge is None or time.monotonic() - last_purge >= PURGE_INTERVAL_SECONDS:
+                purged = purge_expired_jobs()
+                if purged:
+                    self.stdout.write(f'Removed {purged} expired export(s)')
+                last_purge = time.monotonic()
+
+            job = claim_next_job()
+            if job is not None:
+                job = run_job(job)
+                self.stdout.write(f'Export {job.pk} ({job.module} {job.format}): {job.status}')
+                close_old_connections()
+                continue
+
+            if options['once']:
+                break
+            close_old_connections()
+            time.sleep(options['poll_interval'])
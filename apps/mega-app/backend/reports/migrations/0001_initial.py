@@ -0,0 +1,44 @@
+# Generated by Django 5.0.1 on 2026-10-17 12:45
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('module', models.CharField(choices=[('persons', 'Persoane condamnate'), ('petitions', 'Petiții'), ('transfers', 'Transferuri'), ('commissions', 'Comisia penitenciară')], max_length=20, verbose_name='Modul')),
+                ('format', models.CharField(choices=[('xlsx', 'XLSX'), ('pdf', 'PDF')], max_length=4, verbose_name='Format')),
+                ('params', models.JSONField(blank=True, default=dict, help_text='Parametrii de query acceptați de endpoint-ul de export al modulului', verbose_name='Filtre')),
+                ('status', models.CharField(choices=[('pending', 'În așteptare'), ('running', 'În lucru'), ('done', 'Finalizat'), ('failed', 'Eșuat')], default='pending', max_length=10, verbose_name='Status')),
+                ('rows_done', models.PositiveIntegerField(default=0, verbose_name='Rânduri procesate')),
+                ('rows_total', models.PositiveIntegerField(blank=True, null=True, verbose_name='Total rânduri')),
+                ('file', models.FileField(blank=True, upload_to='exports/', verbose_name='Fișier')),
+                ('filename', models.CharField(blank=True, max_length=255, verbose_name='Nume fișier')),
+                ('error', models.TextField(blank=True, verbose_name='Eroare')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Creat de')),
+            ],
+            options={
+                'verbose_name': 'Export',
+                'verbose_name_plural': 'Exporturi',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='reports_exp_status_b9ce26_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+import uuid
+from django.db import models
+from django.conf import settings
+
+
+class ExportJob(models.Model):
+    """Export XLSX/PDF rulat în fundal de run_export_worker."""
+
+    class Module(models.TextChoices):
+        PERSONS = 'persons', 'Persoane condamnate'
+        PETITIONS = 'petitions', 'Petiții'
+        TRANSFERS = 'transfers', 'Transferuri'
+        COMMISSIONS = 'commissions', 'Comisia penitenciară'
+
+    class Format(models.TextChoices):
+        XLSX = 'xlsx', 'XLSX'
+        PDF = 'pdf', 'PDF'
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'În așteptare'
+        RUNNING = 'running', 'În lucru'
+        DONE = 'done', 'Finalizat'
+        FAILED = 'failed', 'Eșuat'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    module = models.CharField(max_length=20, choices=Module.choices, verbose_name='Modul')
+    format = models.CharField(max_length=4, choices=Format.choices, verbose_name='Format')
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Filtre',
+        help_text='Parametrii de query acceptați de endpoint-ul de export al modulului'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Status'
+    )
+    rows_done = models.PositiveIntegerField(default=0, verbose_name='Rânduri procesate')
+    rows_total = models.PositiveIntegerField(null=True, blank=True, verbose_name='Total rânduri')
+    file = models.FileField(upload_to='exports/', blank=True, verbose_name='Fișier')
+    filename = models.CharField(max_length=255, blank=True, verbose_name='Nume fișier')
+    error = models.TextField(blank=True, verbose_name='Eroare')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='export_jobs',
+        verbose_name='Creat de'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        verbose_name = 'Export'
+        verbose_name_plural = 'Exporturi'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_module_display()} {self.format} - {self.get_status_display()}"
+
+    @property
+    def progress(self):
+        """Procent finalizat; None dacă totalul nu este cunoscut."""
+        if self.status == self.Status.DONE:
+            return 100
+        if not self.rows_total:
+            return None
+        return min(99, self.rows_done * 100 // self.rows_total)
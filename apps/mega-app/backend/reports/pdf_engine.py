@@ -0,0 +1,241 @@
+"""
+Export PDF comun pentru toate modulele.
+
+- fonturile (DejaVu, cu diacritice) se înregistrează o singură dată per
+  proces, din ReportsConfig.ready(); dacă fișierele lipsesc se folosește
+  Helvetica
+- toate rapoartele folosesc același șablon de pagină: titlul și data
+  generării pe prima pagină, numărul paginii în subsol
+- rândurile sunt împărțite în LongTable-uri de câte o pagină, cu antetul
+  repetat; rândurile au înălțime fixă, deci numărul de rânduri pe pagină se
+  calculează o dată, iar reportlab nu mai așază un singur tabel uriaș
+
+    report = PdfReport('REGISTRU PETIȚII', headers, col_widths=[2 * cm, 4 * cm])
+    return report.response(rows, 'registru.pdf')
+
+`rows` poate fi orice iterabil (de preferat un generator peste
+queryset.iterator()); valorile sunt convertite cu str().
+"""
+import os
+import tempfile
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import BaseDocTemplate, Frame, LongTable, PageTemplate, TableStyle
+
+from . import progress
+from .xlsx_export import SPOOL_MAX_SIZE, STREAM_CHUNK_SIZE
+
+PDF_FONT_DIR = os.getenv('PDF_FONT_DIR', '/usr/share/fonts/truetype/dejavu')
+
+FONT_REGULAR = 'Helvetica'
+FONT_BOLD = 'Helvetica-Bold'
+
+PAGE_SIZE = landscape(A4)
+MARGIN = 1 * cm
+TITLE_BLOCK_HEIGHT = 2 * cm
+FOOTER_HEIGHT = 0.6 * cm
+
+ROW_HEIGHT = 0.5 * cm
+HEADER_ROW_HEIGHT = 0.8 * cm
+CELL_PADDING = 3
+
+HEADER_BACKGROUND = colors.Color(0.85, 0.85, 0.85)
+TOTAL_BACKGROUND = colors.Color(0.9, 0.9, 0.9)
+STRIPE_BACKGROUND = colors.Color(0.95, 0.95, 0.95)
+
+
+def register_fonts():
+    """Înregistrează DejaVu o singură dată; întoarce (regular, bold)."""
+    global FONT_REGULAR, FONT_BOLD
+    if FONT_REGULAR == 'DejaVu':
+        return FONT_REGULAR, FONT_BOLD
+    regular = os.path.join(PDF_FONT_DIR, 'DejaVuSans.ttf')
+    bold = os.path.join(PDF_FONT_DIR, 'DejaVuSans-Bold.ttf')
+    if os.path.exists(regular) and os.path.exists(bold):
+        pdfmetrics.registerFont(TTFont('DejaVu', regular))
+        pdfmetrics.registerFont(TTFont('DejaVuBd', bold))
+        pdfmetrics.registerFontFamily('DejaVu', normal='DejaVu', bold='DejaVuBd')
+        FONT_REGULAR, FONT_BOLD = 'DejaVu', 'DejaVuBd'
+    return FONT_REGULAR, FONT_BOLD
+
+
+def _fit(text, width, font, size):
+    """Taie textul cu '...' ca să încapă pe lățimea celulei (rândurile au înălțime fixă)."""
+    if pdfmetrics.stringWidth(text, font, size) <= width:
+        return text
+    while text and pdfmetrics.stringWidth(text + '...', font, size) > width:
+        text = text[:-1]
+    return text + '...'
+
+
+_NO_PADDING = {'leftPadding': 0, 'rightPadding': 0, 'topPadding': 0, 'bottomPadding': 0}
+
+
+class _ReportDocTemplate(BaseDocTemplate):
+    def __init__(self, output, title, subtitle):
+        super().__init__(
+            output,
+            pagesize=PAGE_SIZE,
+            leftMargin=MARGIN,
+            rightMargin=MARGIN,
+            topMargin=MARGIN,
+            bottomMargin=MARGIN,
+            title=title,
+        )
+        self.report_title = title
+        self.report_subtitle = subtitle
+        width = self.width
+        bottom = MARGIN + FOOTER_HEIGHT
+        # Înălțimea utilă pentru tabel pe prima pagină și pe următoarele
+        self.later_height = self.height - FOOTER_HEIGHT
+        self.first_height = self.later_height - TITLE_BLOCK_HEIGHT
+        self.addPageTemplates([
+            PageTemplate(
+                id='first',
+                frames=[Frame(MARGIN, bottom, width, self.first_height, id='first', **_NO_PADDING)],
+                onPage=self._draw_first_page,
+                autoNextPageTemplate='later',
+            ),
+            PageTemplate(
+                id='later',
+                frames=[Frame(MARGIN, bottom, width, self.later_height, id='later', **_NO_PADDING)],
+                onPage=self._draw_footer,
+            ),
+        ])
+
+    def _draw_first_page(self, canvas, doc):
+        top = PAGE_SIZE[1] - MARGIN
+        canvas.saveState()
+        canvas.setFont(FONT_BOLD, 14)
+        canvas.drawCentredString(PAGE_SIZE[0] / 2, top - 0.6 * cm, self.report_title)
+        canvas.setFont(FONT_REGULAR, 9)
+        canvas.drawString(MARGIN, top - 1.4 * cm, self.report_subtitle)
+        canvas.restoreState()
+        self._draw_footer(canvas, doc)
+
+    def _draw_footer(self, canvas, doc):
+        canvas.saveState()
+        canvas.setFont(FONT_REGULAR, 7)
+        canvas.drawRightString(PAGE_SIZE[0] - MARGIN, MARGIN, f'Pagina {doc.page}')
+        canvas.restoreState()
+
+
+class PdfReport:
+    """Descrierea unui raport PDF tabelar.
+
+    number_columns - indecși (de la 0) ai coloanelor centrate.
+    """
+
+    def __init__(self, title, headers, col_widths, number_columns=(), font_size=7, header_font_size=8):
+        self.title = title
+        self.headers = headers
+        self.col_widths = col_widths
+        self.number_columns = sorted(number_columns)
+        self.font_size = font_size
+        self.header_font_size = header_font_size
+
+    def _rows_per_page(self, frame_height):
+        return max(1, int((frame_height - HEADER_ROW_HEIGHT) // ROW_HEIGHT))
+
+    def _table_style(self, row_count, footer_count):
+        regular, bold = FONT_REGULAR, FONT_BOLD
+        commands = [
+            ('FONTNAME', (0, 0), (-1, 0), bold),
+            ('FONTSIZE', (0, 0), (-1, 0), self.header_font_size),
+            ('BACKGROUND', (0, 0), (-1, 0), HEADER_BACKGROUND),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 1), (-1, -1), regular),
+            ('FONTSIZE', (0, 1), (-1, -1), self.font_size),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+            ('RIGHTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+            ('TOPPADDING', (0, 0), (-1, -1), 0),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ]
+        data_end = row_count - footer_count
+        if data_end > 1:
+            commands.append(('ROWBACKGROUNDS', (0, 1), (-1, data_end - 1), [colors.white, STRIPE_BACKGROUND]))
+        for col in self.number_columns:
+            commands.append(('ALIGN', (col, 1), (col, -1), 'CENTER'))
+        if footer_count:
+            commands += [
+                ('FONTNAME', (0, data_end), (-1, -1), bold),
+                ('BACKGROUND', (0, data_end), (-1, -1), TOTAL_BACKGROUND),
+            ]
+        return TableStyle(commands)
+
+    def _table(self, body, footer_count=0):
+        header_row = [
+            '\n'.join(
+                _fit(line, width - 2 * CELL_PADDING, FONT_BOLD, self.header_font_size)
+                for line in str(header).split('\n')
+            )
+            for header, width in zip(self.headers, self.col_widths)
+        ]
+        data = [header_row] + body
+        table = LongTable(
+            data,
+            colWidths=self.col_widths,
+            rowHeights=[HEADER_ROW_HEIGHT] + [ROW_HEIGHT] * len(body),
+            repeatRows=1,
+        )
+        table.setStyle(self._table_style(len(data), footer_count))
+        return table
+
+    def _cells(self, values, font):
+        return [
+            _fit('' if value is None else str(value), width - 2 * CELL_PADDING, font, self.font_size)
+            for value, width in zip(values, self.col_widths)
+        ]
+
+    def _story(self, doc, rows, footer_rows):
+        first_page = self._rows_per_page(doc.first_height)
+        per_page = self._rows_per_page(doc.later_height)
+
+        story = []
+        body = []
+        capacity = first_page
+        for values in progress.track(rows):
+            body.append(self._cells(values, FONT_REGULAR))
+            if len(body) == capacity:
+                story.append(self._table(body))
+                body = []
+                capacity = per_page
+
+        footer = [self._cells(values, FONT_BOLD) for values in footer_rows]
+        if body or footer or not story:
+            story.append(self._table(body + footer, footer_count=len(footer)))
+        return story
+
+    def write(self, rows, output, footer_rows=()):
+        """Scrie PDF-ul în `output` (fișier binar deschis pentru scriere)."""
+        register_fonts()
+        subtitle = f"Generat la: {timezone.now().strftime('%d.%m.%Y')}"
+        doc = _ReportDocTemplate(output, self.title, subtitle)
+        doc.build(self._story(doc, rows, footer_rows))
+
+    def stream(self, rows, footer_rows=()):
+        """Generator de bucăți binare ale fișierului PDF."""
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as output:
+            self.write(rows, output, footer_rows=footer_rows)
+            output.seek(0)
+            while True:
+                chunk = output.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    def response(self, rows, filename, footer_rows=()):
+        response = StreamingHttpResponse(
+            self.stream(rows, footer_rows=footer_rows),
+            content_type='application/pdf',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
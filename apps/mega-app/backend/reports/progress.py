@@ -0,0 +1,61 @@
+"""
+Raportarea progresului pentru exporturile rulate în fundal.
+
+Worker-ul de export setează un callback cu `reporting(callback)`; motoarele
+XLSX/PDF trec rândurile prin `track(rows)`, care apelează callback-ul la
+fiecare REPORT_EVERY rânduri. În afara unui job (export direct din request)
+`track` întoarce rândurile neschimbate.
+
+Pentru generatoare peste queryset-uri totalul se poate da cu
+`counted(rows(), queryset.count)`; count() rulează doar când progresul
+este urmărit.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+REPORT_EVERY = 1000
+
+_callback = ContextVar('export_progress_callback', default=None)
+
+
+@contextmanager
+def reporting(callback):
+    """callback(rows_done, rows_total) - rows_total este None dacă nu se știe."""
+    token = _callback.set(callback)
+    try:
+        yield
+    finally:
+        _callback.reset(token)
+
+
+class counted:
+    """Iterabil cu len() calculat la cerere (pentru procentul de progres)."""
+
+    def __init__(self, rows, count):
+        self._rows = rows
+        self._count = count
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return self._count()
+
+
+def track(rows):
+    callback = _callback.get()
+    if callback is None:
+        return rows
+    return _tracked(rows, callback)
+
+
+def _tracked(rows, callback):
+    total = len(rows) if hasattr(rows, '__len__') else None
+    done = 0
+    callback(done, total)
+    for row in rows:
+        yield row
+        done += 1
+        if done % REPORT_EVERY == 0:
+            callback(done, total)
+    callback(done, total)
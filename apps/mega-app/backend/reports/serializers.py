@@ -0,0 +1,38 @@
+from rest_framework import serializers
+from .models import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    module_display = serializers.CharField(source='get_module_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    progress = serializers.IntegerField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'module', 'module_display', 'format', 'params',
+            'status', 'status_display', 'rows_done', 'rows_total', 'progress',
+            'filename', 'error', 'download_url',
+            'created_at', 'started_at', 'finished_at', 'expires_at',
+        ]
+        read_only_fields = [
+            'id', 'status', 'rows_done', 'rows_total', 'filename', 'error',
+            'created_at', 'started_at', 'finished_at', 'expires_at',
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != ExportJob.Status.DONE:
+            return None
+        request = self.context.get('request')
+        url = f'/api/v1/reports/export-jobs/{obj.pk}/download/'
+        return request.build_absolute_uri(url) if request else url
+
+    def validate_params(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('Filtrele trebuie trimise ca obiect.')
+        for key, item in value.items():
+            items = item if isinstance(item, list) else [item]
+            if any(isinstance(v, (dict, list)) for v in items):
+                raise serializers.ValidationError(f'Valoare invalidă pentru filtrul "{key}".')
+        return value
@@ -0,0 +1,179 @@
+import os
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from commissions import views as commission_views
+from commissions.models import (
+    CommissionSession, CommissionEvaluation, CommissionArticleResult,
+    Article, ProgramResult, BehaviorResult, Decision,
+)
+from commissions.serializers import sync_evaluations
+from persons.models import ConvictedPerson
+from transfers.models import Transfer, TransferEntry, TransferMonthlyRollup
+from .export_cache import data_version
+from .export_jobs import claim_next_job, purge_expired_jobs, run_job
+from .models import ExportJob
+
+EXPORT_URL = '/api/v1/commissions/export_xlsx/'
+JOBS_URL = '/api/v1/reports/export-jobs/'
+
+
+class ExportCacheTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='operator'))
+
+        session = CommissionSession.objects.create(session_date=date(2025, 3, 10))
+        person = ConvictedPerson.objects.create(first_name='Ion', last_name='Popescu')
+        self.result = CommissionArticleResult.objects.create(
+            evaluation=CommissionEvaluation.objects.create(session=session, person=person),
+            article=Article.ART_91,
+            program_result=ProgramResult.REALIZAT,
+            behavior_result=BehaviorResult.POZITIV,
+            decision=Decision.ADMIS,
+        )
+
+        render = mock.patch.object(
+            commission_views, 'export_commissions_xlsx', wraps=commission_views.export_commissions_xlsx,
+        )
+        self.render = render.start()
+        self.addCleanup(render.stop)
+
+    def export(self, **headers):
+        response = self.client.get(EXPORT_URL, {'year': 2025, 'month': 3}, secure=True, headers=headers)
+        if response.status_code == 200:
+            b''.join(response.streaming_content)
+            response.close()
+        return response
+
+    def test_second_export_is_served_from_cache(self):
+        first = self.export()
+        second = self.export()
+        self.assertEqual((first.status_code, second.status_code), (200, 200))
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_child_row_edit_invalidates_cache(self):
+        first = self.export()
+        # Se schimbă doar decizia rezultatului, fără save() pe ședință
+        sync_evaluations(self.result.evaluation.session, [{
+            'person': self.result.evaluation.person_id,
+            'article_results': [{
+                'article': Article.ART_91,
+                'program_result': ProgramResult.REALIZAT,
+                'behavior_result': BehaviorResult.POZITIV,
+                'decision': Decision.RESPINS,
+            }],
+        }])
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.decision, Decision.RESPINS)
+        second = self.export()
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        self.assertEqual(self.render.call_count, 2)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.export()['ETag']
+        response = self.export(**{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_rollup_rebuild_changes_version(self):
+        transfer = Transfer.objects.create(transfer_date=date(2025, 3, 10))
+        TransferEntry.objects.create(transfer=transfer, penitentiary=1, veniti=2)
+        TransferMonthlyRollup.objects.rebuild()
+        rollups = TransferMonthlyRollup.objects.filter(year=2025)
+        before = data_version(rollups)
+        TransferMonthlyRollup.objects.rebuild()
+        self.assertNotEqual(data_version(rollups), before)
+
+
+class ExportJobTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = get_user_model().objects.create_user(username='operator')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        session = CommissionSession.objects.create(session_date=date(2025, 3, 10))
+        CommissionArticleResult.objects.create(
+            evaluation=CommissionEvaluation.objects.create(
+                session=session, person=ConvictedPerson.objects.create(first_name='Ion', last_name='Popescu'),
+            ),
+            article=Article.ART_91,
+            program_result=ProgramResult.REALIZAT,
+            behavior_result=BehaviorResult.POZITIV,
+            decision=Decision.ADMIS,
+        )
+
+    def create_job(self):
+        response = self.client.post(JOBS_URL, {
+            'module': ExportJob.Module.COMMISSIONS,
+            'format': ExportJob.Format.XLSX,
+            'params': {'year': 2025, 'month': 3},
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 202)
+        return ExportJob.objects.get(pk=response.json()['id'])
+
+    def download(self, job):
+        return self.client.get(f'{JOBS_URL}{job.pk}/download/', secure=True)
+
+    def test_download_before_completion_conflicts(self):
+        job = self.create_job()
+        response = self.download(job)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['status'], ExportJob.Status.PENDING)
+
+    def test_download_after_completion_returns_file(self):
+        job = self.create_job()
+        self.assertEqual(claim_next_job(), job)
+        job = run_job(job)
+        self.assertEqual(job.status, ExportJob.Status.DONE, job.error)
+
+        response = self.download(job)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(job.filename, response['Content-Disposition'])
+        content = b''.join(response.streaming_content)
+        response.close()
+        with job.file.open('rb') as stored:
+            self.assertEqual(content, stored.read())
+        # Fișierele XLSX sunt arhive zip
+        self.assertTrue(content.startswith(b'PK'))
+
+    def test_other_users_job_is_not_found(self):
+        job = self.create_job()
+        other = APIClient()
+        other.force_authenticate(get_user_model().objects.create_user(username='altul'))
+        self.assertEqual(other.get(f'{JOBS_URL}{job.pk}/', secure=True).status_code, 404)
+        self.assertEqual(other.get(f'{JOBS_URL}{job.pk}/download/', secure=True).status_code, 404)
+        self.assertEqual(other.get(JOBS_URL, secure=True).json()['count'], 0)
+
+    def test_purge_deletes_expired_jobs_and_files(self):
+        self.create_job()
+        expired = run_job(claim_next_job())
+        kept = self.create_job()
+        path = expired.file.path
+        self.assertTrue(os.path.exists(path))
+        ExportJob.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual(purge_expired_jobs(), 1)
+        self.assertEqual(list(ExportJob.objects.values_list('pk', flat=True)), [kept.pk])
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(os.path.dirname(path)))
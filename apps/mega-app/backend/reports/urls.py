@@ -1,9 +1,14 @@
-from django.urls import path
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
 from . import views
 
+router = DefaultRouter()
+router.register('export-jobs', views.ExportJobViewSet, basename='export-job')
+
 urlpatterns = [
     path('raport-termen/', views.raport_termen, name='raport-termen'),
     path('raport-termen/last-sync/', views.raport_termen_last_sync, name='raport-termen-last-sync'),
     path('raport-termen/request-sync/', views.raport_termen_request_sync, name='raport-termen-request-sync'),
     path('dosar-defect/', views.dosar_defect_list, name='dosar-defect'),
+    path('', include(router.urls)),
 ]
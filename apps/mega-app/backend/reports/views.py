@@ -2,11 +2,15 @@ import json
 import os
 import logging
 
-from django.http import JsonResponse
-from rest_framework.decorators import api_view, permission_classes
+from django.http import FileResponse, JsonResponse
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from tasks.models import Task
+from .models import ExportJob
+from .serializers import ExportJobSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -73,26 +77,65 @@ def dosar_defect_list(request):
     """Returns list of person names from active tasks (TODO/IN_PROGRESS) with their category."""
     tasks = Task.objects.filter(
         status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]
-    ).values_list('title', 'status', 'category')
+    ).values_list('title', 'status', 'category', 'person_id', 'person__last_name', 'person__first_name')
 
     result = []
-    for title, status, category in tasks:
-        # title format: "Nume Prenume" - normalize for matching
-        parts = title.strip().split()
-        if len(parts) >= 2:
-            nume = parts[0]
-            prenume = parts[1]
-        elif len(parts) == 1:
-            nume = parts[0]
-            prenume = ''
+    for title, status, category, person_id, last_name, first_name in tasks:
+        if person_id:
+            # Task legat de persoană: numele vin din fișa persoanei
+            nume = last_name
+            prenume = first_name
         else:
-            continue
+            # title format: "Nume Prenume" - normalize for matching
+            parts = title.strip().split()
+            if len(parts) >= 2:
+                nume = parts[0]
+                prenume = parts[1]
+            elif len(parts) == 1:
+                nume = parts[0]
+                prenume = ''
+            else:
+                continue
 
         result.append({
             'nume': nume,
             'prenume': prenume,
             'status': status,
             'category': category,
+            'person_id': str(person_id) if person_id else None,
         })
 
     return JsonResponse(result, safe=False)
+
+
+class ExportJobViewSet(mixins.CreateModelMixin,
+                       mixins.RetrieveModelMixin,
+                       mixins.ListModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    Exporturi asincrone: POST cu {module, format, params} pune exportul în
+    coadă (params = aceiași parametri de query ca la export_xlsx/export_pdf
+    ai modulului), GET pe job întoarce progresul, iar download/ fișierul.
+    """
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated]
+    filterset_fields = ['module', 'format', 'status']
+
+    def get_queryset(self):
+        return ExportJob.objects.filter(created_by=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(created_by=request.user)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != ExportJob.Status.DONE or not job.file:
+            return Response(
+                {'detail': 'Exportul nu este încă finalizat.', 'status': job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+        return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.filename)
@@ -0,0 +1,146 @@
+"""
+Export XLSX comun pentru toate modulele.
+
+Folosește modul write-only din openpyxl: rândurile sunt scrise pe disc pe
+măsură ce sunt produse (memorie constantă indiferent de numărul de rânduri),
+cu stiluri denumite (NamedStyle) în loc de Font/Border/Alignment per celulă.
+Fișierul rezultat este trimis printr-un StreamingHttpResponse, în bucăți,
+fără a fi copiat integral în memorie.
+
+    export = XlsxExport('Registru Petiții', headers, column_widths=[12, 20])
+    return export.response(rows, 'registru.xlsx')
+
+`rows` poate fi orice iterabil (de preferat un generator peste
+queryset.iterator()); fiecare rând este o secvență de valori.
+"""
+import tempfile
+
+from django.http import StreamingHttpResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from . import progress
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+STREAM_CHUNK_SIZE = 64 * 1024
+# Până la această dimensiune fișierul temporar rămâne în memorie
+SPOOL_MAX_SIZE = 1024 * 1024
+
+STYLE_TITLE = 'export_title'
+STYLE_HEADER = 'export_header'
+STYLE_CELL = 'export_cell'
+STYLE_NUMBER = 'export_number'
+STYLE_TOTAL = 'export_total'
+STYLE_TOTAL_NUMBER = 'export_total_number'
+
+_THIN = Side(style='thin')
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+# (nume, atribute) - NamedStyle se leagă de un singur workbook, deci obiectele
+# se construiesc per workbook din aceste definiții.
+_STYLE_DEFINITIONS = [
+    (STYLE_TITLE, {
+        'font': Font(bold=True, size=14),
+        'alignment': Alignment(horizontal='center'),
+    }),
+    (STYLE_HEADER, {
+        'font': Font(bold=True, size=11),
+        'fill': PatternFill(start_color='E0E0E0', end_color='E0E0E0', fill_type='solid'),
+        'alignment': Alignment(horizontal='center', vertical='center', wrap_text=True),
+        'border': _BORDER,
+    }),
+    (STYLE_CELL, {
+        'alignment': Alignment(vertical='center', wrap_text=True),
+        'border': _BORDER,
+    }),
+    (STYLE_NUMBER, {
+        'alignment': Alignment(horizontal='center', vertical='center'),
+        'border': _BORDER,
+    }),
+    (STYLE_TOTAL, {
+        'font': Font(bold=True, size=11),
+        'alignment': Alignment(vertical='center', wrap_text=True),
+        'border': _BORDER,
+    }),
+    (STYLE_TOTAL_NUMBER, {
+        'font': Font(bold=True, size=11),
+        'alignment': Alignment(horizontal='center', vertical='center'),
+        'border': _BORDER,
+    }),
+]
+
+
+def _add_named_styles(wb):
+    for name, attributes in _STYLE_DEFINITIONS:
+        wb.add_named_style(NamedStyle(name=name, **attributes))
+
+
+class XlsxExport:
+    """Descrierea unei foi de export: titlu, antet, lățimi și coloane numerice.
+
+    number_columns - indecși (de la 0) ai coloanelor centrate ca numere.
+    """
+
+    def __init__(self, sheet_title, headers, column_widths=None, title=None, number_columns=()):
+        self.sheet_title = sheet_title[:31]  # max 31 caractere pentru numele foii
+        self.headers = headers
+        self.column_widths = column_widths or []
+        self.title = title
+        self.number_columns = frozenset(number_columns)
+
+    def _styled_row(self, ws, values, text_style, number_style):
+        return [
+            self._cell(ws, value, number_style if col in self.number_columns else text_style)
+            for col, value in enumerate(values)
+        ]
+
+    @staticmethod
+    def _cell(ws, value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    def write(self, rows, output, footer_rows=()):
+        """Scrie workbook-ul în `output` (fișier binar deschis pentru scriere)."""
+        wb = Workbook(write_only=True)
+        _add_named_styles(wb)
+        ws = wb.create_sheet(self.sheet_title)
+
+        # Lățimile trebuie setate înainte de primul rând în modul write-only
+        for col, width in enumerate(self.column_widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+
+        if self.title:
+            ws.merged_cells.add(f'A1:{get_column_letter(len(self.headers))}1')
+            ws.append([self._cell(ws, self.title, STYLE_TITLE)])
+            ws.append([])
+
+        ws.append([self._cell(ws, header, STYLE_HEADER) for header in self.headers])
+        for values in progress.track(rows):
+            ws.append(self._styled_row(ws, values, STYLE_CELL, STYLE_NUMBER))
+        for values in footer_rows:
+            ws.append(self._styled_row(ws, values, STYLE_TOTAL, STYLE_TOTAL_NUMBER))
+
+        wb.save(output)
+
+    def stream(self, rows, footer_rows=()):
+        """Generator de bucăți binare ale fișierului XLSX."""
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as output:
+            self.write(rows, output, footer_rows=footer_rows)
+            output.seek(0)
+            while True:
+                chunk = output.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    def response(self, rows, filename, footer_rows=()):
+        response = StreamingHttpResponse(
+            self.stream(rows, footer_rows=footer_rows),
+            content_type=XLSX_CONTENT_TYPE,
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -21,7 +21,12 @@ class SentenceAdmin(admin.ModelAdmin):
     list_display = ['person', 'crime_type', 'duration_display', 'start_date', 'end_date', 'status']
     list_filter = ['status', 'crime_type', 'start_date']
     search_fields = ['person__first_name', 'person__last_name', 'crime_description']
-    readonly_fields = ['id', 'end_date', 'total_days', 'is_serious_crime', 'created_by', 'created_at', 'updated_at']
+    readonly_fields = [
+        'id', 'end_date', 'total_days', 'is_serious_crime',
+        'total_reduction_days', 'total_preventive_arrest_days', 'total_zpm_days',
+        'effective_end_date', 'effective_years', 'effective_months', 'effective_days',
+        'created_by', 'created_at', 'updated_at',
+    ]
     inlines = [FractionInline, PreventiveArrestInline]
     ordering = ['-start_date']
 
@@ -1,4 +1,4 @@
-from dateutil.relativedelta import relativedelta
+from .calendar_engine import add_duration, duration_between
 
 
 def calculate_fraction_date(start_date, years, months, days, numerator, denominator):
@@ -22,44 +22,16 @@ def calculate_fraction_date(start_date, years, months, days, numerator, denomina
     Returns:
         The calculated date when the fraction is completed
     """
-    # Convert years and months to total months
-    total_months = years * 12 + months
+    # Fraction of the months with integer arithmetic; the month remainder
+    # is converted to days at 30 days per month
+    fraction_months, month_remainder = divmod((years * 12 + months) * numerator, denominator)
+    fraction_days = (days * numerator) // denominator + (month_remainder * 30) // denominator
 
-    # Calculate fraction of months using integer arithmetic
-    fraction_months_numerator = total_months * numerator
-    fraction_months = fraction_months_numerator // denominator
-    month_remainder = fraction_months_numerator % denominator
+    # 30-day carry into months (add_duration normalizes months into years)
+    carry_months, fraction_days = divmod(fraction_days, 30)
 
-    # Convert month remainder to days (30 days per month)
-    extra_days_from_months = (month_remainder * 30) // denominator
-
-    # Calculate fraction of days
-    fraction_days = (days * numerator) // denominator
-
-    # Total fractioned days
-    total_fraction_days = fraction_days + extra_days_from_months
-
-    # Convert fraction_months to years and remaining months
-    fraction_years = fraction_months // 12
-    remaining_months = fraction_months % 12
-
-    # Handle overflow: if days >= 30, convert to months
-    if total_fraction_days >= 30:
-        additional_months = total_fraction_days // 30
-        total_fraction_days = total_fraction_days % 30
-        remaining_months += additional_months
-
-        # Handle month overflow
-        if remaining_months >= 12:
-            fraction_years += remaining_months // 12
-            remaining_months = remaining_months % 12
-
-    # Use relativedelta for accurate date arithmetic
-    return start_date + relativedelta(
-        years=fraction_years,
-        months=remaining_months,
-        days=total_fraction_days
-    )
+    # Calendar arithmetic with relativedelta semantics (end-of-month clamping)
+    return add_duration(start_date, 0, fraction_months + carry_months, fraction_days)
 
 
 def calculate_end_date(start_date, years, months, days):
@@ -80,15 +52,45 @@ def calculate_end_date(start_date, years, months, days):
     Returns:
         The calculated end date
     """
-    end_date = start_date + relativedelta(years=years, months=months, days=days)
-
     # Apply the minus-one-day rule only when sentence has no days component
     if days == 0 and (years > 0 or months > 0):
-        end_date = end_date - relativedelta(days=1)
+        days = -1
+
+    return add_duration(start_date, years, months, days)
+
+
+def calculate_reduced_end_date(end_date, reductions):
+    """
+    Apply sentence reductions to an end date.
+
+    Each reduction is subtracted in order (relativedelta semantics), so the
+    end-of-month clamping matches the order the reductions are listed in.
 
+    Args:
+        end_date: The (nominal) end date of the sentence
+        reductions: Iterable of (years, months, days) tuples
+
+    Returns:
+        The end date after all reductions
+    """
+    for years, months, days in reductions:
+        end_date = add_duration(end_date, -years, -months, -days)
     return end_date
 
 
+def calculate_duration(start_date, end_date):
+    """
+    Split the interval between two dates into (years, months, days).
+
+    Negative components (end before start) are clamped to zero.
+
+    Returns:
+        A (years, months, days) tuple
+    """
+    years, months, days = duration_between(end_date, start_date)
+    return max(0, years), max(0, months), max(0, days)
+
+
 def calculate_total_days(years, months, days):
     """
     Calculate total days using standard approximations.
@@ -0,0 +1,82 @@
+"""
+Calendar arithmetic on a precomputed month table.
+
+Reproduces the two dateutil.relativedelta operations used by the sentence
+calculations with plain integer indexing:
+
+- add_duration(d, years, months, days) == d + relativedelta(years=, months=, days=)
+- duration_between(end, start) == (years, months, days) of relativedelta(end, start)
+
+Months are addressed by a month index (year * 12 + month - 1). For every
+month in the table we keep the ordinal of its first day and its length, so
+adding months is an index shift, end-of-month clamping is a min() against
+the length and the result is a single date.fromordinal().
+"""
+import calendar
+from datetime import date
+
+MIN_YEAR = 1800
+MAX_YEAR = 2400
+
+_BASE_INDEX = MIN_YEAR * 12
+
+
+def _build_tables():
+    month_start = []
+    month_length = []
+    for year in range(MIN_YEAR, MAX_YEAR + 1):
+        for month in range(1, 13):
+            month_start.append(date(year, month, 1).toordinal())
+            month_length.append(calendar.monthrange(year, month)[1])
+    return month_start, month_length
+
+
+_MONTH_START, _MONTH_LENGTH = _build_tables()
+_TABLE_SIZE = len(_MONTH_START)
+
+
+def _month_info(month_index):
+    """(ordinal of the 1st, number of days) for a month index."""
+    offset = month_index - _BASE_INDEX
+    if 0 <= offset < _TABLE_SIZE:
+        return _MONTH_START[offset], _MONTH_LENGTH[offset]
+    # Outside the table: compute it (only for unusual dates)
+    year, month = divmod(month_index, 12)
+    return date(year, month + 1, 1).toordinal(), calendar.monthrange(year, month + 1)[1]
+
+
+def _shift_months(value, months):
+    """Ordinal of value + relativedelta(months=months) (day clamped to month end)."""
+    start, length = _month_info(value.year * 12 + value.month - 1 + months)
+    day = value.day if value.day <= length else length
+    return start + day - 1
+
+
+def add_duration(value, years=0, months=0, days=0):
+    """value + relativedelta(years=years, months=months, days=days)."""
+    return date.fromordinal(_shift_months(value, years * 12 + months) + days)
+
+
+def duration_between(end, start):
+    """
+    The (years, months, days) components of relativedelta(end, start).
+
+    Like relativedelta, the month count is the largest shift of `start` that
+    does not pass `end`; the rest are days. Components are negative when
+    `end` is before `start`.
+    """
+    months = (end.year - start.year) * 12 + end.month - start.month
+    end_ordinal = end.toordinal()
+    shifted = _shift_months(start, months)
+    if end_ordinal < start.toordinal():
+        while end_ordinal > shifted:
+            months += 1
+            shifted = _shift_months(start, months)
+    else:
+        while end_ordinal < shifted:
+            months -= 1
+            shifted = _shift_months(start, months)
+
+    sign = -1 if months < 0 else 1
+    years, months = divmod(months * sign, 12)
+    return years * sign, months * sign, end_ordinal - shifted
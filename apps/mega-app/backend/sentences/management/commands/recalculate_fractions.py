@@ -1,26 +1,202 @@
-from django.core.management.base import BaseCommand
-from sentences.models import Sentence
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from persons.dashboard import invalidate_dashboard_kpis
+from persons.models import ConvictedPerson
+from sentences.models import Sentence, Fraction
+
+
+def _sentence_queryset(options):
+    sentences = Sentence.objects.order_by('pk')
+    if options['status']:
+        sentences = sentences.filter(status__in=options['status'])
+    if options['since']:
+        sentences = sentences.filter(updated_at__date__gte=options['since'])
+    return sentences
+
+
+def _init_worker():
+    django.setup()
+    # Conexiunile moștenite de la procesul părinte nu se pot partaja
+    connections.close_all()
+
+
+def _process_chunk(sentences, dry_run, stats, changes):
+    sentence_updates = []
+    fraction_creates = []
+    fraction_updates = []
+    stale_ids = []
+
+    for sentence in sentences:
+        try:
+            expected = sentence.compute_effective_duration()
+            if any(getattr(sentence, field) != value for field, value in expected.items()):
+                for field, value in expected.items():
+                    setattr(sentence, field, value)
+                sentence_updates.append(sentence)
+
+            old_dates = {f.pk: f.calculated_date for f in sentence.fractions.all()}
+            to_create, to_update, stale = sentence.plan_fraction_changes(sentence.fractions.all())
+        except Exception as e:
+            stats['errors'] += 1
+            changes.append(f'ERROR - Sentence ID: {sentence.id}: {e}')
+            continue
+
+        if dry_run:
+            for fraction in to_update:
+                changes.append(
+                    f'Sentence ID: {sentence.id} {fraction.fraction_type}: '
+                    f'{old_dates[fraction.pk]} -> {fraction.calculated_date}'
+                )
+            for fraction in to_create:
+                changes.append(
+                    f'Sentence ID: {sentence.id} {fraction.fraction_type}: '
+                    f'(lipsă) -> {fraction.calculated_date}'
+                )
+
+        fraction_creates.extend(to_create)
+        fraction_updates.extend(to_update)
+        stale_ids.extend(stale)
+
+    stats['processed'] += len(sentences)
+    stats['sentences_updated'] += len(sentence_updates)
+    stats['fractions_created'] += len(fraction_creates)
+    stats['fractions_updated'] += len(fraction_updates)
+    stats['fractions_deleted'] += len(stale_ids)
+
+    if dry_run:
+        return
+
+    with transaction.atomic():
+        if sentence_updates:
+            Sentence.objects.bulk_update(sentence_updates, Sentence.EFFECTIVE_DURATION_FIELDS)
+            ConvictedPerson.objects.filter(
+                pk__in={sentence.person_id for sentence in sentence_updates}
+            ).refresh_active_sentence_end_date()
+        if stale_ids:
+            Fraction.objects.filter(pk__in=stale_ids).delete()
+        if fraction_creates:
+            Fraction.objects.bulk_create(fraction_creates)
+        if fraction_updates:
+            Fraction.objects.bulk_update(fraction_updates, ['calculated_date', 'updated_at'])
+        invalidate_dashboard_kpis()
+
+
+def _process_range(bounds, options):
+    """Recalculează sentințele cu pk în intervalul [first, last] (toate dacă bounds e None)."""
+    stats = {
+        'processed': 0,
+        'sentences_updated': 0,
+        'fractions_created': 0,
+        'fractions_updated': 0,
+        'fractions_deleted': 0,
+        'errors': 0,
+    }
+    changes = []
+
+    sentences = _sentence_queryset(options).prefetch_related(
+        'reductions', 'preventive_arrests', 'zpm_entries', 'fractions'
+    )
+    if bounds is not None:
+        sentences = sentences.filter(pk__gte=bounds[0], pk__lte=bounds[1])
+
+    chunk_size = options['chunk_size']
+    chunk = []
+    for sentence in sentences.iterator(chunk_size=chunk_size):
+        chunk.append(sentence)
+        if len(chunk) >= chunk_size:
+            _process_chunk(chunk, options['dry_run'], stats, changes)
+            chunk = []
+    if chunk:
+        _process_chunk(chunk, options['dry_run'], stats, changes)
+
+    return stats, changes
 
 
 class Command(BaseCommand):
-    help = 'Recalculate fractions for all existing sentences'
+    help = 'Recalculate effective duration and fractions for existing sentences'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of worker processes (sentences are split by id range)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Sentences loaded and written per batch',
+        )
+        parser.add_argument(
+            '--since',
+            type=date.fromisoformat,
+            help='Only sentences updated on or after this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--status',
+            action='append',
+            choices=Sentence.Status.values,
+            help='Only sentences with this status (can be repeated)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report fraction dates that would change, do not write anything',
+        )
 
     def handle(self, *args, **options):
-        sentences = Sentence.objects.all()
-        total = sentences.count()
+        workers = options['workers']
+        if workers < 1:
+            raise CommandError('--workers must be at least 1')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+
+        # Doar opțiunile folosite de workeri (trebuie să poată fi serializate)
+        options = {key: options[key] for key in ('status', 'since', 'chunk_size', 'dry_run')}
+        started = time.monotonic()
+
+        if workers == 1:
+            results = [_process_range(None, options)]
+        else:
+            results = self._run_parallel(workers, options)
+
+        totals = {}
+        for stats, changes in results:
+            for line in changes:
+                self.stdout.write(line)
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
 
-        print(f'Found {total} sentences to recalculate...')
+        elapsed = time.monotonic() - started
+        rate = totals.get('processed', 0) / elapsed if elapsed else 0
+        prefix = 'Dry run' if options['dry_run'] else 'Done'
+        self.stdout.write(
+            f"{prefix}! Processed: {totals.get('processed', 0)}, "
+            f"Sentences updated: {totals.get('sentences_updated', 0)}, "
+            f"Fractions created: {totals.get('fractions_created', 0)}, "
+            f"updated: {totals.get('fractions_updated', 0)}, "
+            f"deleted: {totals.get('fractions_deleted', 0)}, "
+            f"Errors: {totals.get('errors', 0)} "
+            f"({elapsed:.1f}s, {rate:.0f} sentences/s)"
+        )
 
-        success_count = 0
-        error_count = 0
+    def _run_parallel(self, workers, options):
+        pks = list(_sentence_queryset(options).values_list('pk', flat=True))
+        if not pks:
+            return []
 
-        for i, sentence in enumerate(sentences, 1):
-            try:
-                sentence.generate_fractions()
-                success_count += 1
-                print(f'[{i}/{total}] OK - Sentence ID: {sentence.id}')
-            except Exception as e:
-                error_count += 1
-                print(f'[{i}/{total}] ERROR - Sentence ID: {sentence.id}: {e}')
+        size = -(-len(pks) // workers)
+        ranges = [(pks[i], pks[min(i + size, len(pks)) - 1]) for i in range(0, len(pks), size)]
 
-        print(f'Done! Success: {success_count}, Errors: {error_count}')
+        # Procesele copil nu trebuie să moștenească conexiunile deschise
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=len(ranges), initializer=_init_worker) as pool:
+            futures = [pool.submit(_process_range, bounds, options) for bounds in ranges]
+            return [future.result() for future in futures]
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from sentences.models import Sentence
+
+
+class Command(BaseCommand):
+    help = 'Verify/backfill the stored effective duration columns of sentences'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report mismatches, do not write anything',
+        )
+
+    def handle(self, *args, **options):
+        check_only = options['check']
+        sentences = Sentence.objects.prefetch_related('reductions', 'preventive_arrests', 'zpm_entries')
+
+        checked = 0
+        mismatched = 0
+        for sentence in sentences.iterator(chunk_size=500):
+            checked += 1
+            expected = sentence.compute_effective_duration()
+            diff = {
+                field: (getattr(sentence, field), value)
+                for field, value in expected.items()
+                if getattr(sentence, field) != value
+            }
+            if not diff:
+                continue
+
+            mismatched += 1
+            details = ', '.join(f'{field}: {old} -> {new}' for field, (old, new) in diff.items())
+            self.stdout.write(f'MISMATCH - Sentence ID: {sentence.id}: {details}')
+            if not check_only:
+                for field, value in expected.items():
+                    setattr(sentence, field, value)
+                sentence.save(update_fields=Sentence.EFFECTIVE_DURATION_FIELDS)
+
+        action = 'found' if check_only else 'fixed'
+        self.stdout.write(f'Done! Checked: {checked}, Mismatches {action}: {mismatched}')
@@ -0,0 +1,101 @@
+# Generated by Django 5.0.1
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_effective_duration(apps, schema_editor):
+    """Populeaza coloanele materializate pentru sentintele existente."""
+    from sentences.calculations import (
+        calculate_end_date, calculate_reduced_end_date, calculate_duration,
+    )
+
+    Sentence = apps.get_model('sentences', 'Sentence')
+    sentences = Sentence.objects.prefetch_related('reductions', 'preventive_arrests', 'zpm_entries')
+
+    for sentence in sentences.iterator(chunk_size=500):
+        reductions = sorted(
+            sentence.reductions.all(),
+            key=lambda r: (r.applied_date, r.created_at),
+            reverse=True,
+        )
+        pa_days = sum((pa.end_date - pa.start_date).days for pa in sentence.preventive_arrests.all())
+        zpm_days = int(sum((z.days for z in sentence.zpm_entries.all()), Decimal('0.00')))
+
+        end_date = calculate_end_date(
+            sentence.start_date, sentence.sentence_years,
+            sentence.sentence_months, sentence.sentence_days,
+        )
+        reduced_end = calculate_reduced_end_date(
+            end_date,
+            [(r.reduction_years, r.reduction_months, r.reduction_days) for r in reductions],
+        )
+        effective_end = reduced_end - timedelta(days=pa_days + zpm_days)
+
+        sentence.total_reduction_days = sum(
+            r.reduction_years * 365 + r.reduction_months * 30 + r.reduction_days for r in reductions
+        )
+        sentence.total_preventive_arrest_days = pa_days
+        sentence.total_zpm_days = zpm_days
+        sentence.effective_end_date = effective_end
+        (
+            sentence.effective_years,
+            sentence.effective_months,
+            sentence.effective_days,
+        ) = calculate_duration(sentence.start_date, effective_end)
+        sentence.save(update_fields=[
+            'total_reduction_days', 'total_preventive_arrest_days', 'total_zpm_days',
+            'effective_end_date', 'effective_years', 'effective_months', 'effective_days',
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sentences', '0006_add_finished_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sentence',
+            name='effective_days',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Zile efective'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='effective_end_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Data efectivă de eliberare'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='effective_months',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Luni efective'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='effective_years',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Ani efectivi'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='total_preventive_arrest_days',
+            field=models.PositiveIntegerField(default=0, verbose_name='Total zile arest preventiv'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='total_reduction_days',
+            field=models.PositiveIntegerField(default=0, verbose_name='Total zile reduse'),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='total_zpm_days',
+            field=models.PositiveIntegerField(default=0, verbose_name='Total zile ZPM'),
+        ),
+        migrations.AddIndex(
+            model_name='sentence',
+            index=models.Index(fields=['effective_end_date'], name='sentences_s_effecti_a907a5_idx'),
+        ),
+        migrations.RunPython(backfill_effective_duration, migrations.RunPython.noop),
+    ]
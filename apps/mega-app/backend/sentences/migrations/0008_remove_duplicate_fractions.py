@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1
+
+from django.db import migrations
+
+
+def remove_duplicate_fractions(apps, schema_editor):
+    """Păstrează câte o singură fracție per (sentință, tip) - cea mai veche."""
+    Fraction = apps.get_model('sentences', 'Fraction')
+    seen = set()
+    duplicate_ids = []
+    for fraction_id, sentence_id, fraction_type in (
+        Fraction.objects.order_by('created_at').values_list('id', 'sentence_id', 'fraction_type').iterator()
+    ):
+        key = (sentence_id, fraction_type)
+        if key in seen:
+            duplicate_ids.append(fraction_id)
+        else:
+            seen.add(key)
+    if duplicate_ids:
+        Fraction.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0001_initial'),
+        ('sentences', '0007_sentence_effective_duration'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_fractions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sentences', '0008_remove_duplicate_fractions'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='fraction',
+            unique_together={('sentence', 'fraction_type')},
+        ),
+    ]
@@ -1,12 +1,17 @@
 import uuid
+from datetime import timedelta
+from decimal import Decimal
+
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
-from dateutil.relativedelta import relativedelta
 
+from config.transactions import on_commit_once
 from .calculations import (
     calculate_fraction_date,
     calculate_end_date,
+    calculate_reduced_end_date,
+    calculate_duration,
     calculate_total_days,
     FRACTION_TYPES,
     SERIOUS_CRIMES,
@@ -80,6 +85,39 @@ class Sentence(models.Model):
         blank=True,
         verbose_name='Note'
     )
+
+    # Durata efectivă materializată - actualizată la fiecare modificare a
+    # reducerilor, arestului preventiv sau ZPM (vezi apply_*_change).
+    total_reduction_days = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Total zile reduse'
+    )
+    total_preventive_arrest_days = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Total zile arest preventiv'
+    )
+    total_zpm_days = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Total zile ZPM'
+    )
+    effective_end_date = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='Data efectivă de eliberare'
+    )
+    effective_years = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Ani efectivi'
+    )
+    effective_months = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Luni efective'
+    )
+    effective_days = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Zile efective'
+    )
+
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -98,8 +136,22 @@ class Sentence(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['start_date']),
             models.Index(fields=['crime_type']),
+            models.Index(fields=['effective_end_date']),
         ]
 
+    # Câmpuri din care derivă ConvictedPerson.active_sentence_end_date
+    PERSON_SUMMARY_FIELDS = frozenset(['person', 'status', 'start_date', 'effective_end_date'])
+
+    EFFECTIVE_DURATION_FIELDS = [
+        'total_reduction_days',
+        'total_preventive_arrest_days',
+        'total_zpm_days',
+        'effective_end_date',
+        'effective_years',
+        'effective_months',
+        'effective_days',
+    ]
+
     def __str__(self):
         duration = f"{self.sentence_years}a {self.sentence_months}l {self.sentence_days}z"
         return f"{self.person.full_name} - {self.get_crime_type_display()} ({duration})"
@@ -140,35 +192,9 @@ class Sentence(models.Model):
             parts.append(f"{self.sentence_days} {'zi' if self.sentence_days == 1 else 'zile'}")
         return ', '.join(parts) if parts else '0 zile'
 
-    @property
-    def total_reduction_days(self):
-        """Total zile reduse din toate reducerile (pentru afișare)."""
-        total = 0
-        for r in self.reductions.all():
-            total += (r.reduction_years * 365) + (r.reduction_months * 30) + r.reduction_days
-        return total
-
-    @property
-    def total_preventive_arrest_days(self):
-        """Total zile de arest preventiv."""
-        total = 0
-        for pa in self.preventive_arrests.all():
-            total += (pa.end_date - pa.start_date).days
-        return total
-
-    @property
-    def total_zpm_days(self):
-        """Total ZPM zile (partea întreagă din suma tuturor zilelor ZPM)."""
-        from decimal import Decimal
-        total = Decimal('0.00')
-        for zpm in self.zpm_entries.all():
-            total += zpm.days
-        return int(total)
-
     @property
     def total_zpm_days_raw(self):
         """Total ZPM zile ca număr zecimal (pentru afișare)."""
-        from decimal import Decimal
         total = Decimal('0.00')
         for zpm in self.zpm_entries.all():
             total += zpm.days
@@ -179,44 +205,111 @@ class Sentence(models.Model):
         """Total zile efective după reduceri, arest preventiv și ZPM."""
         return max(0, self.total_days - self.total_reduction_days - self.total_preventive_arrest_days - self.total_zpm_days)
 
-    @property
-    def effective_end_date(self):
-        """Data efectivă de eliberare după reduceri.
+    def compute_effective_duration(self):
+        """Calculează durata efectivă parcurgând reducerile, arestul preventiv și ZPM.
 
-        Scade fiecare reducere direct din data de sfârșit a sentinței
-        folosind relativedelta pentru precizie calendaristică.
-        De asemenea scade zilele de arest preventiv.
+        Este logica de referință pentru coloanele materializate: scade fiecare
+        reducere din data de sfârșit (calendar_engine), apoi zilele de arest
+        preventiv și partea întreagă din ZPM. Nu salvează nimic.
         """
-        end = self.end_date
-        for r in self.reductions.all():
-            end = end - relativedelta(
-                years=r.reduction_years,
-                months=r.reduction_months,
-                days=r.reduction_days
-            )
-        # Scade zilele de arest preventiv
-        end = end - relativedelta(days=self.total_preventive_arrest_days)
-        # Scade zilele ZPM (doar partea întreagă)
-        end = end - relativedelta(days=self.total_zpm_days)
-        return end
+        reductions = list(self.reductions.all())
+        preventive_arrest_days = sum(pa.days for pa in self.preventive_arrests.all())
+        zpm_days = int(sum((zpm.days for zpm in self.zpm_entries.all()), Decimal('0.00')))
 
-    @property
-    def effective_years(self):
-        """Ani efectivi după reduceri (din diferența între start și effective_end_date)."""
-        delta = relativedelta(self.effective_end_date, self.start_date)
-        return max(0, delta.years)
+        reduced_end = calculate_reduced_end_date(
+            self.end_date,
+            [(r.reduction_years, r.reduction_months, r.reduction_days) for r in reductions]
+        )
+        effective_end = reduced_end - timedelta(days=preventive_arrest_days + zpm_days)
+        years, months, days = calculate_duration(self.start_date, effective_end)
+
+        return {
+            'total_reduction_days': sum(r.total_reduction_days for r in reductions),
+            'total_preventive_arrest_days': preventive_arrest_days,
+            'total_zpm_days': zpm_days,
+            'effective_end_date': effective_end,
+            'effective_years': years,
+            'effective_months': months,
+            'effective_days': days,
+        }
+
+    def _forget_prefetched(self, *relations):
+        """Invalidează relațiile preîncărcate modificate în afara instanței."""
+        cache = getattr(self, '_prefetched_objects_cache', None)
+        if cache:
+            for relation in relations:
+                cache.pop(relation, None)
+
+    def _set_effective_end_date(self, effective_end):
+        self.effective_end_date = effective_end
+        self.effective_years, self.effective_months, self.effective_days = calculate_duration(
+            self.start_date, effective_end
+        )
 
-    @property
-    def effective_months(self):
-        """Luni efective după reduceri."""
-        delta = relativedelta(self.effective_end_date, self.start_date)
-        return max(0, delta.months)
+    def _save_effective_duration(self):
+        self.save(update_fields=self.EFFECTIVE_DURATION_FIELDS + ['updated_at'])
 
-    @property
-    def effective_days(self):
-        """Zile efective după reduceri."""
-        delta = relativedelta(self.effective_end_date, self.start_date)
-        return max(0, delta.days)
+    def refresh_effective_duration(self, save=True):
+        """Recalculează complet coloanele materializate din relații."""
+        self._forget_prefetched('reductions', 'preventive_arrests', 'zpm_entries')
+        for field, value in self.compute_effective_duration().items():
+            setattr(self, field, value)
+        if save:
+            self._save_effective_duration()
+
+    def apply_reductions_change(self):
+        """Reducerile s-au modificat: reface doar lanțul de reduceri.
+
+        Arestul preventiv și ZPM sunt simple scăderi de zile, deci se refolosesc
+        totalurile deja stocate.
+        """
+        if self.effective_end_date is None:
+            return self.refresh_effective_duration()
+
+        self._forget_prefetched('reductions')
+        reductions = list(self.reductions.all())
+        self.total_reduction_days = sum(r.total_reduction_days for r in reductions)
+        reduced_end = calculate_reduced_end_date(
+            self.end_date,
+            [(r.reduction_years, r.reduction_months, r.reduction_days) for r in reductions]
+        )
+        self._set_effective_end_date(
+            reduced_end - timedelta(days=self.total_preventive_arrest_days + self.total_zpm_days)
+        )
+        self._save_effective_duration()
+
+    def apply_preventive_arrest_change(self, delta_days):
+        """Arestul preventiv s-a modificat cu `delta_days` zile (pozitiv la adăugare).
+
+        Delta se aplică pe valorile din instanță, deci rândul trebuie citit cu
+        select_for_update în tranzacția curentă (vezi SentenceViewSet.ROW_LOCK_ACTIONS).
+        """
+        if self.effective_end_date is None:
+            return self.refresh_effective_duration()
+
+        self._forget_prefetched('preventive_arrests')
+        if not delta_days:
+            return
+        self.total_preventive_arrest_days += delta_days
+        self._set_effective_end_date(self.effective_end_date - timedelta(days=delta_days))
+        self._save_effective_duration()
+
+    def apply_zpm_change(self):
+        """ZPM s-a modificat: recitește suma zilelor (o agregare) și ajustează data.
+
+        Ca la apply_preventive_arrest_change, rândul trebuie să fie blocat.
+        """
+        if self.effective_end_date is None:
+            return self.refresh_effective_duration()
+
+        self._forget_prefetched('zpm_entries')
+        total = self.zpm_entries.aggregate(total=models.Sum('days'))['total'] or Decimal('0.00')
+        delta_days = int(total) - self.total_zpm_days
+        if not delta_days:
+            return
+        self.total_zpm_days += delta_days
+        self._set_effective_end_date(self.effective_end_date - timedelta(days=delta_days))
+        self._save_effective_duration()
 
     @property
     def effective_duration_display(self):
@@ -230,41 +323,124 @@ class Sentence(models.Model):
             parts.append(f"{self.effective_days} {'zi' if self.effective_days == 1 else 'zile'}")
         return ', '.join(parts) if parts else '0 zile'
 
-    def generate_fractions(self):
-        """Generate or regenerate fractions for this sentence using effective duration."""
-        # Delete existing fractions
-        self.fractions.all().delete()
-
-        # Use effective duration (after reductions)
-        effective_years = self.effective_years
-        effective_months = self.effective_months
-        effective_days = self.effective_days
-
-        # Generate new fractions based on effective duration
-        for frac_info in FRACTION_TYPES:
-            calculated_date = calculate_fraction_date(
+    def compute_fraction_dates(self):
+        """Datele fracțiilor pe baza duratei efective, indexate după fraction_type."""
+        return {
+            frac_info['type']: calculate_fraction_date(
                 self.start_date,
-                effective_years,
-                effective_months,
-                effective_days,
+                self.effective_years,
+                self.effective_months,
+                self.effective_days,
                 frac_info['numerator'],
-                frac_info['denominator']
+                frac_info['denominator'],
             )
+            for frac_info in FRACTION_TYPES
+        }
 
-            Fraction.objects.create(
-                sentence=self,
-                fraction_type=frac_info['type'],
-                calculated_date=calculated_date,
-                description=frac_info['description'],
-            )
+    def plan_fraction_changes(self, fractions):
+        """Compară fracțiile existente cu cele calculate din durata efectivă.
+
+        Nu scrie nimic; întoarce (to_create, to_update, stale_ids). Fracțiile din
+        to_update au deja noua calculated_date setată.
+        """
+        existing = {}
+        stale_ids = []
+        for fraction in fractions:
+            if fraction.fraction_type in existing:
+                stale_ids.append(fraction.pk)
+            else:
+                existing[fraction.fraction_type] = fraction
+
+        calculated_dates = self.compute_fraction_dates()
+        to_create = []
+        to_update = []
+        now = timezone.now()
+        for frac_info in FRACTION_TYPES:
+            calculated_date = calculated_dates[frac_info['type']]
+            fraction = existing.pop(frac_info['type'], None)
+            if fraction is None:
+                to_create.append(Fraction(
+                    sentence=self,
+                    fraction_type=frac_info['type'],
+                    calculated_date=calculated_date,
+                    description=frac_info['description'],
+                ))
+            elif fraction.calculated_date != calculated_date:
+                fraction.calculated_date = calculated_date
+                fraction.updated_at = now
+                to_update.append(fraction)
+
+        # Tipuri de fracții care nu mai sunt definite
+        stale_ids.extend(fraction.pk for fraction in existing.values())
+        return to_create, to_update, stale_ids
+
+    def generate_fractions(self):
+        """Sincronizează fracțiile cu durata efectivă (upsert după fraction_type).
+
+        Rândurile existente își păstrează id-ul, is_fulfilled și notele; se
+        scriu doar fracțiile a căror dată s-a schimbat.
+        """
+        to_create, to_update, stale_ids = self.plan_fraction_changes(
+            Fraction.objects.filter(sentence=self)
+        )
+        if stale_ids:
+            Fraction.objects.filter(pk__in=stale_ids).delete()
+        if to_create:
+            Fraction.objects.bulk_create(to_create)
+        if to_update:
+            Fraction.objects.bulk_update(to_update, ['calculated_date', 'updated_at'])
+        if to_create or to_update:
+            # bulk_create / bulk_update nu trimit semnale
+            from persons.dashboard import invalidate_dashboard_kpis
+            invalidate_dashboard_kpis()
+        self._forget_prefetched('fractions')
+
+    def schedule_fraction_regeneration(self):
+        """Recalculează fracțiile la commit-ul tranzacției curente.
+
+        Apelurile repetate pentru aceeași sentință în aceeași tranzacție se
+        comasează într-o singură regenerare. În afara unei tranzacții
+        regenerarea rulează imediat.
+        """
+        regeneration = on_commit_once(('fraction_regeneration', self.pk), lambda: _FractionRegeneration(self))
+        if regeneration is None:
+            self.generate_fractions()
+        else:
+            regeneration.sentence = self
 
     def save(self, *args, **kwargs):
         is_new = self._state.adding
+        if is_new and self.effective_end_date is None:
+            # Sentință nouă: fără reduceri, durata efectivă este cea nominală
+            self._set_effective_end_date(self.end_date)
         super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or self.PERSON_SUMMARY_FIELDS.intersection(update_fields):
+            self.refresh_person_summary()
         # Auto-generate fractions on creation or when sentence duration changes
         if is_new:
             self.generate_fractions()
 
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.refresh_person_summary()
+        return result
+
+    def refresh_person_summary(self):
+        """Actualizează câmpurile denormalizate ale persoanei (data de sfârșit activă)."""
+        from persons.models import ConvictedPerson
+        ConvictedPerson.objects.filter(pk=self.person_id).refresh_active_sentence_end_date()
+
+
+class _FractionRegeneration:
+    """Callback on_commit pentru o sentință."""
+
+    def __init__(self, sentence):
+        self.sentence = sentence
+
+    def __call__(self):
+        self.sentence.generate_fractions()
+
 
 class SentenceReduction(models.Model):
     """Reducere de pedeapsă conform articolelor legale."""
@@ -459,6 +635,7 @@ class Fraction(models.Model):
         verbose_name = 'Fracție'
         verbose_name_plural = 'Fracții'
         ordering = ['calculated_date']
+        unique_together = [['sentence', 'fraction_type']]
         indexes = [
             models.Index(fields=['calculated_date']),
             models.Index(fields=['is_fulfilled']),
@@ -282,8 +282,9 @@ class SentenceUpdateSerializer(serializers.ModelSerializer):
 
         instance = super().update(instance, validated_data)
 
-        # Regenerate fractions if duration changed
+        # Refresh effective duration and regenerate fractions if duration changed
         if duration_changed:
-            instance.generate_fractions()
+            instance.refresh_effective_duration()
+            instance.schedule_fraction_regeneration()
 
         return instance
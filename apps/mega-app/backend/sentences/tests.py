@@ -1,6 +1,15 @@
+from django.core.management import call_command
+from django.db import transaction
 from django.test import TestCase
 from datetime import date
+from io import StringIO
+import random
+from decimal import Decimal
+from dateutil.relativedelta import relativedelta
+from .calendar_engine import add_duration, duration_between
 from .calculations import calculate_fraction_date, calculate_end_date, calculate_total_days
+from .models import Sentence, SentenceReduction, PreventiveArrest, ZPM, Fraction, _FractionRegeneration
+from persons.models import ConvictedPerson
 
 
 class FractionCalculationTests(TestCase):
@@ -66,3 +75,196 @@ class FractionCalculationTests(TestCase):
         # Should be approximately 6 months from start
         self.assertTrue(result > start_date)
         self.assertTrue(result < date(2024, 12, 31))
+
+
+class EffectiveDurationTests(TestCase):
+    def setUp(self):
+        person = ConvictedPerson.objects.create(first_name='Ion', last_name='Popescu')
+        self.sentence = Sentence.objects.create(
+            person=person,
+            crime_type=Sentence.CrimeType.FURT,
+            sentence_years=3,
+            sentence_months=2,
+            sentence_days=10,
+            start_date=date(2024, 1, 31),
+        )
+
+    def assertStoredMatchesComputed(self):
+        sentence = Sentence.objects.get(pk=self.sentence.pk)
+        expected = sentence.compute_effective_duration()
+        for field, value in expected.items():
+            self.assertEqual(getattr(sentence, field), value, field)
+
+    def test_new_sentence_uses_nominal_end_date(self):
+        self.assertEqual(self.sentence.effective_end_date, self.sentence.end_date)
+        self.assertEqual(
+            (self.sentence.effective_years, self.sentence.effective_months, self.sentence.effective_days),
+            (3, 2, 10),
+        )
+        self.assertStoredMatchesComputed()
+
+    def test_incremental_updates_match_full_recompute(self):
+        sentence = self.sentence
+        SentenceReduction.objects.create(
+            sentence=sentence, legal_article='art. 96', reduction_months=1,
+            reduction_days=5, applied_date=date(2024, 6, 1),
+        )
+        sentence.apply_reductions_change()
+        self.assertStoredMatchesComputed()
+
+        pa = PreventiveArrest.objects.create(
+            sentence=sentence, start_date=date(2023, 10, 1), end_date=date(2023, 12, 15),
+        )
+        sentence.apply_preventive_arrest_change(pa.days)
+        self.assertStoredMatchesComputed()
+
+        ZPM.objects.create(sentence=sentence, month=2, year=2024, days=Decimal('7.50'))
+        ZPM.objects.create(sentence=sentence, month=3, year=2024, days=Decimal('8.75'))
+        sentence.apply_zpm_change()
+        self.assertStoredMatchesComputed()
+        self.assertEqual(sentence.total_zpm_days, 16)
+
+        removed_days = pa.days
+        pa.delete()
+        sentence.apply_preventive_arrest_change(-removed_days)
+        self.assertStoredMatchesComputed()
+
+
+class FractionRegenerationTests(TestCase):
+    def setUp(self):
+        person = ConvictedPerson.objects.create(first_name='Ion', last_name='Popescu')
+        self.sentence = Sentence.objects.create(
+            person=person,
+            crime_type=Sentence.CrimeType.FURT,
+            sentence_years=6,
+            start_date=date(2024, 1, 1),
+        )
+
+    def test_regeneration_keeps_rows_and_state(self):
+        fraction = self.sentence.fractions.get(fraction_type='1/3')
+        fraction.is_fulfilled = True
+        fraction.notes = 'verificat'
+        fraction.save()
+        ids_before = set(self.sentence.fractions.values_list('id', flat=True))
+
+        SentenceReduction.objects.create(
+            sentence=self.sentence, legal_article='art. 96', reduction_months=6,
+            applied_date=date(2024, 6, 1),
+        )
+        self.sentence.apply_reductions_change()
+        self.sentence.generate_fractions()
+
+        self.assertEqual(set(self.sentence.fractions.values_list('id', flat=True)), ids_before)
+        fraction.refresh_from_db()
+        self.assertTrue(fraction.is_fulfilled)
+        self.assertEqual(fraction.notes, 'verificat')
+        expected = self.sentence.compute_fraction_dates()
+        for fraction in self.sentence.fractions.all():
+            self.assertEqual(fraction.calculated_date, expected[fraction.fraction_type])
+
+    def test_unchanged_dates_are_not_written(self):
+        # Doar SELECT-ul fracțiilor existente
+        with self.assertNumQueries(1):
+            self.sentence.generate_fractions()
+
+    def test_scheduled_regeneration_is_coalesced(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for month in (1, 2, 3):
+                ZPM.objects.create(sentence=self.sentence, month=month, year=2024, days=Decimal('10'))
+                self.sentence.apply_zpm_change()
+                self.sentence.schedule_fraction_regeneration()
+        # Pe lângă regenerare există și invalidarea indicatorilor dashboard-ului
+        callbacks = [callback for callback in callbacks if isinstance(callback.callback, _FractionRegeneration)]
+        self.assertEqual(len(callbacks), 1)
+
+        callbacks[0]()
+        expected = self.sentence.compute_fraction_dates()
+        self.assertEqual(Fraction.objects.filter(sentence=self.sentence).count(), 3)
+        for fraction in self.sentence.fractions.all():
+            self.assertEqual(fraction.calculated_date, expected[fraction.fraction_type])
+
+    def test_regeneration_from_rolled_back_savepoint_is_scheduled_again(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    self.sentence.schedule_fraction_regeneration()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            self.sentence.schedule_fraction_regeneration()
+        callbacks = [callback for callback in callbacks if isinstance(callback.callback, _FractionRegeneration)]
+        self.assertEqual(len(callbacks), 1)
+
+
+class RecalculateFractionsCommandTests(TestCase):
+    def setUp(self):
+        person = ConvictedPerson.objects.create(first_name='Ion', last_name='Popescu')
+        self.sentence = Sentence.objects.create(
+            person=person,
+            crime_type=Sentence.CrimeType.FURT,
+            sentence_years=4,
+            start_date=date(2024, 1, 1),
+        )
+        # Reducere adăugată fără recalculare (ca la datele vechi)
+        SentenceReduction.objects.create(
+            sentence=self.sentence, legal_article='art. 96', reduction_years=1,
+            applied_date=date(2024, 6, 1),
+        )
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('recalculate_fractions', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_reports_without_writing(self):
+        before = dict(self.sentence.fractions.values_list('fraction_type', 'calculated_date'))
+        output = self.call('--dry-run')
+        self.assertIn(str(self.sentence.id), output)
+        self.assertIn('Dry run! Processed: 1', output)
+        after = dict(self.sentence.fractions.values_list('fraction_type', 'calculated_date'))
+        self.assertEqual(before, after)
+
+    def test_recalculate_updates_duration_and_fractions(self):
+        output = self.call('--status', 'active', '--chunk-size', '1')
+        self.assertIn('Sentences updated: 1', output)
+        sentence = Sentence.objects.get(pk=self.sentence.pk)
+        self.assertEqual(sentence.effective_end_date, date(2026, 12, 31))
+        expected = sentence.compute_fraction_dates()
+        for fraction in sentence.fractions.all():
+            self.assertEqual(fraction.calculated_date, expected[fraction.fraction_type])
+
+        self.assertIn('Processed: 0', self.call('--status', 'finished'))
+
+
+class CalendarEngineTests(TestCase):
+    """Motorul calendaristic trebuie să reproducă exact relativedelta."""
+
+    def random_dates(self, rng, count):
+        first, last = date(1900, 1, 1).toordinal(), date(2100, 12, 31).toordinal()
+        # Includem des capete de lună, unde relativedelta face clamping
+        month_ends = [date(2024, 1, 31), date(2024, 2, 29), date(2023, 2, 28), date(2100, 3, 31)]
+        return [
+            rng.choice(month_ends) if rng.random() < 0.1 else date.fromordinal(rng.randint(first, last))
+            for _ in range(count)
+        ]
+
+    def test_add_duration_matches_relativedelta(self):
+        rng = random.Random(4)
+        for value in self.random_dates(rng, 5000):
+            years, months, days = rng.randint(-30, 30), rng.randint(-24, 24), rng.randint(-400, 400)
+            self.assertEqual(
+                add_duration(value, years, months, days),
+                value + relativedelta(years=years, months=months, days=days),
+                (value, years, months, days),
+            )
+
+    def test_duration_between_matches_relativedelta(self):
+        rng = random.Random(5)
+        for end, start in zip(self.random_dates(rng, 5000), self.random_dates(rng, 5000)):
+            delta = relativedelta(end, start)
+            self.assertEqual(duration_between(end, start), (delta.years, delta.months, delta.days), (end, start))
+
+    def test_outside_precomputed_range(self):
+        value = date(1750, 1, 31)
+        self.assertEqual(add_duration(value, 0, 1, 0), value + relativedelta(months=1))
+        self.assertEqual(duration_between(date(2500, 3, 1), value), (750, 1, 1))
@@ -5,6 +5,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.utils import timezone
 from django.conf import settings
 
@@ -45,11 +46,27 @@ class SentenceViewSet(viewsets.ModelViewSet):
         'crime_type': ['exact', 'in'],
         'person': ['exact'],
         'start_date': ['gte', 'lte'],
+        'effective_end_date': ['gte', 'lte', 'isnull'],
     }
     search_fields = ['person__first_name', 'person__last_name', 'crime_description']
-    ordering_fields = ['start_date', 'created_at', 'status']
+    ordering_fields = ['start_date', 'created_at', 'status', 'effective_end_date']
     ordering = ['-start_date']
 
+    # Acțiunile care ajustează cu delte totalurile și effective_end_date
+    ROW_LOCK_ACTIONS = {
+        'add_reduction', 'delete_reduction',
+        'add_preventive_arrest', 'update_preventive_arrest', 'delete_preventive_arrest',
+        'add_zpm', 'delete_zpm',
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.ROW_LOCK_ACTIONS:
+            # Rândul sentinței rămâne blocat până la commit, altfel două cereri
+            # simultane pornesc de la aceleași totaluri și una pierde delta celeilalte
+            queryset = queryset.select_for_update(of=('self',))
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'list':
             return SentenceListSerializer
@@ -100,6 +117,7 @@ class SentenceViewSet(viewsets.ModelViewSet):
     def recalculate(self, request, pk=None):
         """Force recalculate fractions for this sentence."""
         sentence = self.get_object()
+        sentence.refresh_effective_duration()
         sentence.generate_fractions()
         return Response({
             'message': 'Fracțiile au fost recalculate.',
@@ -141,6 +159,7 @@ class SentenceViewSet(viewsets.ModelViewSet):
         return Response(FractionSerializer(fraction).data)
 
     @action(detail=True, methods=['post'], url_path='reductions')
+    @transaction.atomic
     def add_reduction(self, request, pk=None):
         """Adaugă o reducere de pedeapsă."""
         sentence = self.get_object()
@@ -164,8 +183,9 @@ class SentenceViewSet(viewsets.ModelViewSet):
 
         reduction = serializer.save(sentence=sentence, created_by=request.user)
 
-        # Recalculăm fracțiile cu durata efectivă
-        sentence.generate_fractions()
+        # Actualizăm durata efectivă și recalculăm fracțiile
+        sentence.apply_reductions_change()
+        sentence.schedule_fraction_regeneration()
 
         # Audit log
         self._log_reduction_action('add_reduction', sentence, reduction)
@@ -173,6 +193,7 @@ class SentenceViewSet(viewsets.ModelViewSet):
         return Response(SentenceReductionSerializer(reduction).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['delete'], url_path='reductions/(?P<reduction_id>[^/.]+)')
+    @transaction.atomic
     def delete_reduction(self, request, pk=None, reduction_id=None):
         """Șterge o reducere de pedeapsă."""
         sentence = self.get_object()
@@ -187,8 +208,9 @@ class SentenceViewSet(viewsets.ModelViewSet):
         self._log_reduction_action('delete_reduction', sentence, reduction)
         reduction.delete()
 
-        # Recalculăm fracțiile
-        sentence.generate_fractions()
+        # Actualizăm durata efectivă și recalculăm fracțiile
+        sentence.apply_reductions_change()
+        sentence.schedule_fraction_regeneration()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -210,6 +232,7 @@ class SentenceViewSet(viewsets.ModelViewSet):
         )
 
     @action(detail=True, methods=['post'], url_path='preventive-arrests')
+    @transaction.atomic
     def add_preventive_arrest(self, request, pk=None):
         """Adaugă o perioadă de arest preventiv."""
         sentence = self.get_object()
@@ -232,8 +255,9 @@ class SentenceViewSet(viewsets.ModelViewSet):
 
         pa = serializer.save(sentence=sentence, created_by=request.user)
 
-        # Recalculăm fracțiile
-        sentence.generate_fractions()
+        # Actualizăm durata efectivă și recalculăm fracțiile
+        sentence.apply_preventive_arrest_change(pa.days)
+        sentence.schedule_fraction_regeneration()
 
         # Audit log
         self._log_preventive_arrest_action('add_preventive_arrest', sentence, pa)
@@ -241,6 +265,7 @@ class SentenceViewSet(viewsets.ModelViewSet):
         return Response(PreventiveArrestSerializer(pa).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['patch'], url_path='preventive-arrests/(?P<pa_id>[^/.]+)/update')
+    @transaction.atomic
     def update_preventive_arrest(self, request, pk=None, pa_id=None):
         """Editează o perioadă de arest preventiv."""
         sentence = self.get_object()
@@ -269,10 +294,12 @@ class SentenceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        old_days = pa.days
         serializer.save()
 
-        # Recalculăm fracțiile
-        sentence.generate_fractions()
+        # Actualizăm durata efectivă și recalculăm fracțiile
+        sentence.apply_preventive_arrest_change(pa.days - old_days)
+        sentence.schedule_fraction_regeneration()
 
         # Audit log
         after_data = make_json_serializable(PreventiveArrestSerializer(pa).data)
@@ -292,6 +319,7 @@ class SentenceViewSet(viewsets.ModelViewSet):
         return Response(PreventiveArrestSerializer(pa).data)
 
     @action(detail=True, methods=['delete'], url_path='preventive-arrests/(?P<pa_id>[^/.]+)')
+    @transaction.atomic
     def delete_preventive_arrest(self, request, pk=None, pa_id=None):
         """Șterge o perioadă de arest preventiv."""
         sentence = self.get_object()
@@ -304,10 +332,12 @@ class SentenceViewSet(viewsets.ModelViewSet):
             )
 
         self._log_preventive_arrest_action('delete_preventive_arrest', sentence, pa)
+        removed_days = pa.days
         pa.delete()
 
-        # Recalculăm fracțiile
-        sentence.generate_fractions()
+        # Actualizăm durata efectivă și recalculăm fracțiile
+        sentence.apply_preventive_arrest_change(-removed_days)
+        sentence.schedule_fraction_regeneration()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -329,6 +359,7 @@ class SentenceViewSet(viewsets.ModelViewSet):
         )
 
     @action(detail=True, methods=['post'], url_path='zpm')
+    @transaction.atomic
     def add_zpm(self, request, pk=None):
         """Adaugă o înregistrare ZPM."""
         sentence = self.get_object()
@@ -347,8 +378,9 @@ class SentenceViewSet(viewsets.ModelViewSet):
 
         zpm = serializer.save(sentence=sentence, created_by=request.user)
 
-        # Recalculăm fracțiile
-        sentence.generate_fractions()
+        # Actualizăm durata efectivă și recalculăm fracțiile
+        sentence.apply_zpm_change()
+        sentence.schedule_fraction_regeneration()
 
         # Audit log
         self._log_zpm_action('add_zpm', sentence, zpm)
@@ -356,6 +388,7 @@ class SentenceViewSet(viewsets.ModelViewSet):
         return Response(ZPMSerializer(zpm).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['delete'], url_path='zpm/(?P<zpm_id>[^/.]+)')
+    @transaction.atomic
     def delete_zpm(self, request, pk=None, zpm_id=None):
         """Șterge o înregistrare ZPM."""
         sentence = self.get_object()
@@ -370,8 +403,9 @@ class SentenceViewSet(viewsets.ModelViewSet):
         self._log_zpm_action('delete_zpm', sentence, zpm)
         zpm.delete()
 
-        # Recalculăm fracțiile
-        sentence.generate_fractions()
+        # Actualizăm durata efectivă și recalculăm fracțiile
+        sentence.apply_zpm_change()
+        sentence.schedule_fraction_regeneration()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+
+from persons.models import ConvictedPerson
+from persons.utils import person_name_key
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Leaga task-urile de persoanele condamnate dupa numele normalizat din titlu'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Reverifica si task-urile deja legate',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Doar afiseaza ce s-ar lega, fara a salva',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        # Persoane fara nume normalizat (ex. inserate in bulk)
+        missing = list(ConvictedPerson.objects.filter(normalized_name='').only('id', 'last_name', 'first_name'))
+        for person in missing:
+            person.normalized_name = person_name_key(person.last_name, person.first_name)
+        if missing and not dry_run:
+            ConvictedPerson.objects.bulk_update(missing, ['normalized_name'], batch_size=1000)
+
+        persons_by_name = {}
+        ambiguous = set()
+        for person_id, name in ConvictedPerson.objects.values_list('id', 'normalized_name').iterator():
+            if not name:
+                continue
+            if name in persons_by_name:
+                ambiguous.add(name)
+            persons_by_name[name] = person_id
+        for name in ambiguous:
+            del persons_by_name[name]
+
+        tasks = Task.objects.only('id', 'title', 'title_key', 'person')
+        if not options['all']:
+            tasks = tasks.filter(person__isnull=True)
+
+        to_update = []
+        unmatched = 0
+        for task in tasks.iterator():
+            person_id = persons_by_name.get(task.title_key)
+            if person_id is None:
+                unmatched += 1
+            elif person_id != task.person_id:
+                task.person_id = person_id
+                to_update.append(task)
+                if dry_run:
+                    self.stdout.write(f'{task.id}: "{task.title}" -> {person_id}')
+
+        if to_update and not dry_run:
+            Task.objects.bulk_update(to_update, ['person'], batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Task-uri legate: {len(to_update)}, fara potrivire: {unmatched}, '
+            f'nume ambigue ignorate: {len(ambiguous)}'
+        ))
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0007_convictedperson_normalized_name'),
+        ('tasks', '0005_task_csj_examinare'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='person',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tasks', to='persons.convictedperson'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1
+
+from django.db import migrations, models
+
+
+def fill_title_key(apps, schema_editor):
+    from persons.utils import normalize_name
+
+    Task = apps.get_model('tasks', 'Task')
+    batch = []
+    for task in Task.objects.only('id', 'title').iterator(chunk_size=1000):
+        task.title_key = normalize_name(task.title)
+        batch.append(task)
+        if len(batch) >= 1000:
+            Task.objects.bulk_update(batch, ['title_key'])
+            batch = []
+    if batch:
+        Task.objects.bulk_update(batch, ['title_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_person'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='title_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_title_key, migrations.RunPython.noop),
+    ]
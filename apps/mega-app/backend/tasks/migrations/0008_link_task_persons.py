@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1
+
+from django.db import migrations
+
+
+def link_task_persons(apps, schema_editor):
+    # Aceeași potrivire ca în comanda link_task_persons: doar nume unice
+    ConvictedPerson = apps.get_model('persons', 'ConvictedPerson')
+    Task = apps.get_model('tasks', 'Task')
+
+    persons_by_name = {}
+    ambiguous = set()
+    for person_id, name in ConvictedPerson.objects.values_list('id', 'normalized_name').iterator():
+        if not name:
+            continue
+        if name in persons_by_name:
+            ambiguous.add(name)
+        persons_by_name[name] = person_id
+    for name in ambiguous:
+        del persons_by_name[name]
+
+    batch = []
+    for task in Task.objects.filter(person__isnull=True).only('id', 'title_key').iterator(chunk_size=1000):
+        person_id = persons_by_name.get(task.title_key)
+        if person_id is None:
+            continue
+        task.person_id = person_id
+        batch.append(task)
+        if len(batch) >= 1000:
+            Task.objects.bulk_update(batch, ['person'])
+            batch = []
+    if batch:
+        Task.objects.bulk_update(batch, ['person'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0007_convictedperson_normalized_name'),
+        ('tasks', '0007_task_title_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_task_persons, migrations.RunPython.noop),
+    ]
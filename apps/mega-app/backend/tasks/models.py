@@ -21,6 +21,8 @@ class Task(models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=255)
+    # Titlul normalizat (persons.utils.normalize_name), comparat cu ConvictedPerson.normalized_name
+    title_key = models.CharField(max_length=255, blank=True, db_index=True, editable=False)
     description = models.TextField(blank=True)
     status = models.CharField(
         max_length=20,
@@ -47,6 +49,14 @@ class Task(models.Model):
         related_name='tasks'
     )
     csj_examinare = models.BooleanField(default=False, verbose_name='În examinare la CSJ')
+    # Persoana la care se referă task-ul (titlul are formatul "Nume Prenume")
+    person = models.ForeignKey(
+        'persons.ConvictedPerson',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='tasks'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -56,6 +66,38 @@ class Task(models.Model):
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Titlul încărcat, pentru a detecta redenumirile în save()
+        instance._loaded_title = instance.__dict__.get('title')
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'title' in update_fields:
+            from persons.utils import normalize_name
+
+            self.title_key = normalize_name(self.title)
+            extra_fields = {'title_key'}
+            title_changed = self.title != getattr(self, '_loaded_title', self.title)
+            if self.person_id is None or title_changed:
+                self.person = self.match_person()
+                extra_fields.add('person')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | extra_fields
+        super().save(*args, **kwargs)
+        self._loaded_title = self.title
+
+    def match_person(self):
+        """Persoana al cărei nume normalizat coincide cu titlul (doar dacă e unică)."""
+        from persons.models import ConvictedPerson
+
+        if not self.title_key:
+            return None
+        matches = list(ConvictedPerson.objects.filter(normalized_name=self.title_key)[:2])
+        return matches[0] if len(matches) == 1 else None
+
 
 class TaskActivity(models.Model):
     class ActionType(models.TextChoices):
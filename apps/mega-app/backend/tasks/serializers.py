@@ -51,6 +51,7 @@ class TaskSerializer(serializers.ModelSerializer):
             'assignee',
             'assignee_details',
             'csj_examinare',
+            'person',
             'created_at',
             'updated_at',
         ]
@@ -0,0 +1,56 @@
+from django.test import TestCase
+
+from persons.models import ConvictedPerson
+from .models import Task
+
+
+class TaskPersonLinkTests(TestCase):
+    def setUp(self):
+        self.popescu = ConvictedPerson.objects.create(last_name='Popescu', first_name='Ștefan')
+        self.ionescu = ConvictedPerson.objects.create(last_name='Ionescu', first_name='Ion')
+
+    def test_new_task_is_linked_by_title(self):
+        task = Task.objects.create(title='popescu  Stefan')
+        self.assertEqual(task.title_key, 'popescu stefan')
+        self.assertEqual(task.person, self.popescu)
+
+    def test_title_change_relinks_task(self):
+        task = Task.objects.create(title='Popescu Ștefan')
+        task = Task.objects.get(pk=task.pk)
+        task.title = 'Ionescu Ion'
+        task.save(update_fields=['title'])
+        task = Task.objects.get(pk=task.pk)
+        self.assertEqual((task.title_key, task.person), ('ionescu ion', self.ionescu))
+
+        task.title = 'Persoană necunoscută'
+        task.save()
+        self.assertIsNone(Task.objects.get(pk=task.pk).person)
+
+    def test_save_without_title_change_keeps_link(self):
+        task = Task.objects.create(title='Popescu Ștefan', person=self.ionescu)
+        task = Task.objects.get(pk=task.pk)
+        task.description = 'Verificare'
+        task.save()
+        self.assertEqual(Task.objects.get(pk=task.pk).person, self.ionescu)
+
+    def test_person_save_links_unlinked_tasks(self):
+        task = Task.objects.create(title='Rusu Vasile')
+        self.assertIsNone(task.person)
+
+        person = ConvictedPerson.objects.create(last_name='Rusu', first_name='Vasile')
+        self.assertEqual(Task.objects.get(pk=task.pk).person, person)
+
+    def test_person_rename_links_unlinked_tasks(self):
+        task = Task.objects.create(title='Ionescu Ioana')
+        self.ionescu.first_name = 'Ioana'
+        self.ionescu.save(update_fields=['first_name'])
+        self.assertEqual(Task.objects.get(pk=task.pk).person, self.ionescu)
+
+    def test_ambiguous_person_name_is_not_linked(self):
+        task = Task.objects.create(title='Rusu Vasile')
+        # Inserată în bulk (fără save), deci nu a legat task-ul
+        ConvictedPerson.objects.bulk_create([
+            ConvictedPerson(last_name='Rusu', first_name='Vasile', normalized_name='rusu vasile'),
+        ])
+        ConvictedPerson.objects.create(last_name='Rusu', first_name='Vasile')
+        self.assertIsNone(Task.objects.get(pk=task.pk).person)
@@ -19,7 +19,7 @@ class TaskFilter(FilterSet):
 
     class Meta:
         model = Task
-        fields = ['status', 'priority', 'category', 'assignee', 'tags', 'deadline_from', 'deadline_to']
+        fields = ['status', 'priority', 'category', 'assignee', 'person', 'tags', 'deadline_from', 'deadline_to']
 
     def filter_tags(self, queryset, name, value):
         if value:
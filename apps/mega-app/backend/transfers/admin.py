@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Transfer, TransferEntry
+from .models import Transfer, TransferEntry, TransferMonthlyRollup
 
 
 class TransferEntryInline(admin.TabularInline):
@@ -31,4 +31,23 @@ class TransferAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         if not change:
             obj.created_by = request.user
+        if change:
+            old = Transfer.objects.filter(pk=obj.pk).values_list('year', 'month').first()
+            obj._rollup_periods = [old] if old else []
         super().save_model(request, obj, form, change)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Admin-ul salvează rândurile prin inline, deci totalurile lunare se refac aici
+        obj = form.instance
+        periods = getattr(obj, '_rollup_periods', []) + [(obj.year, obj.month)]
+        TransferMonthlyRollup.objects.refresh_months(periods)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        TransferMonthlyRollup.objects.refresh_months([(obj.year, obj.month)])
+
+    def delete_queryset(self, request, queryset):
+        periods = list(queryset.values_list('year', 'month'))
+        super().delete_queryset(request, queryset)
+        TransferMonthlyRollup.objects.refresh_months(periods)
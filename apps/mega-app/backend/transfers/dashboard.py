@@ -0,0 +1,31 @@
+from django.utils import timezone
+
+from .models import Transfer, TransferMonthlyRollup
+
+
+def transfer_stats():
+    """Statistici KPI pentru dashboard (luna curentă și cea precedentă)."""
+    now = timezone.now()
+    cur_year, cur_month = now.year, now.month
+
+    if cur_month == 1:
+        prev_year, prev_month = cur_year - 1, 12
+    else:
+        prev_year, prev_month = cur_year, cur_month - 1
+
+    cur = TransferMonthlyRollup.objects.filter(year=cur_year, month=cur_month).totals()
+    prev = TransferMonthlyRollup.objects.filter(year=prev_year, month=prev_month).totals()
+
+    cv = cur['total_veniti']
+    cp = cur['total_plecati']
+    pv = prev['total_veniti']
+    pp = prev['total_plecati']
+
+    return {
+        'current_month_veniti': cv,
+        'current_month_plecati': cp,
+        'current_month_net': cv - cp,
+        'previous_month_veniti': pv,
+        'previous_month_plecati': pp,
+        'total_transfers': Transfer.objects.count(),
+    }
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from transfers.models import TransferMonthlyRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly transfer totals (TransferMonthlyRollup) from transfer entries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year',
+            type=int,
+            help='Only rebuild this year',
+        )
+
+    def handle(self, *args, **options):
+        year = options['year']
+        with transaction.atomic():
+            rows = TransferMonthlyRollup.objects.rebuild(year=year)
+        scope = f'year {year}' if year else 'all years'
+        self.stdout.write(f'Done! Rebuilt {len(rows)} rollup rows ({scope})')
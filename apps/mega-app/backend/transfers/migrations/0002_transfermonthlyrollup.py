@@ -0,0 +1,55 @@
+# Generated by Django 5.0.1
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+COUNTERS = ['veniti', 'veniti_reintorsi', 'veniti_noi', 'plecati', 'plecati_izolator']
+
+
+def fill_rollup(apps, schema_editor):
+    TransferEntry = apps.get_model('transfers', 'TransferEntry')
+    TransferMonthlyRollup = apps.get_model('transfers', 'TransferMonthlyRollup')
+    rows = TransferEntry.objects.order_by().values(
+        'transfer__year', 'transfer__month', 'penitentiary'
+    ).annotate(**{f'sum_{field}': Sum(field) for field in COUNTERS})
+    TransferMonthlyRollup.objects.bulk_create([
+        TransferMonthlyRollup(
+            year=row['transfer__year'],
+            month=row['transfer__month'],
+            penitentiary=row['penitentiary'],
+            **{field: row[f'sum_{field}'] or 0 for field in COUNTERS},
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transfers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransferMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='An')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Luna')),
+                ('penitentiary', models.PositiveSmallIntegerField(choices=[(1, 'Penitenciarul nr. 1'), (2, 'Penitenciarul nr. 2'), (3, 'Penitenciarul nr. 3'), (4, 'Penitenciarul nr. 4'), (5, 'Penitenciarul nr. 5'), (6, 'Penitenciarul nr. 6'), (7, 'Penitenciarul nr. 7'), (8, 'Penitenciarul nr. 8'), (9, 'Penitenciarul nr. 9'), (10, 'Penitenciarul nr. 10'), (11, 'Penitenciarul nr. 11 (Izolator)'), (12, 'Penitenciarul nr. 12'), (13, 'Penitenciarul nr. 13 (Izolator)'), (15, 'Penitenciarul nr. 15'), (16, 'Penitenciarul nr. 16'), (17, 'Penitenciarul nr. 17'), (18, 'Penitenciarul nr. 18')], verbose_name='Penitenciar')),
+                ('veniti', models.PositiveIntegerField(default=0, verbose_name='Veniti (total)')),
+                ('veniti_reintorsi', models.PositiveIntegerField(default=0, verbose_name='Veniti - reintorsi')),
+                ('veniti_noi', models.PositiveIntegerField(default=0, verbose_name='Veniti - noi')),
+                ('plecati', models.PositiveIntegerField(default=0, verbose_name='Plecati (total)')),
+                ('plecati_izolator', models.PositiveIntegerField(default=0, verbose_name='Plecati la izolator')),
+            ],
+            options={
+                'verbose_name': 'Total lunar transferuri',
+                'verbose_name_plural': 'Totaluri lunare transferuri',
+                'ordering': ['year', 'month', 'penitentiary'],
+                'unique_together': {('year', 'month', 'penitentiary')},
+            },
+        ),
+        migrations.RunPython(fill_rollup, migrations.RunPython.noop),
+    ]
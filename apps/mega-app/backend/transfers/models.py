@@ -1,5 +1,7 @@
 import uuid
-from django.db import models
+from django.db import connections, models
+from django.db.models import F, Q, Sum, Window
+from django.db.models.expressions import ValueRange
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
@@ -123,6 +125,8 @@ class TransferEntry(models.Model):
 
     # Observatii
     notes = models.TextField(blank=True, verbose_name='Observatii')
+    # Intră în versiunea exporturilor din cache (reports.export_cache)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'Rand transfer'
@@ -151,3 +155,161 @@ class TransferEntry(models.Model):
             errors['plecati_izolator'] = 'Plecati la izolator se completeaza doar pentru P-11 si P-13.'
         if errors:
             raise ValidationError(errors)
+
+
+ROLLUP_COUNTERS = ['veniti', 'veniti_reintorsi', 'veniti_noi', 'plecati', 'plecati_izolator']
+
+# Primul argument al pg_advisory_xact_lock pentru lunile din TransferMonthlyRollup
+ROLLUP_LOCK_KEY = 6016
+
+# Contoarele pentru care endpoint-ul de tendințe calculează seriile derivate
+TREND_COUNTERS = ['veniti', 'plecati']
+
+
+def month_index(year, month):
+    """Luna ca număr consecutiv (an * 12 + luna - 1), folosit ca cheie de ordonare."""
+    return year * 12 + month - 1
+
+
+class _MonthRange(ValueRange):
+    """
+    Fereastră RANGE cu decalaj în luni (ex. 2 PRECEDING = ultimele 3 luni),
+    corectă și când lipsesc luni. Django refuză decalajele RANGE pe
+    PostgreSQL, deși sunt suportate din PostgreSQL 11 (și SQLite 3.28).
+    """
+    def window_frame_start_end(self, connection, start, end):
+        return connection.ops.window_frame_rows_start_end(start, end)
+
+
+class TransferMonthlyRollupQuerySet(models.QuerySet):
+    def by_penitentiary(self):
+        """Sumele per penitenciar pentru perioada filtrată (ordonate după penitenciar)."""
+        return self.order_by().values('penitentiary').annotate(
+            **{f'total_{field}': Sum(field) for field in ROLLUP_COUNTERS}
+        ).order_by('penitentiary')
+
+    def totals(self):
+        return {
+            f'total_{field}': value or 0
+            for field, value in self.aggregate(**{field: Sum(field) for field in ROLLUP_COUNTERS}).items()
+        }
+
+    def trends(self, start, end):
+        """
+        Seriile lunare per penitenciar între lunile `start` și `end`
+        (month_index), calculate într-o singură interogare cu funcții fereastră:
+        pentru fiecare contor din TREND_COUNTERS - totalul cumulat din `start`,
+        diferența față de luna precedentă și suma pe ultimele 3 luni.
+
+        Se citesc și cele 2 luni dinaintea intervalului, ca primele diferențe și
+        medii să fie complete; rândurile cu period < start trebuie ignorate.
+        Lunile fără rând contează ca 0.
+        """
+        window = {'partition_by': [F('penitentiary')], 'order_by': F('period').asc()}
+        annotations = {}
+        for field in TREND_COUNTERS:
+            annotations[f'{field}_running'] = Window(Sum(field, filter=Q(period__gte=start)), **window)
+            # Suma lunii curente și a celei precedente minus luna curentă
+            annotations[f'{field}_delta'] = (
+                F(field) * 2 - Window(Sum(field), frame=_MonthRange(start=-1, end=0), **window)
+            )
+            annotations[f'{field}_sum3'] = Window(Sum(field), frame=_MonthRange(start=-2, end=0), **window)
+        return self.annotate(
+            period=F('year') * 12 + F('month') - 1,
+        ).filter(
+            # year folosește indexul unic (year, month, penitentiary)
+            year__gte=(start - 2) // 12, year__lte=end // 12,
+            period__gte=start - 2, period__lte=end,
+        ).annotate(**annotations).values(
+            'penitentiary', 'period', *TREND_COUNTERS, *annotations,
+        ).order_by('penitentiary', 'period')
+
+    def refresh_months(self, periods):
+        """Recalculează rândurile pentru lunile date ((an, lună), ...) din TransferEntry.
+
+        Apelat în aceeași tranzacție cu scrierea transferurilor. Pe PostgreSQL
+        fiecare lună se blochează (advisory lock până la commit), deci două
+        scrieri în aceeași lună se serializează: a doua recalculează după
+        commit-ul primei și vede rândurile ei.
+        """
+        periods = sorted(set(periods))
+        self._lock_months(periods)
+        for year, month in periods:
+            self.filter(year=year, month=month).delete()
+            self.bulk_create(self._aggregate_entries(
+                TransferEntry.objects.filter(transfer__year=year, transfer__month=month)
+            ))
+
+    def rebuild(self, year=None):
+        """Reconstruiește tot tabelul (sau doar un an). Trebuie apelat într-o tranzacție."""
+        self._lock_table()
+        entries = TransferEntry.objects.all()
+        existing = self.all()
+        if year is not None:
+            entries = entries.filter(transfer__year=year)
+            existing = existing.filter(year=year)
+        existing.delete()
+        return self.bulk_create(self._aggregate_entries(entries), batch_size=1000)
+
+    def _lock_months(self, periods):
+        connection = connections[self.db]
+        if connection.vendor != 'postgresql':
+            return
+        # Ordinea fixă a lunilor evită deadlock-urile între două actualizări
+        with connection.cursor() as cursor:
+            for year, month in periods:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [ROLLUP_LOCK_KEY, month_index(year, month)])
+
+    def _lock_table(self):
+        connection = connections[self.db]
+        if connection.vendor != 'postgresql':
+            return
+        # Blochează scrierile (refresh_months), nu și citirile, până la commit
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {connection.ops.quote_name(self.model._meta.db_table)} IN EXCLUSIVE MODE')
+
+    def _aggregate_entries(self, entries):
+        rows = entries.order_by().values('transfer__year', 'transfer__month', 'penitentiary').annotate(
+            **{f'sum_{field}': Sum(field) for field in ROLLUP_COUNTERS}
+        )
+        return [
+            self.model(
+                year=row['transfer__year'],
+                month=row['transfer__month'],
+                penitentiary=row['penitentiary'],
+                **{field: row[f'sum_{field}'] or 0 for field in ROLLUP_COUNTERS},
+            )
+            for row in rows
+        ]
+
+
+class TransferMonthlyRollup(models.Model):
+    """
+    Totalurile lunare per penitenciar, pre-agregate din TransferEntry.
+    Întreținut de serializerele de transfer (refresh_months) și reconstruibil
+    cu `manage.py rebuild_transfer_rollup`.
+    """
+    year = models.PositiveSmallIntegerField(verbose_name='An')
+    month = models.PositiveSmallIntegerField(verbose_name='Luna')
+    penitentiary = models.PositiveSmallIntegerField(
+        choices=Penitentiary.choices,
+        verbose_name='Penitenciar'
+    )
+
+    veniti = models.PositiveIntegerField(default=0, verbose_name='Veniti (total)')
+    veniti_reintorsi = models.PositiveIntegerField(default=0, verbose_name='Veniti - reintorsi')
+    veniti_noi = models.PositiveIntegerField(default=0, verbose_name='Veniti - noi')
+    plecati = models.PositiveIntegerField(default=0, verbose_name='Plecati (total)')
+    plecati_izolator = models.PositiveIntegerField(default=0, verbose_name='Plecati la izolator')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TransferMonthlyRollupQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Total lunar transferuri'
+        verbose_name_plural = 'Totaluri lunare transferuri'
+        ordering = ['year', 'month', 'penitentiary']
+        unique_together = [['year', 'month', 'penitentiary']]
+
+    def __str__(self):
+        return f"{self.get_penitentiary_display()} - {self.month:02d}.{self.year}"
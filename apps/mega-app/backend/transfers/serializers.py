@@ -1,7 +1,8 @@
 from rest_framework import serializers
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Sum
-from .models import Transfer, TransferEntry, Penitentiary, ISOLATOR_VALUES
+from django.utils import timezone
+from .models import Transfer, TransferEntry, TransferMonthlyRollup, Penitentiary, ISOLATOR_VALUES
 
 
 class TransferEntrySerializer(serializers.ModelSerializer):
@@ -124,6 +125,43 @@ class TransferEntryInputSerializer(serializers.Serializer):
         return data
 
 
+ENTRY_VALUE_FIELDS = ['veniti', 'veniti_reintorsi', 'veniti_noi', 'plecati', 'plecati_izolator', 'notes']
+
+
+def sync_entries(transfer, entries_data):
+    """Aduce entries transferului la lista dată, comparând după penitenciar.
+
+    Rândurile neschimbate nu se ating; cele noi, modificate și eliminate se
+    scriu cu câte o singură interogare (bulk_create / bulk_update / delete).
+    """
+    existing = {entry.penitentiary: entry for entry in transfer.entries.all()}
+    # bulk_update nu completează auto_now
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for entry_data in entries_data:
+        entry = existing.pop(entry_data['penitentiary'], None)
+        if entry is None:
+            to_create.append(TransferEntry(transfer=transfer, **entry_data))
+            continue
+        changed = False
+        for field in ENTRY_VALUE_FIELDS:
+            if field in entry_data and getattr(entry, field) != entry_data[field]:
+                setattr(entry, field, entry_data[field])
+                changed = True
+        if changed:
+            entry.updated_at = now
+            to_update.append(entry)
+
+    if existing:
+        TransferEntry.objects.filter(pk__in=[entry.pk for entry in existing.values()]).delete()
+    if to_create:
+        TransferEntry.objects.bulk_create(to_create)
+    if to_update:
+        TransferEntry.objects.bulk_update(to_update, ENTRY_VALUE_FIELDS + ['updated_at'])
+    getattr(transfer, '_prefetched_objects_cache', {}).pop('entries', None)
+
+
 class TransferCreateSerializer(serializers.Serializer):
     """Creare transfer cu entries."""
     transfer_date = serializers.DateField()
@@ -139,6 +177,7 @@ class TransferCreateSerializer(serializers.Serializer):
             raise serializers.ValidationError('Penitenciar duplicat in lista.')
         return value
 
+    @transaction.atomic
     def create(self, validated_data):
         entries_data = validated_data.pop('entries')
         request = self.context['request']
@@ -149,14 +188,16 @@ class TransferCreateSerializer(serializers.Serializer):
             created_by=request.user,
         )
 
-        for entry_data in entries_data:
-            TransferEntry.objects.create(transfer=transfer, **entry_data)
+        TransferEntry.objects.bulk_create(
+            [TransferEntry(transfer=transfer, **entry_data) for entry_data in entries_data]
+        )
 
+        TransferMonthlyRollup.objects.refresh_months([(transfer.year, transfer.month)])
         return transfer
 
 
 class TransferUpdateSerializer(serializers.Serializer):
-    """Actualizare transfer (header + inlocuire entries)."""
+    """Actualizare transfer (header + sincronizare entries după penitenciar)."""
     transfer_date = serializers.DateField(required=False)
     description = serializers.CharField(required=False, allow_blank=True)
     entries = TransferEntryInputSerializer(many=True, required=False)
@@ -168,8 +209,10 @@ class TransferUpdateSerializer(serializers.Serializer):
                 raise serializers.ValidationError('Penitenciar duplicat in lista.')
         return value
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         entries_data = validated_data.pop('entries', None)
+        old_period = (instance.year, instance.month)
 
         if 'transfer_date' in validated_data:
             instance.transfer_date = validated_data['transfer_date']
@@ -178,9 +221,8 @@ class TransferUpdateSerializer(serializers.Serializer):
         instance.save()
 
         if entries_data is not None:
-            # Inlocuim toate entries (delete + create)
-            instance.entries.all().delete()
-            for entry_data in entries_data:
-                TransferEntry.objects.create(transfer=instance, **entry_data)
+            sync_entries(instance, entries_data)
 
+        # Luna veche și cea nouă (dacă s-a schimbat data transferului)
+        TransferMonthlyRollup.objects.refresh_months([old_period, (instance.year, instance.month)])
         return instance
@@ -0,0 +1,105 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db.models import Sum
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .models import ROLLUP_COUNTERS, Transfer, TransferEntry, TransferMonthlyRollup
+
+User = get_user_model()
+
+
+def _rollup_rows(queryset):
+    return sorted(
+        (row.year, row.month, row.penitentiary, *(getattr(row, field) for field in ROLLUP_COUNTERS))
+        for row in queryset
+    )
+
+
+class MonthlyRollupTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='admin', role=User.Role.ADMIN))
+
+    def assertRollupMatchesEntries(self):
+        """Rândurile întreținute incremental = agregarea de la zero din TransferEntry."""
+        rows = TransferEntry.objects.order_by().values('transfer__year', 'transfer__month', 'penitentiary').annotate(
+            **{f'sum_{field}': Sum(field) for field in ROLLUP_COUNTERS}
+        )
+        expected = sorted(
+            (row['transfer__year'], row['transfer__month'], row['penitentiary'], *(row[f'sum_{field}'] for field in ROLLUP_COUNTERS))
+            for row in rows
+        )
+        self.assertEqual(_rollup_rows(TransferMonthlyRollup.objects.all()), expected)
+
+    def create_transfer(self, transfer_date, entries):
+        response = self.client.post(
+            '/api/v1/transfers/', {'transfer_date': transfer_date, 'entries': entries}, format='json', secure=True,
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def test_create_edit_delete_keep_rollup_in_sync(self):
+        first = self.create_transfer('2025-03-05', [
+            {'penitentiary': 1, 'veniti': 3, 'veniti_noi': 3},
+            {'penitentiary': 11, 'plecati': 2, 'plecati_izolator': 2},
+        ])
+        self.create_transfer('2025-03-20', [{'penitentiary': 1, 'veniti': 2, 'veniti_reintorsi': 2, 'plecati': 1}])
+        self.assertRollupMatchesEntries()
+        self.assertEqual(TransferMonthlyRollup.objects.get(year=2025, month=3, penitentiary=1).veniti, 5)
+
+        # Rând modificat, rând eliminat, rând nou și mutarea în altă lună
+        response = self.client.put(f'/api/v1/transfers/{first}/', {
+            'transfer_date': '2025-04-02',
+            'entries': [
+                {'penitentiary': 1, 'veniti': 4, 'veniti_noi': 4},
+                {'penitentiary': 2, 'plecati': 7},
+            ],
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertRollupMatchesEntries()
+        self.assertFalse(TransferMonthlyRollup.objects.filter(penitentiary=11).exists())
+
+        response = self.client.delete(f'/api/v1/transfers/{first}/', secure=True)
+        self.assertEqual(response.status_code, 204)
+        self.assertRollupMatchesEntries()
+        self.assertFalse(TransferMonthlyRollup.objects.filter(year=2025, month=4).exists())
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self.create_transfer('2024-12-31', [{'penitentiary': 3, 'plecati': 4}])
+        self.create_transfer('2025-01-01', [{'penitentiary': 3, 'veniti': 1, 'veniti_noi': 1}])
+        incremental = _rollup_rows(TransferMonthlyRollup.objects.all())
+
+        TransferMonthlyRollup.objects.rebuild(year=2025)
+        self.assertEqual(_rollup_rows(TransferMonthlyRollup.objects.all()), incremental)
+        TransferMonthlyRollup.objects.all().delete()
+        TransferMonthlyRollup.objects.rebuild()
+        self.assertEqual(_rollup_rows(TransferMonthlyRollup.objects.all()), incremental)
+        self.assertRollupMatchesEntries()
+
+
+class TrendsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='viewer'))
+        # Decembrie e înaintea intervalului: intră doar în diferență și medie
+        for year, month, veniti in [(2024, 12, 2), (2025, 1, 5), (2025, 2, 7), (2025, 4, 3)]:
+            transfer = Transfer.objects.create(transfer_date=date(year, month, 10))
+            TransferEntry.objects.create(transfer=transfer, penitentiary=1, veniti=veniti, veniti_noi=veniti)
+        TransferMonthlyRollup.objects.rebuild()
+
+    def test_running_totals_with_month_gaps(self):
+        response = self.client.get(
+            '/api/v1/transfers/trends/', {'start': '2025-01', 'end': '2025-05'}, secure=True,
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['months'], ['2025-01', '2025-02', '2025-03', '2025-04', '2025-05'])
+        [series] = data['series']
+        self.assertEqual(series['veniti'], [5, 7, None, 3, None])
+        self.assertEqual(series['veniti_running'], [5, 12, None, 15, None])
+        # Luna lipsă (martie) contează ca 0
+        self.assertEqual(series['veniti_delta'], [3, 2, None, 3, None])
+        self.assertEqual(series['veniti_avg3'], [2.33, 4.67, None, 3.33, None])
+        self.assertEqual(series['plecati_running'], [0, 0, None, 0, None])
@@ -2,20 +2,42 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum
+from django.db import transaction
 from django.utils import timezone
 
-from .models import Transfer, TransferEntry, Penitentiary, OTHER_PENITENTIARIES, ISOLATOR_PENITENTIARIES, ISOLATOR_VALUES
+from .models import (
+    Transfer, TransferEntry, TransferMonthlyRollup, Penitentiary, OTHER_PENITENTIARIES,
+    ISOLATOR_PENITENTIARIES, ISOLATOR_VALUES, TREND_COUNTERS, month_index,
+)
 from .serializers import (
     TransferListSerializer,
     TransferDetailSerializer,
     TransferCreateSerializer,
     TransferUpdateSerializer,
 )
+from .dashboard import transfer_stats
 from .exports import export_transfers_xlsx, export_transfers_pdf
 from accounts.permissions import IsAdminOrReadOnly
+from reports.export_cache import cached_export
 from audit.utils import log_action
 
+# Numărul maxim de luni cerut într-un singur apel /trends/
+MAX_TREND_MONTHS = 120
+DEFAULT_TREND_MONTHS = 24
+
+
+def _parse_month(value):
+    """'YYYY-MM' -> month_index; ValueError pentru format invalid."""
+    year, _, month = value.partition('-')
+    year, month = int(year), int(month)
+    if not 1 <= month <= 12 or year < 2000:
+        raise ValueError(value)
+    return month_index(year, month)
+
+
+def _format_month(index):
+    return f'{index // 12}-{index % 12 + 1:02d}'
+
 
 class TransferViewSet(viewsets.ModelViewSet):
     queryset = Transfer.objects.select_related('created_by').prefetch_related('entries')
@@ -80,7 +102,9 @@ class TransferViewSet(viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         old_data = TransferDetailSerializer(instance).data
         tid = str(instance.id)
-        instance.delete()
+        with transaction.atomic():
+            instance.delete()
+            TransferMonthlyRollup.objects.refresh_months([(instance.year, instance.month)])
         log_action(
             self.request, 'delete', 'Transfer',
             tid, before_data=old_data
@@ -89,37 +113,7 @@ class TransferViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Statistici KPI pentru dashboard."""
-        now = timezone.now()
-        cur_year, cur_month = now.year, now.month
-
-        if cur_month == 1:
-            prev_year, prev_month = cur_year - 1, 12
-        else:
-            prev_year, prev_month = cur_year, cur_month - 1
-
-        cur = TransferEntry.objects.filter(
-            transfer__year=cur_year, transfer__month=cur_month
-        ).aggregate(total_veniti=Sum('veniti'), total_plecati=Sum('plecati'))
-
-        prev = TransferEntry.objects.filter(
-            transfer__year=prev_year, transfer__month=prev_month
-        ).aggregate(total_veniti=Sum('veniti'), total_plecati=Sum('plecati'))
-
-        cv = cur['total_veniti'] or 0
-        cp = cur['total_plecati'] or 0
-        pv = prev['total_veniti'] or 0
-        pp = prev['total_plecati'] or 0
-
-        transfers_count = Transfer.objects.count()
-
-        return Response({
-            'current_month_veniti': cv,
-            'current_month_plecati': cp,
-            'current_month_net': cv - cp,
-            'previous_month_veniti': pv,
-            'previous_month_plecati': pp,
-            'total_transfers': transfers_count,
-        })
+        return Response(transfer_stats())
 
     @action(detail=False, methods=['get'])
     def monthly_report(self, request):
@@ -128,15 +122,7 @@ class TransferViewSet(viewsets.ModelViewSet):
         month = int(request.query_params.get('month', timezone.now().month))
 
         # Agregate per penitenciar (din toate transferurile lunii)
-        rows = TransferEntry.objects.filter(
-            transfer__year=year, transfer__month=month
-        ).values('penitentiary').annotate(
-            total_veniti=Sum('veniti'),
-            total_veniti_reintorsi=Sum('veniti_reintorsi'),
-            total_veniti_noi=Sum('veniti_noi'),
-            total_plecati=Sum('plecati'),
-            total_plecati_izolator=Sum('plecati_izolator'),
-        ).order_by('penitentiary')
+        rows = TransferMonthlyRollup.objects.filter(year=year, month=month).by_penitentiary()
 
         entries = []
         for row in rows:
@@ -183,17 +169,9 @@ class TransferViewSet(viewsets.ModelViewSet):
         start_month = (quarter - 1) * 3 + 1
         end_month = start_month + 2
 
-        rows = TransferEntry.objects.filter(
-            transfer__year=year,
-            transfer__month__gte=start_month,
-            transfer__month__lte=end_month
-        ).values('penitentiary').annotate(
-            total_veniti=Sum('veniti'),
-            total_veniti_reintorsi=Sum('veniti_reintorsi'),
-            total_veniti_noi=Sum('veniti_noi'),
-            total_plecati=Sum('plecati'),
-            total_plecati_izolator=Sum('plecati_izolator'),
-        ).order_by('penitentiary')
+        rows = TransferMonthlyRollup.objects.filter(
+            year=year, month__gte=start_month, month__lte=end_month
+        ).by_penitentiary()
 
         result = []
         for row in rows:
@@ -225,46 +203,108 @@ class TransferViewSet(viewsets.ModelViewSet):
         })
 
     @action(detail=False, methods=['get'])
-    def export_xlsx(self, request):
-        """Export raport transferuri in XLSX."""
+    def trends(self, request):
+        """
+        Tendințe lunare per penitenciar pe un interval oarecare (?start=YYYY-MM&end=YYYY-MM,
+        implicit ultimele 24 de luni; opțional ?penitentiary=1&penitentiary=2).
+
+        Răspuns pe coloane: `months` este axa comună, iar fiecare serie are câte un
+        vector aliniat cu `months` pentru: valoarea lunii, totalul cumulat din `start`,
+        diferența față de luna precedentă și media pe ultimele 3 luni. Pentru lunile
+        fără date valorile sunt null.
+        """
+        now = timezone.now()
+        try:
+            end = _parse_month(request.query_params['end']) if 'end' in request.query_params \
+                else month_index(now.year, now.month)
+            start = _parse_month(request.query_params['start']) if 'start' in request.query_params \
+                else end - DEFAULT_TREND_MONTHS + 1
+            penitentiaries = [int(p) for p in request.query_params.getlist('penitentiary')]
+        except ValueError:
+            return Response(
+                {'error': 'Parametri invalizi: start/end au formatul YYYY-MM, penitentiary este numeric.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start > end or end - start + 1 > MAX_TREND_MONTHS:
+            return Response(
+                {'error': f'Intervalul trebuie să aibă între 1 și {MAX_TREND_MONTHS} de luni.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rollups = TransferMonthlyRollup.objects.all()
+        if penitentiaries:
+            rollups = rollups.filter(penitentiary__in=penitentiaries)
+
+        span = end - start + 1
+        metrics = [
+            f'{field}{suffix}' for field in TREND_COUNTERS
+            for suffix in ('', '_running', '_delta', '_avg3')
+        ]
+        series = {}
+        for row in rollups.trends(start, end):
+            if row['period'] < start:
+                continue
+            pen_val = row['penitentiary']
+            if pen_val not in series:
+                series[pen_val] = {
+                    'penitentiary': pen_val,
+                    'penitentiary_display': Penitentiary(pen_val).label,
+                    'is_isolator': pen_val in ISOLATOR_VALUES,
+                    **{metric: [None] * span for metric in metrics},
+                }
+            col = row['period'] - start
+            data = series[pen_val]
+            for field in TREND_COUNTERS:
+                data[field][col] = row[field]
+                data[f'{field}_running'][col] = row[f'{field}_running']
+                data[f'{field}_delta'][col] = row[f'{field}_delta']
+                data[f'{field}_avg3'][col] = round(row[f'{field}_sum3'] / 3, 2)
+
+        return Response({
+            'start': _format_month(start),
+            'end': _format_month(end),
+            'months': [_format_month(index) for index in range(start, end + 1)],
+            'series': list(series.values()),
+        })
+
+    def _cached_export(self, request, fmt, export_fn):
+        """Export din cache (reports.export_cache), regenerat doar când datele se schimbă."""
         year = int(request.query_params.get('year', timezone.now().year))
         month = request.query_params.get('month')
         quarter = request.query_params.get('quarter')
 
-        base_qs = TransferEntry.objects.filter(transfer__year=year)
+        transfers = Transfer.objects.filter(year=year)
+        rollups = TransferMonthlyRollup.objects.filter(year=year)
 
         if quarter:
             q = int(quarter)
             start_m = (q - 1) * 3 + 1
             end_m = start_m + 2
-            queryset = base_qs.filter(transfer__month__gte=start_m, transfer__month__lte=end_m)
-            return export_transfers_xlsx(queryset, year=year, quarter=q)
+            transfers = transfers.filter(month__gte=start_m, month__lte=end_m)
+            rollups = rollups.filter(month__gte=start_m, month__lte=end_m)
+            params = {'year': year, 'quarter': q}
         elif month:
-            queryset = base_qs.filter(transfer__month=int(month))
-            return export_transfers_xlsx(queryset, year=year, month=int(month))
+            transfers = transfers.filter(month=int(month))
+            rollups = rollups.filter(month=int(month))
+            params = {'year': year, 'month': int(month)}
         else:
-            return export_transfers_xlsx(base_qs, year=year)
+            params = {'year': year}
+
+        entries = TransferEntry.objects.filter(transfer__in=transfers)
+        return cached_export(
+            request, f'transfers.{fmt}', params, [transfers, entries, rollups],
+            lambda: export_fn(rollups, **params),
+        )
+
+    @action(detail=False, methods=['get'])
+    def export_xlsx(self, request):
+        """Export raport transferuri in XLSX."""
+        return self._cached_export(request, 'xlsx', export_transfers_xlsx)
 
     @action(detail=False, methods=['get'])
     def export_pdf(self, request):
         """Export raport transferuri in PDF."""
-        year = int(request.query_params.get('year', timezone.now().year))
-        month = request.query_params.get('month')
-        quarter = request.query_params.get('quarter')
-
-        base_qs = TransferEntry.objects.filter(transfer__year=year)
-
-        if quarter:
-            q = int(quarter)
-            start_m = (q - 1) * 3 + 1
-            end_m = start_m + 2
-            queryset = base_qs.filter(transfer__month__gte=start_m, transfer__month__lte=end_m)
-            return export_transfers_pdf(queryset, year=year, quarter=q)
-        elif month:
-            queryset = base_qs.filter(transfer__month=int(month))
-            return export_transfers_pdf(queryset, year=year, month=int(month))
-        else:
-            return export_transfers_pdf(base_qs, year=year)
+        return self._cached_export(request, 'pdf', export_transfers_pdf)
 
     @action(detail=False, methods=['get'])
     def penitentiaries(self, request):
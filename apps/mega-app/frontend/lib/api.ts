@@ -501,7 +501,7 @@ export const alertsApi = {
     }),
 
   generate: (token: string) =>
-    fetchApi<{ message: string; count: number }>('/api/v1/alerts/generate/', {
+    fetchApi<{ message: string; count: number; unread_count: number }>('/api/v1/alerts/generate/', {
       token,
       method: 'POST',
     }),